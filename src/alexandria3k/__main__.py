@@ -33,6 +33,16 @@ import traceback
 from alexandria3k.common import Alexandria3kError, program_version
 from alexandria3k import debug
 from alexandria3k.data_sources_lib.crossref_file_cache import FileCache
+from alexandria3k.data_sources_lib import (
+    archive_index,
+    container_cache,
+    decoded_cache,
+    decompression,
+    download_cache,
+    json_backend,
+    read_ahead,
+    xml_engine,
+)
 from alexandria3k import perf
 
 DESCRIPTION = "a3k: Relational interface to publication metadata"
@@ -100,6 +110,129 @@ def get_data_source_instance(args):
     return class_(data_location, sample, args.attach_databases)
 
 
+def add_container_reading_arguments(parser):
+    """Add the arguments controlling how containers are read."""
+    parser.add_argument(
+        "--cache-entries",
+        default=1,
+        type=int,
+        help="Number of decoded containers to keep in memory (default 1)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        default=1024,
+        type=int,
+        help="Maximum total uncompressed size in MiB of the decoded "
+        + "containers kept in memory (default 1024); their decoded "
+        + "objects typically occupy several times more memory",
+    )
+    parser.add_argument(
+        "--decoded-cache",
+        type=str,
+        help="Directory where decoded containers are stored for reuse "
+        + "in subsequent runs",
+    )
+    parser.add_argument(
+        "--decoded-cache-size",
+        default=10240,
+        type=int,
+        help="Maximum size in MiB of the decoded containers directory "
+        + "(default 10240)",
+    )
+    parser.add_argument(
+        "--download-cache",
+        type=str,
+        help="Directory where data fetched from URLs (e.g. the DOAJ CSV "
+        + "file) are stored for reuse in subsequent runs, if their server "
+        + "reports that they have not changed",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        default=0,
+        type=int,
+        help="Number of containers to read and decode ahead in the "
+        + "background (default 0)",
+    )
+    parser.add_argument(
+        "--read-ahead-memory",
+        default=1024,
+        type=int,
+        help="Maximum memory in MiB used by the containers read ahead "
+        + "(default 1024)",
+    )
+    parser.add_argument(
+        "--stream-threshold",
+        type=int,
+        help="Size in MiB of compressed containers above which their "
+        + "records are decoded incrementally, keeping only a few of them "
+        + "in memory (default: decode containers as a whole)",
+    )
+    parser.add_argument(
+        "--json-backend",
+        default=json_backend.AUTO,
+        choices=[json_backend.AUTO] + json_backend.BACKENDS,
+        help="Library used for decoding JSON containers "
+        + "(default: the fastest installed one)",
+    )
+    parser.add_argument(
+        "--decompression",
+        default=decompression.AUTO,
+        choices=[decompression.AUTO] + decompression.BACKENDS,
+        help="Library or program used for decompressing gzip files "
+        + "(default: the fastest available one)",
+    )
+    parser.add_argument(
+        "--xml-engine",
+        default=xml_engine.AUTO,
+        choices=[xml_engine.AUTO] + xml_engine.ENGINES,
+        help="Library used for parsing XML containers and extracting "
+        + "their values (default: lxml, when installed; the Python API "
+        + "uses elementtree unless xml_engine.configure() is called)",
+    )
+
+
+def configure_container_reading(args):
+    """Configure the reading of containers based on the specified user
+    arguments."""
+    read_ahead.configure(args.read_ahead, args.read_ahead_memory * 1024 * 1024)
+    container_cache.configure(
+        args.cache_entries, args.cache_size * 1024 * 1024
+    )
+    decoded_cache.configure(
+        args.decoded_cache, args.decoded_cache_size * 1024 * 1024
+    )
+    download_cache.configure(args.download_cache)
+    container_cache.configure_streaming(
+        None
+        if args.stream_threshold is None
+        else args.stream_threshold * 1024 * 1024
+    )
+    json_backend.configure(args.json_backend)
+    decompression.configure(args.decompression)
+    xml_engine.configure(args.xml_engine)
+
+
+def log_container_reading():
+    """Log the statistics of the reading and caching of containers."""
+    debug.log(
+        "files-read",
+        f"{FileCache.file_reads} files read; "
+        f"JSON backend {json_backend.get_backend()}; "
+        f"XML engine {xml_engine.get_engine()}",
+    )
+    for line in container_cache.statistics():
+        debug.log("files-read", line)
+    line = decoded_cache.statistics()
+    if line:
+        debug.log("files-read", line)
+    line = download_cache.statistics()
+    if line:
+        debug.log("files-read", line)
+    line = decompression.statistics()
+    if line:
+        perf.log(line)
+
+
 def download(args):
     """Download data using the specified data source."""
     args.validate_args(args)
@@ -175,6 +308,7 @@ def add_subcommand_download(subparsers):
 def populate(args):
     """Populate the specified database from the specified data source."""
 
+    configure_container_reading(args)
     data_source_instance = get_data_source_instance(args)
 
     if args.row_selection and args.row_selection_file:
@@ -190,6 +324,7 @@ def populate(args):
         args.database,
         args.columns,
         args.row_selection,
+        args.jobs,
     )
     perf.log("Table population")
 
@@ -229,6 +364,14 @@ def add_subcommand_populate(subparsers):
         type=str,
         help="Columns to populate using table.column or table.*",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=1,
+        type=int,
+        help="Number of worker processes to use for reading the data source's "
+        + "containers (default 1)",
+    )
     parser.add_argument(
         "-R",
         "--row-selection-file",
@@ -250,6 +393,7 @@ def add_subcommand_populate(subparsers):
         + "The expression can also use a variable named data whose value is documented "
         + "in the constructor API of each data source.",
     )
+    add_container_reading_arguments(parser)
 
 
 def process(args):
@@ -294,6 +438,7 @@ def add_subcommand_help(top_parser, subparsers):
 
 def query(args):
     """Query the specified data source."""
+    configure_container_reading(args)
     data_source_instance = get_data_source_instance(args)
 
     if args.query and args.query_file:
@@ -317,7 +462,9 @@ def query(args):
         close_csv_file = False
 
     csv_writer = csv.writer(csv_file, delimiter=args.field_separator)
-    for rec in data_source_instance.query(args.query, args.partition):
+    for rec in data_source_instance.query(
+        args.query, args.partition, args.jobs, not args.unordered
+    ):
         if args.header:
             csv_writer.writerow(data_source_instance.get_query_column_names())
             args.header = False
@@ -375,6 +522,14 @@ def add_subcommand_query(subparsers):
         action="store_true",
         help="Include a header in the query output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=1,
+        type=int,
+        help="Number of worker processes to use for running a partitioned "
+        + "query (default 1)",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -388,6 +543,13 @@ def add_subcommand_query(subparsers):
         # pylint: disable-next=line-too-long
         help="Run the query over partitioned data slices. (Warning: arguments are run per partition.)",
     )
+    parser.add_argument(
+        "-U",
+        "--unordered",
+        action="store_true",
+        help="Output the results of a partitioned query run by multiple "
+        + "workers as they become available, rather than in partition order",
+    )
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument(
         "-Q",
@@ -407,6 +569,78 @@ def add_subcommand_query(subparsers):
         + "The expression can also use a variable named data whose value is documented "
         + "in the constructor API of each data source.",
     )
+    add_container_reading_arguments(parser)
+
+
+def index_containers(args):
+    """Create a catalog of the specified data source's containers."""
+    configure_container_reading(args)
+    data_source_instance = get_data_source_instance(args)
+    data_source_instance.index_containers()
+
+
+def add_subcommand_index_containers(subparsers):
+    """Add the arguments of the index-containers subcommand."""
+    parser = subparsers.add_parser(
+        "index-containers",
+        help=(
+            "Create a catalog of the data source's containers, which "
+            "allows populate and partitioned queries with conditions on "
+            "catalogued columns to skip containers without matching rows."
+        ),
+    )
+    parser.set_defaults(func=index_containers, attach_databases=None)
+    parser.add_argument(
+        "data_name",
+        choices=facility_names("data_sources"),
+        help="Name of the data source to use",
+    )
+    parser.add_argument(
+        "data_location", nargs="?", help="Path of the source's data"
+    )
+    parser.add_argument(
+        "-s",
+        "--sample",
+        default="True",
+        type=str,
+        help="Python expression to sample the data (e.g. random.random() < 0.0002). "
+        + "The expression can also use a variable named data whose value is documented "
+        + "in the constructor API of each data source.",
+    )
+    add_container_reading_arguments(parser)
+
+
+def index_archive(args):
+    """Create an index of the specified compressed tar archive."""
+    count = archive_index.create_index(
+        args.archive, args.spacing * 1024 * 1024
+    )
+    debug.log("files-read", f"Indexed {count} members of {args.archive}")
+
+
+def add_subcommand_index_archive(subparsers):
+    """Add the arguments of the index-archive subcommand."""
+    parser = subparsers.add_parser(
+        "index-archive",
+        help=(
+            "Create an index of a data source's gzip-compressed tar "
+            "archive (ORCID, DataCite), which allows its files to be "
+            "read directly and by multiple worker processes. "
+            "Requires the indexed_gzip Python module."
+        ),
+    )
+    parser.set_defaults(func=index_archive, attach_databases=None)
+    parser.add_argument("archive", help="Path of the archive to index")
+    parser.add_argument(
+        "--spacing",
+        type=int,
+        default=archive_index.DEFAULT_SPACING // 1024 // 1024,
+        help=(
+            "Decompressed MiB between the index's decompression "
+            "checkpoints (default: %(default)s); closer checkpoints "
+            "allow faster access but result in a larger index"
+        ),
+    )
 
 
 def get_tables(name):
@@ -555,7 +789,7 @@ def get_cli_parser():
         # stderr does not work as a Debug API flag (use Debug.set_output)
         # progress_bar is an undocumented CLI --debug option (use --progress)
         help="""Output debuggging information according to the comma-separated arguments.
-    files-read: Counts of Crossref data files read;
+    files-read: Counts of Crossref data files read and container cache statistics;
     link: Record linking operations;
     sql: Executed SQL statements;
     perf: Performance timings;
@@ -588,6 +822,8 @@ def get_cli_parser():
     add_subcommand_populate(subparsers)
     add_subcommand_process(subparsers)
     add_subcommand_query(subparsers)
+    add_subcommand_index_containers(subparsers)
+    add_subcommand_index_archive(subparsers)
     add_subcommand_list_processes(subparsers)
     add_subcommand_list_complete_schema(subparsers)
     add_subcommand_list_source_schema(subparsers)
@@ -622,7 +858,7 @@ def error_raising_main():
     else:
         parser.error("No subcommand provided")
 
-    debug.log("files-read", f"{FileCache.file_reads} files read")
+    log_container_reading()
 
     return 0
 
@@ -33,6 +33,7 @@ import urllib.request
 import apsw
 
 from alexandria3k import debug
+from alexandria3k.data_sources_lib import download_cache
 
 RE_URL = re.compile(r"\w+://")
 
@@ -229,6 +230,8 @@ def data_from_uri_provider(source):
     """
     Given a file path, a URL, or this package's resource path
     return a readable source for its contents.
+    The contents of URLs are obtained through the download cache,
+    when this is configured.
 
     :param source: A file path, a URL, or an internal data source starting
         with `resource:`.
@@ -243,7 +246,7 @@ def data_from_uri_provider(source):
                 source,
                 headers={"User-Agent": f"alexandria3k {program_version()}"},
             )
-            return urllib.request.urlopen(req)
+            return download_cache.open_url(req)
         return open(source, "rb")
     # pylint: disable-next=broad-except
     except Exception as exception:
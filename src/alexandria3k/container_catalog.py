@@ -0,0 +1,783 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Catalog of per-container statistics, which allows skipping containers
+that cannot contain rows satisfying a row selection expression."""
+
+from collections import namedtuple
+import os
+import re
+import sqlite3
+
+from alexandria3k.common import Alexandria3kError
+
+CATALOG_FILE_NAME = "a3k-catalog.db"
+"""str: name of the catalog file stored in a data source's directory."""
+
+CATALOG_FORMAT = 2
+"""int: version of the catalog's schema."""
+
+RANGE = "range"
+"""str: catalog kind recording a column's minimum and maximum value."""
+
+VALUES = "values"
+"""str: catalog kind recording a column's distinct values."""
+
+PREFIX = "prefix"
+"""str: catalog kind recording the distinct prefixes of a column's values
+up to their first / (e.g. DOI prefixes)."""
+
+KEY = "key"
+"""str: catalog kind mapping a column's (normalized) values to the
+container and item index of the rows having them (e.g. DOIs), allowing
+the rows to be directly accessed."""
+
+SCHEMA = """
+CREATE TABLE catalog_info(name TEXT PRIMARY KEY, value);
+CREATE TABLE containers(
+  container_id INTEGER PRIMARY KEY,
+  name TEXT UNIQUE,
+  size INTEGER,
+  mtime_ns INTEGER,
+  row_count INTEGER
+);
+CREATE TABLE column_ranges(
+  container_id INTEGER,
+  column_name TEXT,
+  min_value,
+  max_value
+);
+CREATE TABLE column_values(container_id INTEGER, column_name TEXT, value);
+CREATE TABLE column_keys(
+  column_name TEXT,
+  value,
+  container_id INTEGER,
+  item_index INTEGER
+);
+"""
+
+INDEXES = """
+CREATE INDEX column_ranges_idx ON column_ranges(column_name, container_id);
+CREATE INDEX column_values_idx ON column_values(column_name, value);
+CREATE INDEX column_keys_idx ON column_keys(column_name, value);
+"""
+
+
+def value_prefix(value):
+    """Return the prefix of the specified value up to its first /"""
+    if not isinstance(value, str):
+        return value
+    return value.split("/", 1)[0]
+
+
+class CatalogWriter:
+    """Create a catalog at the specified path for the specified root
+    table"""
+
+    def __init__(self, path, root_name):
+        self.directory = os.path.dirname(path)
+        self.temporary_path = path + ".tmp"
+        self.path = path
+        if os.path.exists(self.temporary_path):
+            os.unlink(self.temporary_path)
+        self.connection = sqlite3.connect(self.temporary_path)
+        self.connection.executescript(SCHEMA)
+        self.connection.executemany(
+            "INSERT INTO catalog_info VALUES (?, ?)",
+            [("format", CATALOG_FORMAT), ("root_table", root_name)],
+        )
+
+    def add_container(self, container_id, path, row_count):
+        """Add the specified container with the specified number
+        of root table rows"""
+        status = os.stat(path)
+        self.connection.execute(
+            "INSERT INTO containers VALUES (?, ?, ?, ?, ?)",
+            (
+                container_id,
+                os.path.relpath(path, self.directory),
+                status.st_size,
+                status.st_mtime_ns,
+                row_count,
+            ),
+        )
+
+    def add_range(self, container_id, column_name, min_value, max_value):
+        """Add the range of the specified column's values in the
+        specified container"""
+        self.connection.execute(
+            "INSERT INTO column_ranges VALUES (?, ?, ?, ?)",
+            (container_id, column_name, min_value, max_value),
+        )
+
+    def add_values(self, container_id, column_name, values):
+        """Add the distinct values of the specified column in the
+        specified container"""
+        self.connection.executemany(
+            "INSERT INTO column_values VALUES (?, ?, ?)",
+            [(container_id, column_name, value) for value in values],
+        )
+
+    def add_keys(self, container_id, column_name, keys):
+        """Add the specified (value, item index) pairs of the specified
+        key column in the specified container"""
+        self.connection.executemany(
+            "INSERT INTO column_keys VALUES (?, ?, ?, ?)",
+            [
+                (column_name, value, container_id, item_index)
+                for value, item_index in keys
+            ],
+        )
+
+    def close(self):
+        """Index the catalog and make it available in its final path"""
+        self.connection.executescript(INDEXES)
+        self.connection.commit()
+        self.connection.close()
+        os.replace(self.temporary_path, self.path)
+
+
+class Catalog:
+    """
+    A read-only catalog of the containers of a data source.
+    Catalogued containers are matched with the data source's
+    containers through their path, and are only used if their size
+    and modification time have not changed.
+
+    :param path: The path of the catalog file.
+    :type path: str
+
+    :param container_paths: The paths of the data source's containers,
+        indexed by their container identifier.
+    :type container_paths: list
+    """
+
+    def __init__(self, path, container_paths):
+        self.path = path
+        self.connection = None
+        self.connection_pid = None
+        try:
+            info = dict(
+                self.get_connection().execute("SELECT * FROM catalog_info")
+            )
+        except sqlite3.DatabaseError as exc:
+            raise Alexandria3kError(
+                f"Unable to read the container catalog {path}: {exc}"
+            ) from exc
+        if info.get("format") != CATALOG_FORMAT:
+            raise Alexandria3kError(
+                f"Unsupported container catalog format in {path}; "
+                "run a3k index-containers to create it anew."
+            )
+        self.root_name = info.get("root_table")
+
+        directory = os.path.dirname(path)
+        container_ids = {
+            os.path.relpath(container_path, directory): i
+            for i, container_path in enumerate(container_paths)
+        }
+        # Map from catalogued container ids to current ones
+        self.container_ids = {}
+        self.row_counts = {}
+        for (
+            catalog_id,
+            name,
+            size,
+            mtime_ns,
+            row_count,
+        ) in self.get_connection().execute("SELECT * FROM containers"):
+            container_id = container_ids.get(name)
+            if container_id is None:
+                continue
+            try:
+                status = os.stat(os.path.join(directory, name))
+            except FileNotFoundError:
+                continue
+            if status.st_size != size or status.st_mtime_ns != mtime_ns:
+                continue
+            self.container_ids[catalog_id] = container_id
+            self.row_counts[container_id] = row_count
+        self.complete = len(self.row_counts) == len(container_paths)
+
+    def get_connection(self):
+        """Return the connection to the catalog's database.
+        A new one is opened in forked processes, which must not
+        use their parent's connection."""
+        if self.connection is None or self.connection_pid != os.getpid():
+            self.connection = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True
+            )
+            self.connection_pid = os.getpid()
+        return self.connection
+
+    def row_count(self):
+        """Return the number of the root table's rows or None if this
+        cannot be determined from the catalog."""
+        if not self.complete:
+            return None
+        return sum(self.row_counts.values())
+
+    def matching_containers(self, predicate):
+        """Return a set with the ids of catalogued containers that
+        may contain values satisfying the specified Predicate."""
+        if predicate.kind == RANGE:
+            return self.range_matches(predicate)
+        if predicate.kind == KEY:
+            placeholders = ", ".join("?" * len(predicate.values))
+            return self.catalog_ids(
+                f"""SELECT DISTINCT container_id FROM column_keys
+                  WHERE column_name = ? AND value IN ({placeholders})""",
+                [predicate.column] + predicate.values,
+            )
+        return self.value_matches(predicate)
+
+    def range_matches(self, predicate):
+        """Return the ids of the containers whose column range may
+        contain values satisfying the specified range predicate."""
+        operator = predicate.operator
+        if operator in ("=", "IN"):
+            condition = " OR ".join(
+                ["(min_value <= ? AND max_value >= ?)"] * len(predicate.values)
+            )
+            arguments = [
+                v for value in predicate.values for v in (value, value)
+            ]
+        elif operator == "BETWEEN":
+            condition = "max_value >= ? AND min_value <= ?"
+            arguments = list(predicate.values)
+        else:
+            condition = {
+                "<": "min_value < ?",
+                "<=": "min_value <= ?",
+                ">": "max_value > ?",
+                ">=": "max_value >= ?",
+            }[operator]
+            arguments = list(predicate.values)
+        return self.catalog_ids(
+            f"""SELECT container_id FROM column_ranges
+              WHERE column_name = ? AND ({condition})""",
+            [predicate.column] + arguments,
+        )
+
+    def value_matches(self, predicate):
+        """Return the ids of the containers whose column values may
+        satisfy the specified values or prefix predicate."""
+        if predicate.operator == "LIKE":
+            return self.catalog_ids(
+                """SELECT DISTINCT container_id FROM column_values
+                  WHERE column_name = ? AND lower(value) = lower(?)""",
+                [predicate.column, predicate.values[0]],
+            )
+        values = predicate.values
+        if predicate.kind == PREFIX:
+            values = list({value_prefix(value) for value in values})
+        placeholders = ", ".join("?" * len(values))
+        return self.catalog_ids(
+            f"""SELECT DISTINCT container_id FROM column_values
+              WHERE column_name = ? AND value IN ({placeholders})""",
+            [predicate.column] + values,
+        )
+
+    def catalog_ids(self, query, arguments):
+        """Return a set with the current ids of the catalogued containers
+        returned by the specified query"""
+        return {
+            self.container_ids[catalog_id]
+            for (catalog_id,) in self.get_connection().execute(
+                query, arguments
+            )
+            if catalog_id in self.container_ids
+        }
+
+    def lookup(self, column_name, value):
+        """Return a sorted list of (container id, item index) tuples
+        of the rows whose specified key column has the specified
+        (normalized) value."""
+        return sorted(
+            (self.container_ids[catalog_id], item_index)
+            for catalog_id, item_index in self.get_connection().execute(
+                """SELECT container_id, item_index FROM column_keys
+                  WHERE column_name = ? AND value = ?""",
+                (column_name, value),
+            )
+            if catalog_id in self.container_ids
+        )
+
+    def candidate_containers(self, container_ids, predicates):
+        """Return a list with the specified container ids that may contain
+        rows satisfying all specified predicates.  Containers missing from
+        the catalog are always included."""
+        candidates = set(container_ids)
+        for predicate in predicates:
+            matching = self.matching_containers(predicate)
+            candidates = {
+                i
+                for i in candidates
+                if i in matching or i not in self.row_counts
+            }
+        return [i for i in container_ids if i in candidates]
+
+    def close(self):
+        """Close the catalog's database connection"""
+        if self.connection and self.connection_pid == os.getpid():
+            self.connection.close()
+        self.connection = None
+
+
+Predicate = namedtuple("Predicate", ["column", "kind", "operator", "values"])
+"""A simple condition on a catalogued column, e.g. published_year >= 2020"""
+
+# Tokens of SQL expressions; anything not matching them stops the parsing
+TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+|--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<name>[A-Za-z_][\w$]*)
+  | (?P<quoted>"(?:[^"]|"")*"|\[[^\]]*\]|`(?:[^`]|``)*`)
+  | (?P<op><=|>=|==|!=|<>|\|\||<<|>>|[-+*/%<>=(),.;~&|?:@$])
+""",
+    re.VERBOSE | re.DOTALL,
+)
+
+Token = namedtuple("Token", ["kind", "value"])
+
+# Supported comparison operators and their normalized form
+COMPARISONS = {"=": "=", "==": "=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+# Comparison operators when their operands are swapped
+MIRRORED = {"=": "=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+# Keywords that end a query's WHERE clause
+WHERE_END = {"GROUP", "ORDER", "LIMIT", "HAVING", "WINDOW"}
+
+# Keywords of compound queries, where a WHERE clause applies to one part
+COMPOUND = {"UNION", "INTERSECT", "EXCEPT"}
+
+# Keywords that can precede a table name without making it an alias
+NON_ALIAS_PRECEDING = {
+    "AND",
+    "AS",
+    "BETWEEN",
+    "BY",
+    "CASE",
+    "CROSS",
+    "ELSE",
+    "DISTINCT",
+    "EXISTS",
+    "FROM",
+    "GLOB",
+    "HAVING",
+    "IN",
+    "INNER",
+    "IS",
+    "JOIN",
+    "LIKE",
+    "NOT",
+    "ON",
+    "OR",
+    "SELECT",
+    "THEN",
+    "WHEN",
+    "WHERE",
+}
+
+
+def tokenize(text):
+    """Return a list of the tokens of the specified SQL text, or
+    None if the text contains unsupported elements."""
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        if not match:
+            return None
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "space":
+            continue
+        if kind == "string":
+            value = value[1:-1].replace("''", "'")
+        elif kind == "number":
+            value = float(value) if re.search(r"[.eE]", value) else int(value)
+        elif kind == "quoted":
+            kind = "name"
+            value = value[1:-1]
+        tokens.append(Token(kind, value))
+    return tokens
+
+
+def is_keyword(token, *keywords):
+    """Return True if the token is one of the specified keywords"""
+    return token.kind == "name" and token.value.upper() in keywords
+
+
+def nesting_change(token):
+    """Return the change in the nesting of parentheses and CASE
+    expressions brought by the specified token"""
+    if token.kind == "op" and token.value == "(" or is_keyword(token, "CASE"):
+        return 1
+    if token.kind == "op" and token.value == ")" or is_keyword(token, "END"):
+        return -1
+    return 0
+
+
+def split_conjuncts(tokens):
+    """Return a list with the token lists of the top-level terms
+    joined by AND in the specified expression tokens"""
+    conjuncts = []
+    current = []
+    depth = 0
+    pending_between = False
+    for token in tokens:
+        depth += nesting_change(token)
+        if depth == 0 and is_keyword(token, "OR"):
+            # OR binds less tightly than AND
+            return [tokens]
+        if depth == 0 and is_keyword(token, "BETWEEN"):
+            pending_between = True
+        elif depth == 0 and is_keyword(token, "AND"):
+            if pending_between:
+                pending_between = False
+            else:
+                conjuncts.append(current)
+                current = []
+                continue
+        current.append(token)
+    conjuncts.append(current)
+
+    # Expand parenthesized conjunctions
+    result = []
+    for conjunct in conjuncts:
+        if enclosed_in_parentheses(conjunct):
+            result += split_conjuncts(conjunct[1:-1])
+        else:
+            result.append(conjunct)
+    return result
+
+
+def enclosed_in_parentheses(tokens):
+    """Return True if the specified tokens are enclosed in a single
+    pair of parentheses"""
+    if len(tokens) < 2 or tokens[0] != Token("op", "("):
+        return False
+    depth = 0
+    for i, token in enumerate(tokens):
+        if token.kind == "op" and token.value == "(":
+            depth += 1
+        elif token.kind == "op" and token.value == ")":
+            depth -= 1
+            if depth == 0:
+                return i == len(tokens) - 1
+    return False
+
+
+def parse_literal(tokens):
+    """Return a tuple with the value of the literal at the start of the
+    specified tokens and the number of tokens it occupies, or None"""
+    if not tokens:
+        return None
+    if tokens[0].kind in ("string", "number"):
+        return tokens[0].value, 1
+    if (
+        len(tokens) > 1
+        and tokens[0] == Token("op", "-")
+        and tokens[1].kind == "number"
+    ):
+        return -tokens[1].value, 2
+    return None
+
+
+def parse_column(tokens):
+    """Return a tuple with the qualifier (or None), the column name, and
+    the number of tokens used by the column reference at the start of
+    the specified tokens, or None"""
+    if not tokens or tokens[0].kind != "name":
+        return None
+    if (
+        len(tokens) > 2
+        and tokens[1] == Token("op", ".")
+        and tokens[2].kind == "name"
+    ):
+        if len(tokens) > 3 and tokens[3] == Token("op", "."):
+            # Schema-qualified reference
+            return None
+        return tokens[0].value, tokens[2].value, 3
+    return None, tokens[0].value, 1
+
+
+def parse_literal_list(tokens):
+    """Return a list of the values of the specified parenthesized
+    comma-separated literals, or None"""
+    if not enclosed_in_parentheses(tokens):
+        return None
+    values = []
+    tokens = tokens[1:-1]
+    while True:
+        literal = parse_literal(tokens)
+        if not literal:
+            return None
+        value, length = literal
+        values.append(value)
+        tokens = tokens[length:]
+        if not tokens:
+            return values
+        if tokens[0] != Token("op", ","):
+            return None
+        tokens = tokens[1:]
+
+
+def parse_comparison(tokens):
+    """Return a tuple with the qualifier, column, operator, and values
+    of the specified conjunct tokens, or None if they do not form
+    a simple comparison of a column with literals"""
+    # pylint: disable=too-many-return-statements,too-many-branches
+    column = parse_column(tokens)
+    if column:
+        qualifier, name, length = column
+        rest = tokens[length:]
+        if not rest:
+            return None
+        operator = rest[0]
+        if operator.kind == "op" and operator.value in COMPARISONS:
+            literal = parse_literal(rest[1:])
+            if literal and literal[1] == len(rest) - 1:
+                return (
+                    qualifier,
+                    name,
+                    COMPARISONS[operator.value],
+                    [literal[0]],
+                )
+            return None
+        if is_keyword(operator, "IN"):
+            values = parse_literal_list(rest[1:])
+            if values:
+                return qualifier, name, "IN", values
+            return None
+        if is_keyword(operator, "LIKE") and len(rest) == 2:
+            if rest[1].kind == "string":
+                return qualifier, name, "LIKE", [rest[1].value]
+            return None
+        if is_keyword(operator, "BETWEEN"):
+            low = parse_literal(rest[1:])
+            if not low:
+                return None
+            rest = rest[1 + low[1] :]
+            if not rest or not is_keyword(rest[0], "AND"):
+                return None
+            high = parse_literal(rest[1:])
+            if high and high[1] == len(rest) - 1:
+                return qualifier, name, "BETWEEN", [low[0], high[0]]
+        return None
+
+    # Literal compared with a column
+    literal = parse_literal(tokens)
+    if not literal:
+        return None
+    rest = tokens[literal[1] :]
+    if len(rest) < 2:
+        return None
+    operator = rest[0]
+    column = parse_column(rest[1:])
+    if (
+        operator.kind == "op"
+        and operator.value in COMPARISONS
+        and column
+        and column[2] == len(rest) - 1
+    ):
+        return (
+            column[0],
+            column[1],
+            MIRRORED[COMPARISONS[operator.value]],
+            [literal[0]],
+        )
+    return None
+
+
+def affinity_value(data_type, value):
+    """Return the specified literal value converted according to the
+    affinity of the specified column data type, as SQLite would do
+    when comparing it with a column's value."""
+    data_type = (data_type or "").upper()
+    numeric = any(t in data_type for t in ("INT", "REAL", "FLOA", "DOUB"))
+    numeric = numeric or data_type.startswith("NUMERIC")
+    if numeric and isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return int(number) if number.is_integer() else number
+    if "CHAR" in data_type or "CLOB" in data_type or "TEXT" in data_type:
+        if isinstance(value, (int, float)):
+            return str(value)
+    return value
+
+
+def like_prefix(pattern):
+    """Return the literal part of the specified LIKE pattern up to the
+    first /, or None if this contains wildcards or is missing"""
+    if "/" not in pattern:
+        return None
+    prefix = pattern.split("/", 1)[0]
+    if "%" in prefix or "_" in prefix:
+        return None
+    return prefix
+
+
+def predicate_of(comparison, column_meta):
+    """Return the Predicate corresponding to the specified parsed
+    comparison on the specified catalogued column, or None if the
+    catalog cannot be used for it."""
+    _qualifier, _name, operator, values = comparison
+    name = column_meta.get_name()
+    values = [
+        affinity_value(column_meta.get_data_type(), value) for value in values
+    ]
+    kinds = column_meta.get_catalog()
+    if KEY in kinds and operator in ("=", "IN"):
+        return Predicate(
+            name,
+            KEY,
+            operator,
+            [column_meta.normalized_key(value) for value in values],
+        )
+    if RANGE in kinds:
+        if operator != "LIKE":
+            return Predicate(name, RANGE, operator, values)
+    if VALUES in kinds and operator in ("=", "IN"):
+        return Predicate(name, VALUES, operator, values)
+    if PREFIX in kinds:
+        if operator in ("=", "IN"):
+            return Predicate(name, PREFIX, operator, values)
+        if operator == "LIKE":
+            prefix = like_prefix(values[0])
+            if prefix is not None:
+                return Predicate(name, PREFIX, operator, [prefix])
+    return None
+
+
+def condition_predicates(tokens, root_table, qualified_only):
+    """Return a list with the catalog predicates that must hold for
+    the rows satisfying the specified expression tokens.
+
+    :param tokens: The tokens of the expression.
+    :type tokens: list
+
+    :param root_table: The metadata of the catalogued root table.
+    :type root_table: TableMeta
+
+    :param qualified_only: When true only column references qualified
+        with the root table's name are considered.
+    :type qualified_only: bool
+    """
+    root_name = root_table.get_name().lower()
+    predicates = []
+    for conjunct in split_conjuncts(tokens):
+        comparison = parse_comparison(conjunct)
+        if not comparison:
+            continue
+        qualifier, name = comparison[0], comparison[1]
+        if qualifier is None:
+            # Population conditions are evaluated over all tables, so
+            # ambiguous unqualified column names result in an error
+            if qualified_only:
+                continue
+        elif qualifier.lower() != root_name:
+            continue
+        column_meta = root_table.get_column_by_name(name.lower())
+        if not column_meta or not column_meta.get_catalog():
+            continue
+        predicate = predicate_of(comparison, column_meta)
+        if predicate:
+            predicates.append(predicate)
+    return predicates
+
+
+def may_refer_elsewhere(previous, following):
+    """Return True if a root table name between the specified tokens
+    may refer to other data, as an alias or a schema-qualified table"""
+    if not previous:
+        return False
+    if previous == Token("op", "."):
+        return following != Token("op", ".")
+    if is_keyword(previous, "AS"):
+        return True
+    return (
+        previous.kind == "name"
+        and previous.value.upper() not in NON_ALIAS_PRECEDING
+    )
+
+
+def query_where_tokens(tokens, root_name):
+    """Return the tokens of the specified simple query's WHERE clause,
+    or None if there is no WHERE clause or if the query's structure
+    doesn't allow associating it with the root table."""
+    if not tokens or is_keyword(tokens[0], "WITH"):
+        return None
+    root_name = root_name.lower()
+    depth = 0
+    where_start = None
+    where_end = None
+    previous = None
+    for i, token in enumerate(tokens):
+        if token.kind == "op" and token.value == "(":
+            depth += 1
+        elif token.kind == "op" and token.value == ")":
+            depth -= 1
+        elif token.kind == "name" and token.value.lower() == root_name:
+            following = tokens[i + 1] if i + 1 < len(tokens) else None
+            if may_refer_elsewhere(previous, following):
+                return None
+        elif depth == 0 and is_keyword(token, *COMPOUND):
+            return None
+        elif depth == 0 and is_keyword(token, "WHERE"):
+            where_start = i + 1
+        elif (
+            depth == 0
+            and where_start is not None
+            and where_end is None
+            and (is_keyword(token, *WHERE_END) or token == Token("op", ";"))
+        ):
+            where_end = i
+        previous = token
+    if where_start is None:
+        return None
+    return tokens[where_start:where_end]
+
+
+def row_predicates(data_source, text, is_query):
+    """Return the catalog predicates that must hold for the rows
+    selected by the specified population condition or query of the
+    specified DataSource, or an empty list if none can be derived."""
+    tokens = tokenize(text)
+    if not tokens:
+        return []
+    root_table = data_source.get_table_meta_by_name(data_source.root_name)
+    if is_query:
+        tokens = query_where_tokens(tokens, data_source.root_name)
+        if not tokens:
+            return []
+    return condition_predicates(tokens, root_table, is_query)
+
+
+RE_COUNT_QUERY = re.compile(
+    r"^\s*SELECT\s+(COUNT\s*\(\s*\*\s*\))\s+FROM\s+(\w+)\s*;?\s*$",
+    re.IGNORECASE,
+)
+"""Regular expression matching queries counting a table's rows."""
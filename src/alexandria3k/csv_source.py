@@ -20,6 +20,7 @@
 
 import codecs
 import csv
+import itertools
 
 from alexandria3k.common import data_from_uri_provider
 from alexandria3k.data_source import SINGLE_PARTITION_INDEX, StreamingTable
@@ -28,6 +29,32 @@ from alexandria3k.data_source import SINGLE_PARTITION_INDEX, StreamingTable
 # pylint: disable=invalid-name
 
 
+class CsvRows:
+    """The rows of the specified CSV data source (file path, URL, or
+    resource).  The rows are read and parsed once, when they are first
+    needed, and are then reused by all scans of the data."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, data_source, delimiter):
+        self.data_source = data_source
+        self.delimiter = delimiter
+        self.rows = None
+
+    def get_rows(self):
+        """Return a list with the data rows, excluding the header row"""
+        if self.rows is None:
+            with data_from_uri_provider(self.data_source) as raw_input:
+                reader = csv.reader(
+                    codecs.iterdecode(raw_input, "utf-8"),
+                    delimiter=self.delimiter,
+                )
+                next(reader, None)  # Skip header row
+                # The data end at the first empty line
+                self.rows = list(itertools.takewhile(bool, reader))
+        return self.rows
+
+
 class VTSource:
     """Virtual table data source for a single file.
     This gets registered with the apsw Connection through createmodule
@@ -35,6 +62,7 @@ class VTSource:
 
     def __init__(self, table, data_source, sample):
         self.data_source = data_source
+        self.rows = CsvRows(data_source, table.delimiter)
         self.sample = sample
         self.table_dict = {table.get_name(): table}
 
@@ -52,7 +80,7 @@ class VTSource:
         """
         table = self.table_dict[table_name]
         return table.table_schema(), StreamingTable(
-            table, self.table_dict, self.data_source, self.sample
+            table, self.table_dict, self.rows, self.sample
         )
 
     Connect = Create
@@ -71,8 +99,7 @@ class CsvCursor:
         # Set in Next
         self.row_value = None
         # Set in Filter
-        self.raw_input = None
-        self.reader = None
+        self.rows = None
 
     def Eof(self):
         """Return True when the end of the table's records has been reached."""
@@ -101,26 +128,22 @@ class CsvCursor:
         # print("FILTER", index_number, constraint_args)
         self.eof = False
         self.item_index = -1
-        self.raw_input = data_from_uri_provider(self.table.data_source)
-        self.reader = csv.reader(
-            codecs.iterdecode(self.raw_input, "utf-8"),
-            delimiter=self.table.get_table_meta().delimiter,
-        )
-        next(self.reader, None)  # Skip header row
+        self.rows = self.table.get_data_source().get_rows()
         self.Next()  # Move to first row
 
     def Next(self):
         """Advance to the next item."""
         while True:  # Loop until sample returns True
-            self.row_value = next(self.reader, None)
-            if not self.row_value:
+            self.item_index += 1
+            if self.item_index >= len(self.rows):
+                self.row_value = None
                 self.eof = True
                 break
-            self.item_index += 1
+            self.row_value = self.rows[self.item_index]
             if not self.table.sample(self.row_value):
                 continue
             break
 
     def Close(self):
         """Cursor's destructor, used for cleanup"""
-        self.raw_input.close()
+        self.rows = None
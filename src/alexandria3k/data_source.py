@@ -22,13 +22,15 @@
 import abc
 import re
 import csv
+import functools
+import operator
 import os
 import sqlite3
 
 # pylint: disable-next=import-error
 import apsw
 
-from alexandria3k import debug, perf
+from alexandria3k import container_catalog, debug, perf
 from alexandria3k.common import (
     Alexandria3kError,
     Alexandria3kInternalError,
@@ -39,6 +41,9 @@ from alexandria3k.common import (
     try_sql_execute,
     warn,
 )
+from alexandria3k.data_sources_lib import read_ahead
+from alexandria3k.data_sources_lib.container_cache import has_index
+from alexandria3k.parallel import bounded_imap, process_pool, worker_state
 from alexandria3k.tsort import tsort
 
 # pylint: disable=too-many-lines
@@ -62,9 +67,141 @@ CONTAINER_INDEX = 1
 ROWID_INDEX = 2
 """int: database table index using the row id."""
 
+KEY_INDEX = 4
+"""int: database table index using a key column (e.g. DOI) looked up
+in the container catalog."""
+
+FILTER_INDEX = 8
+"""int: database table index evaluating constraints on filterable
+columns in the cursor."""
+
 PROGRESS_BAR_LENGTH = 50
 """int: length of the progress bar printed during database population."""
 
+RE_POPULATED_REFERENCE = re.compile(r"\bpopulated\s*\.", re.IGNORECASE)
+"""Regular expression matching references to the populated database."""
+
+MAX_USED_COLUMN = 63
+"""int: SQLite reports uses of this and all following columns through
+this column's ordinal."""
+
+FILTER_SELECTIVITY = {
+    apsw.SQLITE_INDEX_CONSTRAINT_EQ: 0.1,
+    apsw.SQLITE_INDEX_CONSTRAINT_GT: 0.25,
+    apsw.SQLITE_INDEX_CONSTRAINT_GE: 0.25,
+    apsw.SQLITE_INDEX_CONSTRAINT_LT: 0.25,
+    apsw.SQLITE_INDEX_CONSTRAINT_LE: 0.25,
+    apsw.SQLITE_INDEX_CONSTRAINT_LIKE: 0.25,
+}
+"""dict: constraint operations on filterable columns that cursors can
+evaluate, and the estimated fraction of the rows satisfying them."""
+
+FILTER_OPERATORS = {
+    apsw.SQLITE_INDEX_CONSTRAINT_EQ: operator.eq,
+    apsw.SQLITE_INDEX_CONSTRAINT_GT: operator.gt,
+    apsw.SQLITE_INDEX_CONSTRAINT_GE: operator.ge,
+    apsw.SQLITE_INDEX_CONSTRAINT_LT: operator.lt,
+    apsw.SQLITE_INDEX_CONSTRAINT_LE: operator.le,
+}
+"""dict: Python functions of the filterable comparison operations."""
+
+CONTAINER_COST = 2000
+"""int: estimated cost of reading a container: about 2000 disk i/o
+(8M file / 4k block)."""
+
+CONTAINER_ROWS = 5000
+"""int: estimated number of rows in a container, when these are not
+known through the container catalog."""
+
+CONTAINER_COUNT = 1000
+"""int: estimated number of containers of data sources that cannot
+report it."""
+
+
+def encode_index_name(key_name, used_columns, filters=()):
+    """Return the index name passed to the cursors' Filter method for
+    the specified key column name (or None), set of the ordinals of the
+    columns used by the query (or None if any may be used), and
+    sequence of (column ordinal, operation) filters evaluated by the
+    cursor.  This has the form
+    key_name;ordinal,ordinal,...;ordinal:operation,...
+    Not part of the public API."""
+    if used_columns is None or any(
+        column >= MAX_USED_COLUMN for column in used_columns
+    ):
+        # Columns past the mask's range; all may be used
+        ordinals = "*"
+    else:
+        ordinals = ",".join(str(column) for column in sorted(used_columns))
+    filter_list = ",".join(f"{column}:{op}" for column, op in filters)
+    return f"{key_name or ''};{ordinals};{filter_list}"
+
+
+@functools.lru_cache(maxsize=None)
+def decode_index_name(index_name):
+    """Return a tuple with the key column name (or None), a frozenset
+    with the ordinals of the columns used by the query (or None if any
+    may be used), and a tuple of the (column ordinal, operation) filters
+    encoded in the specified index name.
+    Not part of the public API."""
+    if index_name is None:
+        return (None, None, ())
+    fields = index_name.split(";")
+    key_name = fields[0]
+    ordinals = fields[1] if len(fields) > 1 else "*"
+    filter_list = fields[2] if len(fields) > 2 else ""
+    used_columns = None
+    if ordinals != "*":
+        used_columns = frozenset(int(o) for o in ordinals.split(",") if o)
+    filters = tuple(
+        tuple(int(value) for value in column_filter.split(":"))
+        for column_filter in filter_list.split(",")
+        if column_filter
+    )
+    return (key_name or None, used_columns, filters)
+
+
+@functools.lru_cache(maxsize=256)
+def like_regex(pattern):
+    """Return a compiled regular expression matching a superset of the
+    strings matched by the specified SQL LIKE pattern.
+    Not part of the public API."""
+    parts = []
+    for char in pattern:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    # SQLite ignores the case of ASCII characters only
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def filter_matches(value, operation, argument):
+    """Return False if the specified column value certainly fails the
+    specified constraint operation with the specified argument, which
+    can be a set of values for an IN constraint.  Values whose
+    comparison depends on SQLite's type affinity rules are kept, for
+    the engine to check them.
+    Not part of the public API."""
+    if value is None or argument is None:
+        # NULL satisfies no comparison
+        return False
+    if isinstance(argument, (set, frozenset, tuple, list)):
+        return any(filter_matches(value, operation, a) for a in argument)
+    if operation == apsw.SQLITE_INDEX_CONSTRAINT_LIKE:
+        if not isinstance(value, str) or not isinstance(argument, str):
+            return True
+        return like_regex(argument).fullmatch(value) is not None
+    if (
+        isinstance(value, str) != isinstance(argument, str)
+        or not isinstance(value, (str, int, float))
+        or not isinstance(argument, (str, int, float))
+    ):
+        return True
+    return FILTER_OPERATORS[operation](value, argument)
+
 
 class StreamingTable:
     """
@@ -105,6 +242,80 @@ class StreamingTable:
         for the operation at hand"""
         return None
 
+    # pylint: disable-next=too-many-locals
+    def BestIndexObject(self, index_info):
+        """Called by the Engine to determine the best available index
+        for the operation at hand through an apsw IndexInfo object.
+        This obtains the index through the BestIndex method, and
+        passes to the cursors through the index name the columns used
+        by the query, so that they can skip work on unused data.
+        BestIndex can also return the estimated number of rows as a
+        sixth element, and request all values of an IN constraint at
+        once through a third element of a constraint's usage."""
+        # Cursors compare values with the default (BINARY) collation
+        usable = [
+            i
+            for i in range(index_info.nConstraint)
+            if index_info.get_aConstraint_usable(i)
+            and index_info.get_aConstraint_collation(i) == "BINARY"
+        ]
+        constraints = [
+            (
+                index_info.get_aConstraint_iColumn(i),
+                index_info.get_aConstraint_op(i),
+            )
+            for i in usable
+        ]
+        orderbys = [
+            (
+                index_info.get_aOrderBy_iColumn(i),
+                index_info.get_aOrderBy_desc(i),
+            )
+            for i in range(index_info.nOrderBy)
+        ]
+        index_name = None
+        # pylint: disable-next=assignment-from-none
+        best_index = self.BestIndex(constraints, orderbys)
+        if best_index is not None:
+            (
+                used_constraints,
+                index_number,
+                index_name,
+                order_by_consumed,
+                cost,
+            ) = best_index[:5]
+            for i, usage in zip(usable, used_constraints):
+                if usage is None:
+                    continue
+                argument_index, omit, *all_values = usage
+                # IndexInfo argument indexes start from 1
+                index_info.set_aConstraintUsage_argvIndex(
+                    i, argument_index + 1
+                )
+                index_info.set_aConstraintUsage_omit(i, omit)
+                if all_values and index_info.get_aConstraintUsage_in(i):
+                    index_info.set_aConstraintUsage_in(i, True)
+            index_info.idxNum = index_number
+            index_info.orderByConsumed = order_by_consumed
+            index_info.estimatedCost = cost
+            if len(best_index) > 5:
+                index_info.estimatedRows = int(best_index[5])
+        key_name, _used_columns, filters = decode_index_name(index_name)
+        index_info.idxStr = encode_index_name(
+            key_name, index_info.colUsed, filters
+        )
+        return True
+
+    def get_used_columns(self, index_name):
+        """Return a frozenset with the names of the table's columns used
+        by the query whose index name is specified, or None if any column
+        may be used.  Not part of the apsw interface."""
+        used_columns = decode_index_name(index_name)[1]
+        if used_columns is None:
+            return None
+        columns = self.table_meta.get_columns()
+        return frozenset(columns[i].get_name() for i in used_columns)
+
     def Disconnect(self):
         """Called when a reference to a virtual table is no longer used"""
 
@@ -152,48 +363,145 @@ class StreamingTable:
 class StreamingCachedContainerTable(StreamingTable):
     """An apsw table streaming over data of the supplied table metadata.
     This works over a cached data container (e.g. a parsed JSON or XML
-    file) that allows indexing entries within it."""
+    file) that allows indexing entries within it.
+    The optional catalog argument is the data source's container catalog,
+    which allows the direct access of rows through their catalogued keys.
+    """
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        table_meta,
+        table_dict,
+        data_source,
+        sample=lambda x: True,
+        catalog=None,
+    ):
+        super().__init__(table_meta, table_dict, data_source, sample)
+        self.catalog = catalog
 
-    # pylint: disable-next=arguments-differ
+    def key_column(self, column):
+        """Return the name of the column with the specified ordinal if it
+        is a catalogued key that can be used for accessing rows, or None.
+        Not part of the apsw API."""
+        if column < 0 or not self.catalog or not self.catalog.complete:
+            return None
+        column_meta = self.table_meta.get_columns()[column]
+        if container_catalog.KEY not in column_meta.get_catalog():
+            return None
+        return column_meta.get_name()
+
+    def estimated_size(self):
+        """Return a tuple with the estimated number of the table's
+        containers and rows.  Not part of the apsw API."""
+        try:
+            containers = len(self.data_source)
+        except TypeError:
+            containers = CONTAINER_COUNT
+        rows = None
+        if (
+            self.catalog
+            and self.catalog.complete
+            and not self.table_meta.get_parent_name()
+        ):
+            rows = self.catalog.row_count()
+        if rows is None:
+            rows = containers * CONTAINER_ROWS
+        return (max(containers, 1), max(rows, 1))
+
+    def filterable_column(self, column, operation):
+        """Return True if the cursor can evaluate the specified constraint
+        operation on the column with the specified ordinal.
+        Not part of the apsw API."""
+        return (
+            operation in FILTER_SELECTIVITY
+            and column > CONTAINER_ID_COLUMN
+            and not self.table_meta.get_parent_name()
+            and getattr(
+                self.table_meta.get_cursor_class(), "row_filtering", False
+            )
+            and self.table_meta.get_columns()[column].is_filterable()
+        )
+
+    # pylint: disable-next=arguments-differ,too-many-locals,too-many-branches
     def BestIndex(self, constraints, _orderbys):
         """Called by the Engine to determine the best available index
         for the operation at hand"""
         # print(f"BestIndex gets c={constraints} o={_orderbys}")
-        used_constraints = []
-        index_number = 0
-        for column, operation in constraints:
-            if (
-                column == CONTAINER_ID_COLUMN
-                and operation == apsw.SQLITE_INDEX_CONSTRAINT_EQ
-            ):
-                # Pass value to Filter as constraint_arg[0], and do not
-                # require the engine to perform extra checks (exact match)
-                used_constraints.append((0, False))
-                index_number |= CONTAINER_INDEX
+        direct_access = getattr(
+            self.table_meta.get_cursor_class(), "direct_access", False
+        )
+        # Ordinal of the constraint used for each index
+        indexes = {}
+        key_name = None
+        for i, (column, operation) in enumerate(constraints):
+            if operation != apsw.SQLITE_INDEX_CONSTRAINT_EQ:
+                continue
+            if column == CONTAINER_ID_COLUMN:
+                indexes.setdefault(CONTAINER_INDEX, i)
+            elif column == ROWID_COLUMN and direct_access:
+                indexes.setdefault(ROWID_INDEX, i)
             elif (
-                column == ROWID_COLUMN
-                and operation == apsw.SQLITE_INDEX_CONSTRAINT_EQ
+                direct_access
+                and KEY_INDEX not in indexes
+                and self.key_column(column)
             ):
-                # Pass value to Filter as constraint_arg[1], and do not
-                # require the engine to perform extra checks (exact match)
-                used_constraints.append((1, False))
-                index_number |= ROWID_INDEX
-            else:
-                # No suitable index
-                used_constraints.append(None)
-        if index_number != 0:
-            # print(f"BestIndex returns: {index_number}, {used_constraints}")
-            return (
-                used_constraints,
-                # First argument to Filter: 0 no index, 1 file index,
-                # 2 rowid index, 3 both indexes
-                index_number,
-                None,  # index name (second argument to Filter)
-                False,  # results are not in orderbys order
-                2000
-                / index_number,  # about 2000 disk i/o (8M file / 4k block)
-            )
-        return None
+                indexes[KEY_INDEX] = i
+                key_name = self.key_column(column)
+        # Ordinals of the constraints evaluated by the cursor
+        filter_constraints = [
+            i
+            for i, (column, operation) in enumerate(constraints)
+            if i not in indexes.values()
+            and self.filterable_column(column, operation)
+        ]
+        if not indexes and not filter_constraints:
+            return None
+
+        # Pass the values to Filter in the order of the index numbers,
+        # followed by the filter values.  Have the engine check them
+        # (keys can be normalized and filters are conservative), except
+        # for container ids selecting a partition of several containers.
+        partitioned = getattr(
+            self.data_source, "partitioned_containers", False
+        )
+        used_constraints = [None] * len(constraints)
+        index_number = 0
+        for argument_index, index in enumerate(sorted(indexes)):
+            omit = partitioned and index == CONTAINER_INDEX
+            used_constraints[indexes[index]] = (argument_index, omit)
+            index_number |= index
+        for argument_index, i in enumerate(filter_constraints, len(indexes)):
+            # Obtain all the values of IN constraints in a single call
+            used_constraints[i] = (argument_index, False, True)
+        if filter_constraints:
+            index_number |= FILTER_INDEX
+
+        containers, rows = self.estimated_size()
+        if index_number & (ROWID_INDEX | KEY_INDEX):
+            cost = 10  # A few rows of a single container
+            rows = 1
+        elif index_number & CONTAINER_INDEX:
+            cost = CONTAINER_COST
+            rows /= containers
+        else:
+            cost = CONTAINER_COST * containers
+        for i in filter_constraints:
+            rows *= FILTER_SELECTIVITY[constraints[i][1]]
+        # Each returned row costs a unit for extracting its columns
+        cost += rows
+        filters = [constraints[i] for i in filter_constraints]
+        # print(f"BestIndex returns: {index_number}, {used_constraints}")
+        return (
+            used_constraints,
+            # First argument to Filter: a bit mask of the used indexes
+            index_number,
+            # Second argument to Filter: the key column and filters
+            encode_index_name(key_name, None, filters),
+            False,  # results are not in orderbys order
+            cost,
+            max(rows, 1),
+        )
 
 
 class ElementsCursor:
@@ -284,6 +592,11 @@ class NestedElementsCursor(ElementsCursor):
         of the parent cursor. Not part of the apsw API."""
         return
 
+    def nested_elements(self):
+        """Return the nested elements of the parent cursor's current row.
+        Not part of the apsw API."""
+        return self.parent_cursor.current_row_value().get(self.element_name())
+
     def Next(self):
         """Advance reading to the next available nested element. If the
         current list of elements is exhausted, it fetches the next list from the
@@ -293,9 +606,7 @@ class NestedElementsCursor(ElementsCursor):
                 self.eof = True
                 return
             if not self.elements:
-                self.elements = self.parent_cursor.current_row_value().get(
-                    self.element_name()
-                )
+                self.elements = self.nested_elements()
                 self.element_index = -1
             if not self.elements:
                 self.parent_cursor.Next()
@@ -325,11 +636,30 @@ class RecordsCursor(NestedElementsCursor):
     :type file_cursor: object
     """
 
+    row_id_left_shift = 14
+    """int: bits of the rowid used for the item index; this allows for
+    16k items per file (currently 5k)"""
+
+    direct_access = False
+    """bool: whether the files cursor allows accessing any container, so
+    that rows can be directly accessed through their rowid or catalogued
+    key"""
+
+    row_filtering = True
+    """bool: whether the cursor can skip rows failing constraints on the
+    table's filterable columns"""
+
     def __init__(self, table, files_cursor):
         super().__init__(table, None)
         self.files_cursor = files_cursor
         # Initialized in Filter()
         self.item_index = None
+        # Iterator over the (container id, item index) of directly
+        # accessed rows
+        self.lookup_rows = None
+        # (extraction function, operation, argument) tuples of
+        # constraints that the rows must satisfy
+        self.row_filters = ()
 
     def element_name(self):
         """The work key from which to retrieve the elements. Not part of the
@@ -342,8 +672,9 @@ class RecordsCursor(NestedElementsCursor):
 
     def Rowid(self):
         """Return a unique id of the row along all records"""
-        # Allow for 16k items per file (currently 5k)
-        return (self.files_cursor.Rowid() << 14) | (self.item_index)
+        return (self.files_cursor.Rowid() << self.row_id_left_shift) | (
+            self.item_index
+        )
 
     @abc.abstractmethod
     def current_row_value(self):
@@ -366,22 +697,109 @@ class RecordsCursor(NestedElementsCursor):
     def Filter(self, index_number, index_name, constraint_args):
         """Always called first to initialize an iteration to the first row
         of the table according to the index"""
+        self.lookup_rows = None
+        self.row_filters = ()
+        if index_number & FILTER_INDEX:
+            filters = decode_index_name(index_name)[2]
+            index_args = len(constraint_args) - len(filters)
+            self.row_filters = tuple(
+                (
+                    self.table.get_value_extractor_by_ordinal(column),
+                    operation,
+                    argument,
+                )
+                for (column, operation), argument in zip(
+                    filters, constraint_args[index_args:]
+                )
+            )
+            constraint_args = constraint_args[:index_args]
+            index_number &= ~FILTER_INDEX
+        if index_number & (ROWID_INDEX | KEY_INDEX):
+            rows = self.direct_access_rows(
+                index_number, index_name, constraint_args
+            )
+            if rows is not None:
+                self.lookup_rows = iter(rows)
+                self.next_lookup_row()
+                self.skip_filtered_rows()
+                return
+            # Scan all rows and let the engine check the constraints
+            index_number = 0
         self.files_cursor.Filter(index_number, index_name, constraint_args)
         self.eof = self.files_cursor.Eof()
+        self.item_index = 0
+        self.skip_filtered_rows()
+
+    def skip_filtered_rows(self):
+        """Advance past the rows that fail the cursor's filters.
+        Not part of the apsw API."""
+        while not self.eof and self.row_filters:
+            row = self.current_row_value()
+            if all(
+                filter_matches(extract(row), operation, argument)
+                for extract, operation, argument in self.row_filters
+            ):
+                return
+            self.next_row()
+
+    def direct_access_rows(self, index_number, index_name, constraint_args):
+        """Return a list with the (container id, item index) tuples of the
+        rows satisfying the specified index constraints, or None if these
+        cannot be directly accessed.  Not part of the apsw API."""
+        arguments = list(constraint_args)
+        container_id = None
+        if index_number & CONTAINER_INDEX:
+            container_id = arguments.pop(0)
+        rows = None
         if index_number & ROWID_INDEX:
-            # This has never happened, so this is untested
-            self.item_index = constraint_args[1]
-        else:
-            self.item_index = 0
+            rowid = arguments.pop(0)
+            if not isinstance(rowid, int):
+                return None
+            item_mask = (1 << self.row_id_left_shift) - 1
+            rows = [(rowid >> self.row_id_left_shift, rowid & item_mask)]
+        if index_number & KEY_INDEX:
+            key_name = decode_index_name(index_name)[0]
+            column = self.table.get_table_meta().get_column_by_name(key_name)
+            key_rows = self.table.catalog.lookup(
+                key_name, column.normalized_key(arguments.pop(0))
+            )
+            rows = key_rows if rows is None else set(rows) & set(key_rows)
+        return [
+            (row_container_id, item_index)
+            for row_container_id, item_index in sorted(rows)
+            if container_id is None or row_container_id == container_id
+        ]
+
+    def next_lookup_row(self):
+        """Advance to the next directly accessed row.
+        Not part of the apsw API."""
+        for container_id, item_index in self.lookup_rows:
+            if not 0 <= container_id < len(self.table.data_source):
+                continue
+            self.files_cursor.Filter(CONTAINER_INDEX, None, [container_id])
+            if has_index(self.files_cursor.items, item_index):
+                self.item_index = item_index
+                self.eof = False
+                return
+        self.eof = True
 
-    def Next(self):
-        """Advance to the next item."""
+    def next_row(self):
+        """Advance to the next item, without evaluating the cursor's
+        filters.  Not part of the apsw API."""
+        if self.lookup_rows is not None:
+            self.next_lookup_row()
+            return
         self.item_index += 1
-        if self.item_index >= len(self.files_cursor.items):
+        if not has_index(self.files_cursor.items, self.item_index):
             self.item_index = 0
             self.files_cursor.Next()
             self.eof = self.files_cursor.eof
 
+    def Next(self):
+        """Advance to the next item."""
+        self.next_row()
+        self.skip_filtered_rows()
+
     def Close(self):
         """Cursor's destructor, used for cleanup"""
         self.files_cursor.Close()
@@ -475,10 +893,13 @@ class FilesCursor(ItemsCursor):
 
         self.file_index += 1
         path = self.table.data_source[self.file_index]
+        file_cache = self.get_file_cache()
         try:
-            self.items = self.get_file_cache().read(path)
+            self.items = file_cache.read(path)
         except EOFError as exc:
             raise Alexandria3kError(f"Error reading file {path}") from exc
+        # Overlap the reading of the following files with this one's use
+        file_cache.prefetch(self.table.data_source, self.file_index + 1)
         self.eof = False
         # The single file has been read. Set EOF in next Next call
         self.file_read = True
@@ -517,6 +938,111 @@ class _IndexManager:
         self.indexes.clear()
 
 
+class _CurrentRowCursor:
+    """A cursor over just the current row of the specified cursor.
+    It allows iterating the elements nested in the row through the
+    cursors of the tables that are children of the cursor's table."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.eof = False
+
+    # pylint: disable-next=invalid-name
+    def Filter(self, *_args):
+        """Start the iteration over the single row"""
+        self.eof = False
+
+    # pylint: disable-next=invalid-name
+    def Eof(self):
+        """Return True after the row has been iterated"""
+        return self.eof
+
+    # pylint: disable-next=invalid-name
+    def Next(self):
+        """Advance past the single row"""
+        self.eof = True
+
+    # pylint: disable-next=invalid-name
+    def Close(self):
+        """The underlying cursor is closed by its owner"""
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class _ContainerTraversal:
+    """Obtain the rows of the specified tables and columns
+    for a container through a single traversal of its records.
+    The container's records are visited once, and the elements
+    nested in each record (e.g. authors) are visited while the
+    record is current, rather than through a separate scan of the
+    container for each table."""
+
+    def __init__(self, data_source, table_dict, root_name, table_columns):
+        self.table_columns = table_columns
+        self.root_name = root_name
+        # The tables required for reaching the populated ones
+        tables = set([root_name])
+        for table_name in table_columns:
+            while table_name not in tables:
+                tables.add(table_name)
+                table_name = table_dict[table_name].get_parent_name()
+
+        self.ordinals = {}
+        for table_name, columns in table_columns.items():
+            names = [c.get_name() for c in table_dict[table_name].columns]
+            self.ordinals[table_name] = [names.index(c) for c in columns]
+
+        # Create a cursor for each table, nested in its parent's one
+        virtual_tables = {
+            name: data_source.Create(None, None, None, name)[1]
+            for name in tables
+        }
+        self.cursors = {}
+        self.children = {name: [] for name in tables}
+        for table_name in tsort(
+            [table_dict[name] for name in tables], list(tables)
+        ):
+            table = table_dict[table_name]
+            parent_name = table.get_parent_name()
+            cursor_class = table.get_cursor_class()
+            virtual_table = virtual_tables[table_name]
+            if parent_name:
+                self.cursors[table_name] = cursor_class(
+                    virtual_table,
+                    _CurrentRowCursor(self.cursors[parent_name]),
+                )
+                self.children[parent_name].append(table_name)
+            else:
+                self.cursors[table_name] = cursor_class(virtual_table)
+
+    def rows(self, container_id):
+        """Return a list of (table, rows) tuples with the rows
+        that the specified container contributes to each table."""
+        rows = {table: [] for table in self.table_columns}
+        cursor = self.cursors[self.root_name]
+        cursor.Filter(CONTAINER_INDEX, None, [container_id])
+        while not cursor.Eof():
+            self.add_rows(self.root_name, rows)
+            cursor.Next()
+        return [(table, rows[table]) for table in self.table_columns]
+
+    def add_rows(self, table_name, rows):
+        """Add to the specified rows dictionary the current row of the
+        specified table and the rows of the elements nested in it."""
+        cursor = self.cursors[table_name]
+        ordinals = self.ordinals.get(table_name)
+        if ordinals is not None:
+            rows[table_name].append(tuple(cursor.Column(i) for i in ordinals))
+        for child_name in self.children[table_name]:
+            child_cursor = self.cursors[child_name]
+            child_cursor.Filter(0, None, [])
+            while not child_cursor.Eof():
+                self.add_rows(child_name, rows)
+                child_cursor.Next()
+
+
+# pylint: disable-next=too-many-public-methods
 class DataSource:
     """
     Create a meta-data object that supports queries over its
@@ -571,9 +1097,12 @@ class DataSource:
         )
         DataSource.instance_id += 1
         self.cursor = self.vdb.cursor()
+        self.query_column_names = None
         # Register the module as filesource
         self.data_source = data_source
-        self.vdb.create_module("filesource", self.data_source)
+        self.vdb.create_module(
+            "filesource", self.data_source, use_bestindex_object=True
+        )
 
         # Dictionaries of tables containing a set of columns required
         # for querying or populating the database
@@ -587,6 +1116,7 @@ class DataSource:
         self.attach_commands = []
         if attach_databases is None:
             attach_databases = []
+        self.attach_databases = attach_databases
         for db_spec in attach_databases:
             try:
                 db_name, db_path = db_spec.split(":", 1)
@@ -702,7 +1232,7 @@ class DataSource:
         self.vdb.set_authorizer(None)
         self.cursor.set_exec_trace(None)
 
-    def query(self, query, partition=False):
+    def query(self, query, partition=False, workers=1, ordered=True):
         """
         Run the specified query on the virtual database using the data
         specified in the object constructor's call.
@@ -725,14 +1255,46 @@ class DataSource:
             in quadratic (or worse) algorithmic complexity.
         :type partition: bool, optional
 
+        :param workers: The number of processes to use for running
+            a partitioned query over disjoint containers, defaults to 1.
+            This is only supported by data sources whose containers can
+            be accessed independently of each other, such as Crossref
+            and PubMed, or transferred to the workers, such as USPTO
+            and ORCID.
+        :type workers: int, optional
+
+        :param ordered: When true, defaults to `True`, the results of
+            a partitioned query run by multiple workers are returned
+            in container order.  Otherwise the results of each container
+            are returned as soon as they become available.
+        :type ordered: bool, optional
+
         :return: An iterable over the query's results.
         :rtype: iterable
         """
 
         self.cursor = self.vdb.cursor()
+        self.query_column_names = None
+
+        if workers > 1:
+            if not partition:
+                raise Alexandria3kError(
+                    "Multiple workers can only run partitioned queries."
+                )
+            if not supports_workers(self.data_source):
+                raise Alexandria3kError(
+                    "This data source does not support queries with multiple workers."
+                )
 
         # Easy case
         if not partition:
+            row_count = self.catalog_row_count(query)
+            if row_count is not None:
+                self.query_column_names = [row_count[0]]
+                yield from self.cursor.execute(
+                    f'SELECT ? AS "{row_count[0]}"', (row_count[1],)
+                )
+                return
             yield from try_sql_execute(self.cursor, query)
             return
 
@@ -749,10 +1311,29 @@ class DataSource:
         #   Run query on in-memory database
         #   drop tables
         self.set_query_columns(query)
+
+        if workers > 1:
+            yield from self.parallel_query(query, workers, ordered)
+            return
+
+        partition = self.partition_connection()
+        for i in self.scheduled_containers(self.query_container_ids(query)):
+            debug.log(
+                "progress",
+                f"Container {i} {self.data_source.get_container_name(i)}",
+            )
+            yield from self.query_partition(partition, query, i)
+
+    def partition_connection(self):
+        """Return a connection to an in-memory database through which
+        queries can be run on copies of single partitions.
+        Not part of the public API."""
         partition = apsw.Connection(
             ":memory:", apsw.SQLITE_OPEN_READWRITE | apsw.SQLITE_OPEN_URI
         )
-        partition.create_module("filesource", self.data_source)
+        partition.create_module(
+            "filesource", self.data_source, use_bestindex_object=True
+        )
         partition.execute(
             log_sql(f"ATTACH DATABASE '{self.vdb_uri}' AS virtual")
         )
@@ -760,24 +1341,250 @@ class DataSource:
         # Also attach databases to the partition
         for attach_command in self.attach_commands:
             partition.execute(log_sql(attach_command))
-
-        for i in self.data_source.get_container_iterator():
-            debug.log(
-                "progress",
-                f"Container {i} {self.data_source.get_container_name(i)}",
-            )
+        return partition
+
+    def query_partition(self, partition, query, partition_index):
+        """Run the specified query over a copy of the tables of the
+        specified partition, yielding its results.
+        Not part of the public API."""
+        for table_name, table_columns in self.query_columns.items():
+            columns = ", ".join(table_columns)
+            partition.execute(log_sql(f"""CREATE TABLE {table_name}
+              AS SELECT {columns} FROM virtual.{table_name}
+                WHERE virtual.{table_name}.container_id={partition_index}"""))
+        self.cursor = partition.cursor()
+        yield from try_sql_execute(self.cursor, query)
+        for table_name in self.query_columns:
+            partition.execute(log_sql(f"DROP TABLE {table_name}"))
+
+    def parallel_query(self, query, workers, ordered):
+        """Yield the results of running the specified query over each
+        partition through the specified number of worker processes.
+        Not part of the public API."""
+        with process_pool(
+            workers,
+            _init_query_worker,
+            (
+                self.data_source,
+                self.tables,
+                self.attach_databases,
+                self.query_columns,
+                query,
+            ),
+        ) as pool:
+            for container_id, column_names, rows in bounded_imap(
+                pool,
+                _query_worker_container,
+                container_tasks(
+                    self.data_source, self.query_container_ids(query)
+                ),
+                workers * 2,
+                ordered,
+            ):
+                debug.log(
+                    "progress",
+                    f"Container {container_id} "
+                    + self.data_source.get_container_name(container_id),
+                )
+                if column_names:
+                    self.query_column_names = column_names
+                yield from rows
+
+    def get_catalog(self):
+        """Return the data source's container catalog, or None if the
+        data source doesn't support one or none has been created.
+        Not part of the public API."""
+        get_catalog = getattr(self.data_source, "get_catalog", None)
+        return get_catalog() if get_catalog else None
+
+    def container_ids(self, text, is_query):
+        """Return an iterable over the ids of the containers that may
+        contain rows satisfying the specified population condition
+        or (if is_query is true) query.
+        Not part of the public API."""
+        container_ids = self.data_source.get_container_iterator()
+        if not text:
+            return container_ids
+        catalog = self.get_catalog()
+        if not catalog:
+            return container_ids
+        predicates = container_catalog.row_predicates(self, text, is_query)
+        if not predicates:
+            return container_ids
+        candidates = catalog.candidate_containers(
+            list(container_ids), predicates
+        )
+        debug.log(
+            "progress",
+            f"Container catalog: skipping "
+            f"{len(container_ids) - len(candidates)} of "
+            f"{len(container_ids)} containers",
+        )
+        return candidates
+
+    def scheduled_containers(self, container_ids):
+        """Yield the specified container ids, after informing the data
+        source that its containers will be accessed individually in
+        this order, so that the ones read ahead are those accessed
+        next.  Not part of the public API."""
+        schedule = getattr(self.data_source, "schedule_containers", None)
+        if not schedule:
+            yield from container_ids
+            return
+        container_ids = list(container_ids)
+        schedule(container_ids)
+        try:
+            yield from container_ids
+        finally:
+            schedule(None)
+
+    def query_container_ids(self, query):
+        """Return an iterable over the ids of the containers over which
+        the specified partitioned query must run.
+        As the result is the concatenation of the individual partition
+        results, containers can only be skipped if the query yields
+        no rows over an empty partition.  This is not the case for
+        example with ungrouped aggregates, such as COUNT(*).
+        Not part of the public API."""
+        if self.get_catalog() and self.empty_partition_has_rows(query):
+            return self.data_source.get_container_iterator()
+        return self.container_ids(query, True)
+
+    def empty_partition_has_rows(self, query):
+        """Return True if the specified query yields rows when run
+        over empty tables of a partition.
+        Not part of the public API."""
+        partition = self.partition_connection()
+        try:
             for table_name, table_columns in self.query_columns.items():
                 columns = ", ".join(table_columns)
-                partition.execute(log_sql(f"""CREATE TABLE {table_name}
-                  AS SELECT {columns} FROM virtual.{table_name}
-                    WHERE virtual.{table_name}.container_id={i}"""))
-            self.cursor = partition.cursor()
-            yield from try_sql_execute(self.cursor, query)
-            for table_name in self.query_columns:
-                partition.execute(log_sql(f"DROP TABLE {table_name}"))
+                partition.execute(
+                    log_sql(f"CREATE TABLE {table_name}({columns})")
+                )
+            cursor = partition.cursor()
+            for _row in try_sql_execute(cursor, query):
+                return True
+            return False
+        finally:
+            partition.close()
+
+    def catalog_row_count(self, query):
+        """Return a tuple with the column name and the number of
+        rows of the root table, if the specified query only counts
+        these and the container catalog can provide their number.
+        Not part of the public API."""
+        match = container_catalog.RE_COUNT_QUERY.match(query)
+        if not match or match.group(2).lower() != self.root_name.lower():
+            return None
+        catalog = self.get_catalog()
+        if not catalog:
+            return None
+        row_count = catalog.row_count()
+        if row_count is None:
+            return None
+        return match.group(1), row_count
+
+    def index_containers(self):
+        """
+        Create a catalog of the data source's containers, which is
+        stored in the data source's directory.  For each container
+        the catalog records the number of the root table's rows and
+        the statistics of its columns that are declared as catalogued
+        (e.g. the range of publication years or the DOI prefixes).
+        Subsequent partitioned queries and population operations with
+        a row selection condition use the catalog to skip containers
+        whose statistics show that they have no matching rows.
+        Catalogued key columns (e.g. DOIs) also allow queries to
+        directly access the rows having specific key values.
+        """
+        create_catalog = getattr(self.data_source, "create_catalog", None)
+        if not create_catalog:
+            raise Alexandria3kError(
+                "This data source does not support a container catalog."
+            )
+        root_table = self.get_table_meta_by_name(self.root_name)
+        columns = [c for c in root_table.get_columns() if c.get_catalog()]
+        # Values are copied into a table with the columns' declared types,
+        # so that the statistics reflect the values' affinity.
+        # As the table is emptied for each container, its rowid
+        # is the item index of each container's row plus one.
+        definitions = ", ".join(c.get_definition() for c in columns)
+        self.vdb.execute(
+            log_sql(f"CREATE TEMP TABLE catalog_rows({definitions})")
+        )
+        column_names = ", ".join(c.get_name() for c in columns)
+        statistics = ["COUNT(*)"]
+        for column in columns:
+            if container_catalog.RANGE in column.get_catalog():
+                name = column.get_name()
+                statistics += [f"MIN({name})", f"MAX({name})"]
+        statistics = ", ".join(statistics)
+
+        writer = create_catalog(self.root_name)
+        for i in self.data_source.get_container_iterator():
+            path = self.data_source.get_container_name(i)
+            debug.log("progress", f"Container {i} {path}")
+            self.vdb.execute(
+                log_sql(f"""INSERT INTO temp.catalog_rows SELECT {column_names}
+                      FROM {self.root_name} WHERE container_id = ?"""),
+                (i,),
+            )
+            values = self.vdb.execute(
+                log_sql(f"SELECT {statistics} FROM temp.catalog_rows")
+            ).fetchone()
+            writer.add_container(i, path, values[0])
+            values = values[1:]
+            for column in columns:
+                if container_catalog.RANGE in column.get_catalog():
+                    writer.add_range(
+                        i, column.get_name(), values[0], values[1]
+                    )
+                    values = values[2:]
+                self.catalog_column_values(writer, i, column)
+            self.vdb.execute("DELETE FROM temp.catalog_rows")
+        writer.close()
+        self.vdb.execute("DROP TABLE temp.catalog_rows")
+        perf.log("Container indexing")
+
+    def catalog_column_values(self, writer, container_id, column):
+        """Add to the specified catalog writer the values or keys
+        of the specified column in the specified container, which
+        have been copied into the catalog_rows table.
+        Not part of the public API."""
+        name = column.get_name()
+        kinds = column.get_catalog()
+        if container_catalog.KEY in kinds:
+            writer.add_keys(
+                container_id,
+                name,
+                [
+                    (column.normalized_key(value), rowid - 1)
+                    for value, rowid in self.vdb.execute(
+                        log_sql(f"""SELECT {name}, rowid FROM temp.catalog_rows
+                              WHERE {name} IS NOT NULL""")
+                    )
+                ],
+            )
+        if not (
+            container_catalog.VALUES in kinds
+            or container_catalog.PREFIX in kinds
+        ):
+            return
+        distinct = [
+            value
+            for (value,) in self.vdb.execute(
+                log_sql(f"""SELECT DISTINCT {name} FROM temp.catalog_rows
+                      WHERE {name} IS NOT NULL""")
+            )
+        ]
+        if container_catalog.PREFIX in kinds:
+            distinct = {container_catalog.value_prefix(v) for v in distinct}
+        writer.add_values(container_id, name, distinct)
 
     def get_query_column_names(self):
         """Return the column names associated with an executing query"""
+        if self.query_column_names:
+            return self.query_column_names
         return [description[0] for description in self.cursor.description]
 
     def download(self, data_location, database=None, sql_query=None):
@@ -800,12 +1607,289 @@ class DataSource:
             "This data source does not support downloading."
         )
 
-    # pylint: disable-next=too-many-locals
+    def set_join_columns(self):
+        """Add the columns required for joining the tables used
+        for populating and querying the data.  Not part of the public API."""
+        to_add = []
+        for table_name in self.query_and_population_tables():
+            while table_name:
+                table = self.get_table_meta_by_name(table_name)
+                parent_table_name = table.get_parent_name()
+                primary_key = table.get_primary_key()
+                foreign_key = table.get_foreign_key()
+                if foreign_key:
+                    to_add.append((table_name, foreign_key))
+                if parent_table_name and primary_key:
+                    to_add.append((parent_table_name, primary_key))
+                table_name = parent_table_name
+        # print("ADD COLUMNS ", to_add)
+        for table, column in to_add:
+            DataSource.add_column(
+                self.query_and_population_columns, table, column
+            )
+
+    def query_and_population_tables(self):
+        """Return a sequence consisting of the tables required
+        for populating and querying the data.  Not part of the public API."""
+        return set.union(
+            set(self.population_columns.keys()),
+            set(self.query_columns.keys()),
+        )
+
+    def joined_tables(self, table_names, rename_temp):
+        """Return JOIN statements for all specified tables.
+        If rename_temp is True, temporary tables are renamed to
+        their virtual names (e.g. temp_workers becomes workers).
+        This change provides a context for evaluating user-specified
+        queries.  Not part of the public API."""
+        result = ""
+        tables_meta = [self.get_table_meta_by_name(t) for t in table_names]
+        sorted_tables = tsort(tables_meta, table_names)
+        debug.log("sorted-tables", sorted_tables)
+        for table_name in sorted_tables:
+            if table_name == self.root_name:
+                continue
+            table = self.get_table_meta_by_name(table_name)
+            parent_table_name = table.get_parent_name()
+            primary_key = table.get_primary_key()
+            foreign_key = table.get_foreign_key()
+            if rename_temp:
+                rename = f"AS {table_name}"
+                primary_table_name = parent_table_name
+                foreign_table_name = table_name
+            else:
+                rename = ""
+                primary_table_name = f"temp_{parent_table_name}"
+                foreign_table_name = f"temp_{table_name}"
+            result += f""" INNER JOIN temp_{table_name} {rename} ON
+                {primary_table_name}.{primary_key}
+                  = {foreign_table_name}.{foreign_key}"""
+            if not rename_temp:
+                self.index_manager.create_index(
+                    f"temp_{parent_table_name}", primary_key
+                )
+                self.index_manager.create_index(
+                    f"temp_{table_name}", foreign_key
+                )
+        return result
+
+    @staticmethod
+    def partition_condition(table, partition_index):
+        """Return an SQL expression for selecting the rows of the
+        specified table according to the partition index.  If no
+        partitioning is in effect return `True`.
+        Not part of the public API."""
+        return (
+            "true"
+            if partition_index is SINGLE_PARTITION_INDEX
+            else f"{table}.container_id = {partition_index}"
+        )
+
+    def populate_only_root_table(
+        self, table, partition_index, selection_condition
+    ):
+        """Populate the root table, when no other tables will be needed.
+        Not part of the public API."""
+
+        columns = ", ".join(
+            [f"{table}.{col}" for col in self.population_columns[table]]
+        )
+        if not selection_condition:
+            selection_condition = "true"
+
+        # No need for temp table matching at the root
+        self.vdb.execute(log_sql(f"""
+            INSERT INTO populated.{table}
+            SELECT {columns} FROM {table}
+            WHERE {DataSource.partition_condition(table, partition_index)}
+              AND {selection_condition}
+        """))
+        perf.log(f"Populate {table}")
+
+    def populate_table(self, table, partition_index, condition):
+        """Populate the specified table.  Not part of the public API."""
+
+        columns = ", ".join(
+            [f"{table}.{col}" for col in self.population_columns[table]]
+        )
+
+        if condition:
+            path = self.tables_transitive_closure([table], self.root_name)
+
+            # One would think that an index on rowid is implied, but
+            # removing it increases the time required to process
+            # 3581.json.gz from the April 2022 dataset from 6.5"
+            # to 18.4".
+            self.index_manager.create_index(f"temp_{table}", "rowid")
+
+            # Putting AND in the JOIN condition, rather than WHERE
+            # improves dramatically the execution's performance time
+            exists = f"""AND EXISTS (SELECT 1
+              FROM temp_matched AS temp_{self.root_name}
+              {self.joined_tables(path, False)}
+              {"AND" if len(path) > 1 else "WHERE"}
+                {table}.rowid = temp_{table}.rowid)"""
+        else:
+            exists = ""
+
+        statement = f"""
+            INSERT INTO populated.{table}
+                SELECT {columns} FROM {table}
+                WHERE {DataSource.partition_condition(table, partition_index)}
+                  {exists}
+            """
+        self.vdb.execute(log_sql(statement))
+        perf.log(f"Populate {table}")
+
+    def create_matched_tables(self, partition_index, condition):
+        """Create copies of the virtual tables of the specified partition
+        for fast access.  Not part of the public API."""
+        for table in self.query_and_population_tables():
+            columns = self.query_and_population_columns.get(table)
+            if columns:
+                columns = set.union(columns, {"rowid"})
+            else:
+                columns = {"rowid"}
+
+            # Add query columns
+            query_columns_of_table = self.query_columns.get(table)
+            if query_columns_of_table:
+                columns = set.union(columns, query_columns_of_table)
+
+            column_list = ", ".join(columns)
+            self.vdb.execute(log_sql(f"""DROP TABLE IF EXISTS temp_{table}"""))
+            create = f"""CREATE TEMP TABLE temp_{table} AS
+                SELECT {column_list} FROM {table}
+                WHERE container_id = {partition_index}"""
+            self.vdb.execute(log_sql(create))
+        perf.log("Virtual table copies")
+
+        # Create a table containing the root table ids ids for all root
+        # table elements matching the query, which is executed in a context
+        # containing all required tables.
+        query_table_names = self.tables_transitive_closure(
+            self.query_columns.keys(), self.root_name
+        )
+        create = (
+            f"""CREATE TEMP TABLE temp_matched AS
+                    SELECT {self.root_name}.id, {self.root_name}.rowid
+                    FROM temp_{self.root_name} AS {self.root_name} """
+            + self.joined_tables(query_table_names, True)
+            + f" WHERE ({condition})"
+        )
+        self.vdb.execute(log_sql("DROP TABLE IF EXISTS temp_matched"))
+        self.vdb.execute(log_sql(create))
+
+        if debug.enabled("dump-matched"):
+            csv_writer = csv.writer(debug.get_output(), delimiter="\t")
+            for rec in self.cursor.execute("SELECT * FROM temp_matched"):
+                csv_writer.writerow(rec)
+
+        perf.log("Matched table creation")
+
+    def populate_container(self, partition_index, condition):
+        """Populate all tables from the records of the specified container.
+        Not part of the public API."""
+        if len(self.query_and_population_tables()) == 1:
+            # False positive
+            # pylint: disable-next=unbalanced-dict-unpacking
+            (table,) = self.population_columns
+            self.populate_only_root_table(table, partition_index, condition)
+        else:
+            if condition:
+                self.create_matched_tables(partition_index, condition)
+
+            for table in self.population_columns:
+                self.populate_table(table, partition_index, condition)
+            self.index_manager.drop_indexes()
+
+    def population_table_columns(self):
+        """Return a dictionary with the ordered list of the columns
+        populated in each table.  Not part of the public API."""
+        table_columns = {}
+        for table, columns in self.population_columns.items():
+            if "*" in columns:
+                columns = [
+                    column.get_name()
+                    for column in self.get_table_meta_by_name(
+                        table
+                    ).get_columns()
+                ]
+            table_columns[table] = list(columns)
+        return table_columns
+
+    def single_pass_population(self, condition):
+        """Return true if the tables can be populated through a single
+        traversal of each container's records, without going through
+        the virtual tables.  This is possible for the unconditional
+        population of data sources whose containers can be accessed
+        individually, or that consist of a single container.
+        Not part of the public API."""
+        return not condition and (
+            supports_workers(self.data_source)
+            or getattr(self.data_source, "single_container", False)
+        )
+
+    def container_traversal(self, table_columns):
+        """Return a _ContainerTraversal for obtaining the rows of the
+        specified table columns.  Not part of the public API."""
+        return _ContainerTraversal(
+            self.data_source, self.table_dict, self.root_name, table_columns
+        )
+
+    def write_rows(self, inserts, table_rows):
+        """Write to the populated database in a single transaction the
+        specified (table, rows) tuples through the specified insert
+        statements.  Not part of the public API."""
+        with self.vdb:
+            for table, rows in table_rows:
+                self.vdb.executemany(log_sql(inserts[table]), rows)
+
+    def parallel_populate(self, workers, condition):
+        """Populate the attached populated database through the specified
+        number of worker processes.  Each worker obtains the rows of
+        a single container, either through a single traversal of its
+        records or by populating an in-memory copy of the database,
+        and returns them to be written by this (single) process.
+        Not part of the public API."""
+        table_columns = self.population_table_columns()
+        inserts = populated_inserts(table_columns)
+        with process_pool(
+            workers,
+            _init_population_worker,
+            (
+                self.data_source,
+                self.tables,
+                self.attach_databases,
+                table_columns,
+                self.query_columns,
+                self.query_and_population_columns,
+                condition,
+            ),
+        ) as pool:
+            for container_id, table_rows in bounded_imap(
+                pool,
+                _populate_worker_container,
+                container_tasks(
+                    self.data_source, self.container_ids(condition, False)
+                ),
+                workers * 2,
+            ):
+                debug.log(
+                    "progress",
+                    f"Container {container_id} "
+                    + self.data_source.get_container_name(container_id),
+                )
+                self.write_rows(inserts, table_rows)
+                perf.log(f"Write container {container_id}")
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments,too-many-statements
     def populate(
         self,
         database_path,
         columns=None,
         condition=None,
+        workers=1,
     ):
         """
         Populate the specified SQLite database using the data specified
@@ -833,140 +1917,21 @@ class DataSource:
             corresponding main table's record.
         :type condition: str, optional
 
+        :param workers: The number of processes to use for reading,
+            decompressing, parsing, and extracting the data of disjoint
+            containers, defaults to 1.
+            When more than one worker is specified, the extracted rows
+            are written to the database by the calling process.
+            This is only supported by data sources whose containers can
+            be accessed independently of each other, such as Crossref
+            and PubMed, or transferred to the workers, such as USPTO
+            and ORCID.
+        :type workers: int, optional
+
 
         .. _SQL expression: https://www.sqlite.org/syntax/expr.html
         """
 
-        # pylint: disable=too-many-statements
-        def set_join_columns():
-            """Add columns required for joins"""
-            to_add = []
-            for table_name in query_and_population_tables():
-                while table_name:
-                    table = self.get_table_meta_by_name(table_name)
-                    parent_table_name = table.get_parent_name()
-                    primary_key = table.get_primary_key()
-                    foreign_key = table.get_foreign_key()
-                    if foreign_key:
-                        to_add.append((table_name, foreign_key))
-                    if parent_table_name and primary_key:
-                        to_add.append((parent_table_name, primary_key))
-                    table_name = parent_table_name
-            # print("ADD COLUMNS ", to_add)
-            for table, column in to_add:
-                DataSource.add_column(
-                    self.query_and_population_columns, table, column
-                )
-
-        def query_and_population_tables():
-            """Return a sequence consisting of the tables required
-            for populating and querying the data"""
-            return set.union(
-                set(self.population_columns.keys()),
-                set(self.query_columns.keys()),
-            )
-
-        def joined_tables(table_names, rename_temp):
-            """Return JOIN statements for all specified tables.
-            If rename_temp is True, temporary tables are renamed to
-            their virtual names (e.g. temp_workers becomes workers).
-            This change provides a context for evaluating user-specified
-            queries."""
-            result = ""
-            tables_meta = [self.get_table_meta_by_name(t) for t in table_names]
-            sorted_tables = tsort(tables_meta, table_names)
-            debug.log("sorted-tables", sorted_tables)
-            for table_name in sorted_tables:
-                if table_name == self.root_name:
-                    continue
-                table = self.get_table_meta_by_name(table_name)
-                parent_table_name = table.get_parent_name()
-                primary_key = table.get_primary_key()
-                foreign_key = table.get_foreign_key()
-                if rename_temp:
-                    rename = f"AS {table_name}"
-                    primary_table_name = parent_table_name
-                    foreign_table_name = table_name
-                else:
-                    rename = ""
-                    primary_table_name = f"temp_{parent_table_name}"
-                    foreign_table_name = f"temp_{table_name}"
-                result += f""" INNER JOIN temp_{table_name} {rename} ON
-                    {primary_table_name}.{primary_key}
-                      = {foreign_table_name}.{foreign_key}"""
-                if not rename_temp:
-                    self.index_manager.create_index(
-                        f"temp_{parent_table_name}", primary_key
-                    )
-                    self.index_manager.create_index(
-                        f"temp_{table_name}", foreign_key
-                    )
-            return result
-
-        def partition_condition(partition_index):
-            """Return an SQL expression for selecting the rows
-            according to the partition index.  If no partitioning
-            is in effect return `True`."""
-            return (
-                "true"
-                if partition_index is SINGLE_PARTITION_INDEX
-                else f"{table}.container_id = {partition_index}"
-            )
-
-        def populate_only_root_table(
-            table, partition_index, selection_condition
-        ):
-            """Populate the root table, when no other tables will be needed"""
-
-            columns = ", ".join(
-                [f"{table}.{col}" for col in self.population_columns[table]]
-            )
-            if not selection_condition:
-                selection_condition = "true"
-
-            # No need for temp table matching at the root
-            self.vdb.execute(log_sql(f"""
-                INSERT INTO populated.{table}
-                SELECT {columns} FROM {table}
-                WHERE {partition_condition(partition_index)}
-                  AND {selection_condition}
-            """))
-            perf.log(f"Populate {table}")
-
-        def populate_table(table, partition_index, condition):
-            """Populate the specified table"""
-
-            columns = ", ".join(
-                [f"{table}.{col}" for col in self.population_columns[table]]
-            )
-
-            if condition:
-                path = self.tables_transitive_closure([table], self.root_name)
-
-                # One would think that an index on rowid is implied, but
-                # removing it increases the time required to process
-                # 3581.json.gz from the April 2022 dataset from 6.5"
-                # to 18.4".
-                self.index_manager.create_index(f"temp_{table}", "rowid")
-
-                # Putting AND in the JOIN condition, rather than WHERE
-                # improves dramatically the execution's performance time
-                exists = f"""AND EXISTS (SELECT 1
-                  FROM temp_matched AS temp_{self.root_name}
-                  {joined_tables(path, False)}
-                  {"AND" if len(path) > 1 else "WHERE"}
-                    {table}.rowid = temp_{table}.rowid)"""
-            else:
-                exists = ""
-
-            statement = f"""
-                INSERT INTO populated.{table}
-                    SELECT {columns} FROM {table}
-                    WHERE {partition_condition(partition_index)} {exists}
-                """
-            self.vdb.execute(log_sql(statement))
-            perf.log(f"Populate {table}")
-
         def add_columns(columns, tables, add_column):
             """Call add column for each specified column or for all tables if
             columns is not defined."""
@@ -1016,7 +1981,7 @@ class DataSource:
                 table_names = ", ".join(self.table_dict.keys())
                 query = f"""SELECT DISTINCT 1 FROM {table_names} WHERE {condition}"""
                 self.set_query_columns(query)
-                set_join_columns()
+                self.set_join_columns()
                 perf.log("Condition parsing")
 
             # Create empty tables
@@ -1030,53 +1995,6 @@ class DataSource:
                 )
             perf.log("Table creation")
 
-        def create_matched_tables(matched_tables):
-            """Create copies of the virtual tables for fast access"""
-            for table in matched_tables:
-                columns = self.query_and_population_columns.get(table)
-                if columns:
-                    columns = set.union(columns, {"rowid"})
-                else:
-                    columns = {"rowid"}
-
-                # Add query columns
-                query_columns_of_table = self.query_columns.get(table)
-                if query_columns_of_table:
-                    columns = set.union(columns, query_columns_of_table)
-
-                column_list = ", ".join(columns)
-                self.vdb.execute(
-                    log_sql(f"""DROP TABLE IF EXISTS temp_{table}""")
-                )
-                create = f"""CREATE TEMP TABLE temp_{table} AS
-                    SELECT {column_list} FROM {table}
-                    WHERE container_id = {i}"""
-                self.vdb.execute(log_sql(create))
-            perf.log("Virtual table copies")
-
-            # Create a table containing the root table ids ids for all root
-            # table elements matching the query, which is executed in a context
-            # containing all required tables.
-            query_table_names = self.tables_transitive_closure(
-                self.query_columns.keys(), self.root_name
-            )
-            create = (
-                f"""CREATE TEMP TABLE temp_matched AS
-                        SELECT {self.root_name}.id, {self.root_name}.rowid
-                        FROM temp_{self.root_name} AS {self.root_name} """
-                + joined_tables(query_table_names, True)
-                + f" WHERE ({condition})"
-            )
-            self.vdb.execute(log_sql("DROP TABLE IF EXISTS temp_matched"))
-            self.vdb.execute(log_sql(create))
-
-            if debug.enabled("dump-matched"):
-                csv_writer = csv.writer(debug.get_output(), delimiter="\t")
-                for rec in self.cursor.execute("SELECT * FROM temp_matched"):
-                    csv_writer.writerow(rec)
-
-            perf.log("Matched table creation")
-
         def run_post_population_script(table):
             """Run the post population script of the specified table,
             if available, ignoring errors of individual statements."""
@@ -1102,30 +2020,48 @@ class DataSource:
             pdb.commit()
             pdb.close()
 
-        create_database_schema(columns)
-        # Populate all tables from the records of each file in sequence.
-        # This improves the locality of reference and through the constraint
-        # indexing and the file cache avoids opening, reading, decompressing,
-        # and parsing each file multiple times.
-        matched_tables = query_and_population_tables()
-        for i in self.data_source.get_container_iterator():
-            debug.log(
-                "progress",
-                f"Container {i} {self.data_source.get_container_name(i)}",
-            )
-
-            if len(matched_tables) == 1:
-                # False positive
-                # pylint: disable-next=unbalanced-dict-unpacking
-                (table,) = self.population_columns
-                populate_only_root_table(table, i, condition)
-            else:
-                if condition:
-                    create_matched_tables(matched_tables)
+        if workers > 1:
+            if not supports_workers(self.data_source):
+                raise Alexandria3kError(
+                    "This data source does not support population with multiple workers."
+                )
+            if condition and RE_POPULATED_REFERENCE.search(condition):
+                warn(
+                    "Conditions referring to the populated database "
+                    "are evaluated with a single worker."
+                )
+                workers = 1
 
-                for table in self.population_columns:
-                    populate_table(table, i, condition)
-                self.index_manager.drop_indexes()
+        create_database_schema(columns)
+        if workers > 1:
+            self.parallel_populate(workers, condition)
+        elif self.single_pass_population(condition):
+            # Obtain the rows of all tables through a single traversal
+            # of each container and write them in batches.
+            table_columns = self.population_table_columns()
+            inserts = populated_inserts(table_columns)
+            traversal = self.container_traversal(table_columns)
+            for i in self.scheduled_containers(
+                self.container_ids(condition, False)
+            ):
+                debug.log(
+                    "progress",
+                    f"Container {i} {self.data_source.get_container_name(i)}",
+                )
+                self.write_rows(inserts, traversal.rows(i))
+        else:
+            # Populate all tables from the records of each file in sequence.
+            # This improves the locality of reference and through the
+            # constraint indexing and the file cache avoids opening,
+            # reading, decompressing, and parsing each file multiple times.
+            for i in self.scheduled_containers(
+                self.container_ids(condition, False)
+            ):
+                debug.log(
+                    "progress",
+                    f"Container {i} {self.data_source.get_container_name(i)}",
+                )
+                self.populate_container(i, condition)
         perf.log("Table population")
 
         self.vdb.execute(log_sql("DETACH populated"))
@@ -1133,6 +2069,138 @@ class DataSource:
             run_post_population_script(table)
 
 
+def populated_inserts(table_columns):
+    """Return a dictionary with the statements for inserting rows
+    of the specified table columns into the populated database"""
+    return {
+        table: (
+            f"INSERT INTO populated.{table}({', '.join(columns)}) "
+            + f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        for table, columns in table_columns.items()
+    }
+
+
+def supports_workers(data_source):
+    """Return true if the containers of the specified data source can be
+    processed by multiple workers.  Not part of the public API."""
+    return getattr(data_source, "random_access_containers", False) or getattr(
+        data_source, "transferable_containers", False
+    )
+
+
+def container_tasks(data_source, container_ids):
+    """Yield the worker tasks for processing the specified containers.
+    Each task is a tuple with the container id and, for data sources
+    whose containers are read sequentially, the container's data,
+    which the worker installs before processing the container.
+    Not part of the public API."""
+    transferable = getattr(data_source, "transferable_containers", False)
+    for container_id in container_ids:
+        yield (
+            container_id,
+            (
+                data_source.get_container_data(container_id)
+                if transferable
+                else None
+            ),
+        )
+
+
+def _begin_worker_task(task):
+    """Install the data of the specified task's container, if any,
+    and return the container's id."""
+    container_id, data = task
+    if data is not None:
+        worker_state["data_source"].data_source.set_container_data(data)
+    return container_id
+
+
+def _init_query_worker(
+    data_source, tables, attach_databases, query_columns, query
+):
+    """Initialize a process running a query over individual partitions."""
+    # Workers read containers concurrently; reading ahead would
+    # only decode containers processed by other workers.
+    read_ahead.configure(0)
+    worker = DataSource(data_source, tables, attach_databases)
+    worker.query_columns = query_columns
+    worker_state["data_source"] = worker
+    worker_state["partition"] = worker.partition_connection()
+    worker_state["query"] = query
+
+
+def _query_worker_container(task):
+    """Return the container id, the query's column names, and the
+    query's result rows for the specified container task."""
+    container_id = _begin_worker_task(task)
+    worker = worker_state["data_source"]
+    column_names = None
+    rows = []
+    for row in worker.query_partition(
+        worker_state["partition"], worker_state["query"], container_id
+    ):
+        if column_names is None:
+            column_names = worker.get_query_column_names()
+        rows.append(row)
+    return container_id, column_names, rows
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def _init_population_worker(
+    data_source,
+    tables,
+    attach_databases,
+    table_columns,
+    query_columns,
+    query_and_population_columns,
+    condition,
+):
+    """Initialize a process populating the rows of individual containers.
+    The process obtains its own connection to the virtual tables and
+    populates a private in-memory database."""
+    read_ahead.configure(0)
+    worker = DataSource(data_source, tables, attach_databases)
+    # Keep the column order, so that the rows match the writer's inserts
+    worker.population_columns = table_columns
+    worker.query_columns = query_columns
+    worker.query_and_population_columns = query_and_population_columns
+    worker.index_manager = _IndexManager(worker.vdb, worker.root_name)
+    worker.vdb.execute(log_sql("ATTACH DATABASE ':memory:' AS populated"))
+    for table_name, columns in table_columns.items():
+        table = worker.get_table_meta_by_name(table_name)
+        worker.vdb.execute(log_sql(table.table_schema("populated.", columns)))
+
+    worker_state["data_source"] = worker
+    worker_state["table_columns"] = table_columns
+    worker_state["condition"] = condition
+    worker_state["traversal"] = (
+        worker.container_traversal(table_columns)
+        if worker.single_pass_population(condition)
+        else None
+    )
+
+
+def _populate_worker_container(task):
+    """Return the container id and a list of (table, rows) tuples
+    with the rows that the specified container task contributes to each
+    populated table."""
+    container_id = _begin_worker_task(task)
+    traversal = worker_state["traversal"]
+    if traversal:
+        return container_id, traversal.rows(container_id)
+    worker = worker_state["data_source"]
+    worker.populate_container(container_id, worker_state["condition"])
+    result = []
+    for table, columns in worker_state["table_columns"].items():
+        rows = worker.vdb.execute(
+            f"SELECT {', '.join(columns)} FROM populated.{table}"
+        ).fetchall()
+        worker.vdb.execute(f"DELETE FROM populated.{table}")
+        result.append((table, rows))
+    return container_id, result
+
+
 class DataFiles:
     """The source of compressed data files"""
 
@@ -1143,6 +2211,8 @@ class DataFiles:
         file_extension=None,
         file_name_regex=None,
     ):
+        self.directory = directory
+        self.catalog = None
         # Collect the names of all available data files
         self.data_files = []
         counter = 1
@@ -1171,3 +2241,29 @@ class DataFiles:
     def get_container_name(self, fid):
         """Return the name of the file corresponding to the specified fid"""
         return self.data_files[fid]
+
+    def get_catalog_path(self):
+        """Return the path of the data files' container catalog"""
+        return os.path.join(
+            self.directory, container_catalog.CATALOG_FILE_NAME
+        )
+
+    def create_catalog(self, root_name):
+        """Return a CatalogWriter for creating the data files' container
+        catalog for the specified root table"""
+        if self.catalog:
+            self.catalog.close()
+            self.catalog = None
+        return container_catalog.CatalogWriter(
+            self.get_catalog_path(), root_name
+        )
+
+    def get_catalog(self):
+        """Return the data files' container catalog, or None if none
+        has been created"""
+        if self.catalog is None:
+            path = self.get_catalog_path()
+            if not os.path.exists(path):
+                return None
+            self.catalog = container_catalog.Catalog(path, self.data_files)
+        return self.catalog
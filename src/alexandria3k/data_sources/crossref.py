@@ -26,6 +26,7 @@ from alexandria3k.data_source import (
     RecordsCursor,
     StreamingCachedContainerTable,
 )
+from alexandria3k.container_catalog import KEY, PREFIX, RANGE, VALUES
 from alexandria3k.db_schema import ColumnMeta, TableMeta
 from alexandria3k.data_sources_lib.crossref_file_cache import get_file_cache
 
@@ -156,6 +157,9 @@ class VTSource:
     Connection through createmodule in order to instantiate the virtual
     tables."""
 
+    # Containers can be read independently of each other in any order
+    random_access_containers = True
+
     def __init__(self, data_directory, sample):
         self.data_files = DataFiles(data_directory, sample, ".gz")
         self.table_dict = {t.get_name(): t for t in tables}
@@ -166,7 +170,10 @@ class VTSource:
         the table's schema and the virtual table class."""
         table = self.table_dict[table_name]
         return table.table_schema(), StreamingCachedContainerTable(
-            table, self.table_dict, self.data_files.get_file_array()
+            table,
+            self.table_dict,
+            self.data_files.get_file_array(),
+            catalog=self.data_files.get_catalog(),
         )
 
     Connect = Create
@@ -179,10 +186,30 @@ class VTSource:
         """Return the name of the file corresponding to the specified fid"""
         return self.data_files.get_container_name(fid)
 
+    def get_catalog(self):
+        """Return the data files' container catalog, if any"""
+        return self.data_files.get_catalog()
+
+    def schedule_containers(self, container_ids):
+        """Set the containers with the specified ids, or None for all,
+        as those accessed individually in this order, for reading them
+        ahead"""
+        get_file_cache().schedule(
+            None
+            if container_ids is None
+            else [self.data_files.get_container_name(i) for i in container_ids]
+        )
+
+    def create_catalog(self, root_name):
+        """Return a writer for the data files' container catalog"""
+        return self.data_files.create_catalog(root_name)
+
 
 class WorksCursor(RecordsCursor):
     """A cursor over the works data."""
 
+    direct_access = True
+
     def __init__(self, table):
         super().__init__(table, None)
         self.files_cursor = FilesCursor(table, get_file_cache)
@@ -391,7 +418,13 @@ tables = [
         columns=[
             ColumnMeta("id"),
             ColumnMeta("container_id"),
-            ColumnMeta("doi", lambda row: dict_value(row, "DOI").lower()),
+            ColumnMeta(
+                "doi",
+                lambda row: dict_value(row, "DOI").lower(),
+                catalog=(PREFIX, KEY),
+                key_normalizer=normalized_doi,
+                filterable=True,
+            ),
             ColumnMeta(
                 "title", lambda row: tab_values(dict_value(row, "title"))
             ),
@@ -403,6 +436,8 @@ tables = [
                     ),
                     0,
                 ),
+                catalog=RANGE,
+                filterable=True,
             ),
             ColumnMeta(
                 "published_month",
@@ -434,7 +469,12 @@ tables = [
             ),
             ColumnMeta("publisher", lambda row: dict_value(row, "publisher")),
             ColumnMeta("abstract", lambda row: dict_value(row, "abstract")),
-            ColumnMeta("type", lambda row: dict_value(row, "type")),
+            ColumnMeta(
+                "type",
+                lambda row: dict_value(row, "type"),
+                catalog=VALUES,
+                filterable=True,
+            ),
             ColumnMeta("subtype", lambda row: dict_value(row, "subtype")),
             ColumnMeta("page", lambda row: dict_value(row, "page")),
             ColumnMeta("volume", lambda row: dict_value(row, "volume")),
@@ -447,9 +487,17 @@ tables = [
                     dict_value(row, "journal-issue"), "issue"
                 ),
             ),
-            ColumnMeta("issn_print", lambda row: issn_value(row, "print")),
             ColumnMeta(
-                "issn_electronic", lambda row: issn_value(row, "electronic")
+                "issn_print",
+                lambda row: issn_value(row, "print"),
+                catalog=VALUES,
+                filterable=True,
+            ),
+            ColumnMeta(
+                "issn_electronic",
+                lambda row: issn_value(row, "electronic"),
+                catalog=VALUES,
+                filterable=True,
             ),
             # Synthetic column, which can be used for population filtering
             ColumnMeta(
@@ -18,7 +18,6 @@
 #
 """DataCite publication data"""
 
-import json
 import os
 import tarfile
 
@@ -35,7 +34,13 @@ from alexandria3k.data_source import (
 )
 
 from alexandria3k.db_schema import ColumnMeta, TableMeta
-from alexandria3k import debug
+from alexandria3k.data_sources_lib import (
+    archive_index,
+    decompression,
+    json_backend,
+)
+from alexandria3k.data_sources_lib.json_stream import chunked_lines
+from alexandria3k import debug, perf
 
 DEFAULT_SOURCE = None
 
@@ -56,35 +61,21 @@ def float_value(string):
     return float(string) if string else None
 
 
+def decoded_record(line):
+    """Return the decoded record of the specified JSON line"""
+    return json_backend.loads(line)
+
+
 class WorksCursor(RecordsCursor):
     """A cursor over the works data."""
 
     def __init__(self, table):
         super().__init__(table, None)
         self.files_cursor = TarFilesCursor(table)
-        self.cached_json_item_index = None
-        self.json_data = None
 
     def current_row_value(self):
         """Return the current row. Not part of the apsw API."""
-        if self.cached_json_item_index != self.item_index:
-            json_string = self.files_cursor.current_row_value()[
-                self.item_index
-            ]
-            self.json_data = json.loads(json_string)
-            # Record 10.17031/637b5e4a8d3ae of file10.17031/part_00001.jsonl
-            # and others have affiliation as a dict, rather than an array
-            # containing a dict.  Detect and fix.
-            for relation in ["creators", "contributors"]:
-                for creator in self.json_data[relation]:
-                    affiliation = creator.get("affiliation")
-                    if isinstance(affiliation, dict):
-                        creator["affiliation"] = [affiliation]
-                    name_identifiers = creator.get("nameIdentifiers")
-                    if isinstance(name_identifiers, dict):
-                        creator["nameIdentifiers"] = [name_identifiers]
-            self.cached_json_item_index = self.item_index
-        return self.json_data
+        return self.files_cursor.current_row_value()[self.item_index]
 
 
 class CreatorsCursor(NestedElementsCursor):
@@ -111,7 +102,25 @@ class CreatorsCursor(NestedElementsCursor):
         return super().Column(col)
 
 
-class AffiliationsCursor(NestedElementsCursor):
+# pylint: disable-next=abstract-method
+class PersonElementsCursor(NestedElementsCursor):
+    """An abstract cursor over elements of the creators'/contributors'
+    data, which may appear as a single dict rather than as a list."""
+
+    def nested_elements(self):
+        """Return the nested elements as a list.
+        Not part of the apsw API."""
+        elements = super().nested_elements()
+        # Record 10.17031/637b5e4a8d3ae of file10.17031/part_00001.jsonl
+        # and others have affiliation as a dict, rather than an array
+        # containing a dict.  Detect and fix here, so that records are
+        # only fixed for the tables that need it.
+        if isinstance(elements, dict):
+            return [elements]
+        return elements
+
+
+class AffiliationsCursor(PersonElementsCursor):
     """A cursor over the creators'/contributors' affiliation data."""
 
     def element_name(self):
@@ -131,7 +140,7 @@ class AffiliationsCursor(NestedElementsCursor):
         return super().Column(col)
 
 
-class NameIdentifierCursor(NestedElementsCursor):
+class NameIdentifierCursor(PersonElementsCursor):
     """A cursor over the creators'/contributors' name identifier data."""
 
     def element_name(self):
@@ -360,11 +369,14 @@ tables = [
                     dict_value(row, "container"), "identifierType"
                 ),
             ),
-            ColumnMeta("doi", lambda row: dict_value(row, "doi")),
+            ColumnMeta(
+                "doi", lambda row: dict_value(row, "doi"), filterable=True
+            ),
             ColumnMeta("publisher", lambda row: dict_value(row, "publisher")),
             ColumnMeta(
                 "publication_year",
                 lambda row: dict_value(row, "publicationYear"),
+                filterable=True,
             ),
             ColumnMeta(
                 "resource_type",
@@ -377,6 +389,7 @@ tables = [
                 lambda row: dict_value(
                     dict_value(row, "types"), "resourceTypeGeneral"
                 ),
+                filterable=True,
             ),
             ColumnMeta("language", lambda row: dict_value(row, "language")),
             ColumnMeta("sizes", lambda row: str(dict_value(row, "sizes"))),
@@ -714,7 +727,11 @@ tables = [
 # pylint: disable=consider-using-with
 # pylint: disable-next=too-many-instance-attributes
 class TarFiles:
-    """The source of the files residing in the tar.gz file"""
+    """The source of the files residing in the tar.gz file.
+    When the tar file has been indexed through a3k index-archive,
+    its files are listed through the index, and each one is read
+    directly from its position in the tar file, allowing the files to
+    be read in any order, also by worker processes."""
 
     def __init__(
         self,
@@ -729,12 +746,27 @@ class TarFiles:
         self.reader = None
         self.cached_file_contents_index = None
         self.cached_file_contents = None
-        self.generator = self.tar_file_generator()
-
-        try:
-            self.tar = tarfile.open(file_path, "r|gz")
-        except Exception as exc:
-            raise Alexandria3kError(f"Error reading file {file_path}") from exc
+        self.tar = None
+        # The index members of the sampled files, if the file is indexed
+        self.members = None
+        self.index = archive_index.open_index(file_path)
+
+        if self.index:
+            self.members = []
+            for member in self.index.members():
+                _dot, doi_prefix, file_name = member.name.split("/")
+                if self.sample(file_name):
+                    self.data_files.append(doi_prefix + "/" + file_name)
+                    self.members.append(member)
+            self.generator = iter(range(len(self.members)))
+        else:
+            self.generator = self.tar_file_generator()
+            try:
+                self.tar = decompression.open_tar(file_path)
+            except Exception as exc:
+                raise Alexandria3kError(
+                    f"Error reading file {file_path}"
+                ) from exc
 
         # For the progress bar
         self.bytes_read = 0
@@ -755,14 +787,25 @@ class TarFiles:
             yield self.file_index
 
     def get_file_contents(self, file_index):
-        """Return the contents of the file at the specified index"""
+        """Return a list with the decoded records of the
+        file at the specified index.  The list is decoded once and
+        shared by the cursors of all tables accessing the file.
+        The lines are split while reading the file in chunks, because
+        readlines() and "for line in file_reader" fail with:
+        tarfile.StreamError: seeking backwards is not allowed"""
+        if self.index:
+            return self.get_indexed_file_contents(file_index)
         while True:
             try:
                 if self.file_index == file_index:
                     if self.cached_file_contents_index != self.file_index:
+                        # Release the previous file's records before reading
+                        self.cached_file_contents = None
                         reader = self.tar.extractfile(self.tar_info)
-                        self.cached_file_contents = reader.read()
-                        self.bytes_read += len(self.cached_file_contents)
+                        self.cached_file_contents = self.decoded_records(
+                            file_index, chunked_lines(reader)
+                        )
+                        self.bytes_read += self.tar_info.size
                         self.cached_file_contents_index = self.file_index
                     return self.cached_file_contents
                 next(self.generator)
@@ -772,6 +815,34 @@ class TarFiles:
             except StopIteration:
                 return None
 
+    def get_indexed_file_contents(self, file_index):
+        """Return a list with the decoded records of the
+        file at the specified index, read directly through the tar file's
+        index"""
+        if file_index >= len(self.members):
+            return None
+        if self.cached_file_contents_index != file_index:
+            # Release the previous file's records before reading
+            self.cached_file_contents = None
+            member = self.members[file_index]
+            self.cached_file_contents = self.decoded_records(
+                file_index, self.index.read(member).splitlines()
+            )
+            self.bytes_read += member.size
+            self.cached_file_contents_index = file_index
+        return self.cached_file_contents
+
+    def decoded_records(self, file_index, lines):
+        """Return a list with the decoded records of the
+        specified lines of the file at the specified index"""
+        start = perf.counter()
+        records = [decoded_record(line) for line in lines]
+        perf.log(
+            f"Decode {self.data_files[file_index]}: "
+            f"{len(records)} records in {perf.counter() - start:.6f} s"
+        )
+        return records
+
     def get_bytes_read(self):
         """Return the number of uncompressed bytes read from the tar file"""
         return self.bytes_read
@@ -852,13 +923,10 @@ class TarFilesCursor(ItemsCursor):
             return
 
         self.file_index += 1
-        content = self.data_source.get_file_contents(self.file_index)
-        if content:
+        lines = self.data_source.get_file_contents(self.file_index)
+        if lines:
             self.eof = False
-            # readlines() and "for line in file_reader" fail with:
-            # tarfile.StreamError: seeking backwards is not allowed
-            # Therefore, read all the content and then split into lines.
-            self.items = content.splitlines()
+            self.items = lines
             # The single file has been read. Set EOF in next Next call
             self.file_read = True
             self.debug_progress_bar()
@@ -875,6 +943,9 @@ class VTSource:
         self.data_files = TarFiles(data_source, sample)
         self.table_dict = {t.get_name(): t for t in tables}
         self.sample = sample
+        # The files of indexed tar files can be read independently of
+        # each other in any order
+        self.random_access_containers = self.data_files.index is not None
 
     def Create(self, _db, _module_name, _db_name, table_name):
         """Create the specified virtual table
@@ -902,7 +973,10 @@ class Datacite(DataSource):
     queries over its (virtual) table and the population of an SQLite database
     with its data.
 
-    :param data_source: The file path to the DataCite .tar.gz file
+    :param data_source: The file path to the DataCite .tar.gz file.
+        If the file has been indexed through `a3k index-archive`, its
+        files are read directly through the index, allowing them to be
+        processed by worker processes.
     :type data_source: str
 
     :param sample: A callable to row sampling, defaults to `lambda n: True`.
@@ -18,8 +18,7 @@
 #
 """Open Researcher and Contributor ID (ORCID) data"""
 
-import tarfile
-import xml.etree.ElementTree as ET
+import itertools
 
 from alexandria3k.common import (
     Alexandria3kError,
@@ -33,13 +32,24 @@ from alexandria3k.data_source import (
     StreamingCachedContainerTable,
 )
 from alexandria3k import perf
+from alexandria3k.data_sources_lib import (
+    archive_index,
+    decompression,
+    xml_engine,
+)
 from alexandria3k.xml import get_element, getter, all_getter
 from alexandria3k.db_schema import ColumnMeta, TableMeta
 
 # pylint: disable=R0801
+# pylint: disable=too-many-lines
 
 DEFAULT_SOURCE = None
 
+# Number of person records in each partition of the partitioned data
+# access.  Partitions amortize the fixed costs of each partition's
+# population.
+DEFAULT_PARTITION_SIZE = 100
+
 
 # pylint: disable-next=too-many-instance-attributes
 class PersonsCursor:
@@ -47,7 +57,7 @@ class PersonsCursor:
     Each person corresponds to a single XML file.
     If it is used through data_source partitioned data access
     within the context of a TarFiles iterator,
-    it shall return the single element of the TarFiles iterator.
+    it shall return the elements of the TarFiles iterator's partition.
     Otherwise it shall iterate over all elements."""
 
     def __init__(self, table):
@@ -60,6 +70,8 @@ class PersonsCursor:
         self.item_index = -1
         self.single_file = None
         self.file_read = None
+        self.partitioned = None
+        self.member_index = None
         self.iterator = None
         # Set in Next
         self.file_id = None
@@ -100,16 +112,30 @@ class PersonsCursor:
         of the table according to the index"""
         # print(f"Filter n={index_number} c={constraint_args}")
 
+        # Parse only the record sections required by the queried table
+        self.data_source.require_sections(
+            required_sections(
+                self.table.get_table_meta().get_name(),
+                self.table.get_used_columns(_index_name),
+            )
+        )
+        self.partitioned = False
         if index_number == 0:
             # No index; iterate through all the files
             self.item_index = -1
             self.single_file = False
-            self.iterator = self.data_source.get_container_iterator()
+            self.iterator = self.data_source.get_member_iterator()
         elif index_number & CONTAINER_INDEX:
-            # Index; constraint reading through the specified file
             self.single_file = True
-            self.file_read = False
-            self.item_index = constraint_args[0]
+            if self.data_source.iterating_partitions:
+                # Index; constraint reading through the files of the
+                # specified partition
+                self.partitioned = True
+                self.member_index = -1
+            else:
+                # Index; constraint reading through the specified file
+                self.file_read = False
+                self.item_index = constraint_args[0]
         else:
             raise Alexandria3kInternalError(
                 f"Unknown index ({index_number}) specified"
@@ -118,23 +144,33 @@ class PersonsCursor:
 
     def Next(self):
         """Advance to the next item."""
+        if self.partitioned:
+            while True:  # Loop until a sampled file is found
+                self.member_index += 1
+                if not self.data_source.select_member(self.member_index):
+                    self.eof = True
+                    return
+                if self.data_source.is_sampled():
+                    break
+            self.item_index = self.data_source.get_container_id()
+            self.eof = False
+            return
+
         if self.single_file:
-            if self.file_read or not self.table.sample(
-                self.data_source.get_orcid()
-            ):
+            if self.file_read or not self.data_source.is_sampled():
                 self.eof = True
             # The single file has been read. Set EOF in next Next call
             self.file_read = True
             return
 
-        while True:  # Loop until sample returns True
+        while True:  # Loop until a sampled file is found
             self.file_id = next(self.iterator, None)
             if self.file_id is None:
                 self.eof = True
                 return
             self.item_index += 1
             self.eof = False
-            if self.table.sample(self.data_source.get_orcid()):
+            if self.data_source.is_sampled():
                 break
 
     def current_row_value(self):
@@ -161,6 +197,15 @@ class PersonDetailsCursor(ElementsCursor):
         This allows for 16k elements."""
         return (self.parent_cursor.Rowid() << 14) | self.element_index
 
+    def Filter(self, *args):
+        """Always called first to initialize an iteration to the first row
+        of the table"""
+        # The parent cursor may be iterated for another table
+        self.table.get_data_source().require_sections(
+            required_sections(self.table.get_table_meta().get_name(), None)
+        )
+        super().Filter(*args)
+
     def Column(self, col):
         """Return the value of the column with ordinal col"""
         if col == 0:  # id
@@ -625,6 +670,57 @@ tables = [
 
 table_dict = {t.get_name(): t for t in tables}
 
+# The sections of a person record (children of its person and
+# activities-summary elements) required by each details table
+TABLE_SECTIONS = {
+    "person_researcher_urls": f"{RESEARCHER_URL}researcher-urls",
+    "person_countries": f"{ADDRESS}addresses",
+    "person_keywords": f"{KEYWORD}keywords",
+    "person_external_identifiers": (
+        f"{EXTERNAL_IDENTIFIER}external-identifiers"
+    ),
+    "person_distinctions": f"{ACTIVITIES}distinctions",
+    "person_educations": f"{ACTIVITIES}educations",
+    "person_employments": f"{ACTIVITIES}employments",
+    "person_invited_positions": f"{ACTIVITIES}invited-positions",
+    "person_memberships": f"{ACTIVITIES}memberships",
+    "person_qualifications": f"{ACTIVITIES}qualifications",
+    "person_services": f"{ACTIVITIES}services",
+    "person_fundings": f"{ACTIVITIES}fundings",
+    "person_peer_reviews": f"{ACTIVITIES}peer-reviews",
+    "person_research_resources": f"{ACTIVITIES}research-resources",
+    "person_works": f"{ACTIVITIES}works",
+}
+
+# The sections of a person record required by the persons table's columns
+PERSON_COLUMN_SECTIONS = {
+    "given_names": f"{PERSON}name",
+    "family_name": f"{PERSON}name",
+    "biography": f"{PERSON}biography",
+}
+
+# The sections that can be skipped when a record is parsed
+SKIPPABLE_SECTIONS = frozenset(
+    list(TABLE_SECTIONS.values())
+    + list(PERSON_COLUMN_SECTIONS.values())
+    + [f"{OTHER_NAME}other-names", f"{EMAIL}emails"]
+)
+
+
+def required_sections(table_name, column_names):
+    """Return a set with the record sections required for obtaining
+    the specified columns of the specified table.  A None value for
+    the columns signifies all the table's columns."""
+    if table_name in TABLE_SECTIONS:
+        return {TABLE_SECTIONS[table_name]}
+    if column_names is None:
+        return set(PERSON_COLUMN_SECTIONS.values())
+    return {
+        PERSON_COLUMN_SECTIONS[name]
+        for name in column_names
+        if name in PERSON_COLUMN_SECTIONS
+    }
+
 
 def get_table_meta_by_name(name):
     """Return the metadata of the specified table"""
@@ -671,70 +767,195 @@ class ErrorElement:
         return None
 
 
+# pylint: disable-next=too-many-instance-attributes
 class TarFiles:
     """The source of the XML files in a compressed tar archive.
     This is a singleton, iterated over either data_source
     (when partitioning is in effect) or by PersonsCursor.
+    The tar file is read sequentially in partitions of partition_size
+    consecutive files.  The container_id = partition id constraint
+    selects the partition's files, whose container_id values are
+    those of each file.
+    When the tar file has been indexed through a3k index-archive,
+    its files are listed through the index, and their contents are
+    read directly from their position in the tar file when they are
+    parsed, possibly by a worker process.
     The file contents are accessed by PersonsCursor."""
 
-    def __init__(self, file_path, sample):
+    # While the partitions are iterated, the container_id constraint
+    # selects a partition of files, rather than rows having the
+    # specified container_id value, so the cursors apply it.
+    partitioned_containers = True
+
+    def __init__(self, file_path, sample, partition_size):
         # Collect the names of all available data files
         self.file_path = file_path
         self.sample = sample
-        # Set by tar_generator
-        self.tar_info = None
-        self.orcid = None
+        self.partition_size = partition_size
+        self.index = archive_index.open_index(file_path)
+        # Set by partitions
         self.tar = None
+        self.partition_id = -1
+        # Tuples of the current partition's files' id, ORCID, and
+        # XML data or, when the tar file is indexed, archive_index.Member
+        # (None for the files not sampled)
+        self.partition = []
+        # Tuples of the record sections included in each parsed XML
+        # data of the current partition's files and the parsed data
+        self.partition_trees = []
+        # The record sections required by the tables accessed so far
+        self.sections = set()
+        # True while the partitions are iterated by tar_generator
+        self.iterating_partitions = False
+        # Set by select_member
+        self.member_index = None
         self.file_id = -1
-        # Updated by get_element_tree
-        self.element_tree = None
+        self.orcid = None
 
-    def tar_generator(self):
-        """A generator function iterating over the tar file entries."""
-        # pylint: disable-next=consider-using-with
-        self.tar = tarfile.open(self.file_path, "r|gz")
-        for self.tar_info in self.tar:
-            if not self.tar_info.isreg():
+    def files(self):
+        """A generator function iterating over the tar file's regular
+        files, yielding for each one its id, ORCID, and XML data.
+        The data of files that are not sampled are not read."""
+        if self.index:
+            yield from self.indexed_files()
+            return
+        file_id = -1
+        for tar_info in self.tar:
+            if not tar_info.isreg():
                 continue
 
             # Obtain ORCID from file name to avoid extraction and parsing
-            _root, _checksum, file_name = self.tar_info.name.split("/")
-            self.file_id += 1
-            self.orcid = file_name[:-4]
-            self.element_tree = None
-            yield self.file_id
+            _root, _checksum, file_name = tar_info.name.split("/")
+            file_id += 1
+            orcid = file_name[:-4]
+            if self.sample(orcid):
+                xml_data = self.tar.extractfile(tar_info).read()
+            else:
+                xml_data = None
+            yield file_id, orcid, xml_data
+
+    def indexed_files(self):
+        """A generator function iterating over the regular files of the
+        tar file's index, yielding for each one its id, ORCID, and
+        index member, through which its data can be read."""
+        for file_id, member in enumerate(self.index.members()):
+            file_name = member.name.split("/")[2]
+            orcid = file_name[:-4]
+            yield file_id, orcid, member if self.sample(orcid) else None
+
+    def partitions(self):
+        """A generator function iterating over the partitions of the
+        tar file entries, yielding the id of each one."""
+        if not self.index:
+            self.tar = decompression.open_tar(self.file_path)
+        self.partition_id = -1
+        files = self.files()
+        while True:
+            partition = list(itertools.islice(files, self.partition_size))
+            if not partition:
+                return
+            self.partition = partition
+            self.partition_trees = [None] * len(self.partition)
+            self.select_member(0)
+            self.partition_id += 1
+            yield self.partition_id
+
+    def tar_generator(self):
+        """A generator function iterating over the tar file entries'
+        partitions."""
+        # Container id constraints select partitions while iterating.
+        self.iterating_partitions = True
+        try:
+            yield from self.partitions()
+        finally:
+            self.iterating_partitions = False
+
+    def member_generator(self):
+        """A generator function iterating over all tar file entries,
+        yielding the id of each one."""
+        for _partition_id in self.partitions():
+            member_index = 0
+            while self.select_member(member_index):
+                yield self.file_id
+                member_index += 1
+
+    def select_member(self, member_index):
+        """Make the specified file of the current partition the current
+        one.  Return False if the partition has no such file."""
+        if member_index >= len(self.partition):
+            return False
+        self.member_index = member_index
+        self.file_id, self.orcid, _xml_data = self.partition[member_index]
+        return True
+
+    def is_sampled(self):
+        """Return True if the current file is sampled."""
+        return self.partition[self.member_index][2] is not None
+
+    def require_sections(self, sections):
+        """Add the specified record sections to those that are parsed."""
+        self.sections.update(sections)
 
     def get_element_tree(self):
-        """Return the parsed XML data of the current element"""
-        if self.element_tree is not None:
-            return self.element_tree
-        # Extract and parse XML data
-        reader = self.tar.extractfile(self.tar_info)
-        xml_data = reader.read()
-        self.element_tree = ET.fromstring(xml_data)
+        """Return the parsed XML data of the current element.
+        Only the record sections required by the tables accessed so far
+        are parsed, with the element getting parsed anew if more
+        sections are required after it was parsed."""
+        parsed = self.partition_trees[self.member_index]
+        if parsed is not None and parsed[0] >= self.sections:
+            return parsed[1]
+        # Parse XML data
+        sections = frozenset(self.sections)
+        xml_data = self.partition[self.member_index][2]
+        if isinstance(xml_data, archive_index.Member):
+            xml_data = self.index.read(xml_data)
+        xml_data = xml_engine.skip_sections(
+            xml_data, SKIPPABLE_SECTIONS - sections
+        )
+        element_tree = xml_engine.fromstring(xml_data)
 
         # Sanity check
-        orcid_xml = self.element_tree.find(
-            f"{COMMON}orcid-identifier/{COMMON}path"
-        )
+        orcid_xml = element_tree.find(f"{COMMON}orcid-identifier/{COMMON}path")
         if orcid_xml is None:
             # Identify error records
             warn(f"Error parsing {self.orcid}")
-            self.element_tree = ErrorElement()
+            element_tree = ErrorElement()
         else:
             assert self.orcid == orcid_xml.text
 
         perf.log(f"Parse {self.orcid}")
-        return self.element_tree
+        self.partition_trees[self.member_index] = (sections, element_tree)
+        return element_tree
+
+    def get_partition_data(self, partition_id):
+        """Return a tuple with the id and the files of the specified
+        (current) partition, which can be transferred to a worker
+        process.  For indexed tar files the worker reads the files'
+        data from the positions recorded in the index."""
+        return partition_id, self.partition
+
+    def set_partition_data(self, data):
+        """Make the partition described by the specified tuple obtained
+        through get_partition_data the current one."""
+        self.partition_id, self.partition = data
+        self.partition_trees = [None] * len(self.partition)
+        self.select_member(0)
+        self.iterating_partitions = True
 
     def close(self):
         """Close the opened tar file"""
-        self.tar.close()
+        if self.tar:
+            self.tar.close()
+            self.tar = None
 
     def get_container_iterator(self):
-        """Return an iterator over the int identifiers of all data files"""
+        """Return an iterator over the int identifiers of all partitions"""
         return self.tar_generator()
 
+    def get_member_iterator(self):
+        """Return an iterator over the int identifiers of all data files"""
+        return self.member_generator()
+
     def get_container_id(self):
         """Return the file id of the current element."""
         return self.file_id
@@ -743,11 +964,16 @@ class TarFiles:
         """Return the ORCID of the current element."""
         return self.orcid
 
-    def get_container_name(self, file_id):
-        """Return the name of the file corresponding to the specified fid"""
-        if file_id != self.file_id:
-            raise Alexandria3kInternalError(f"Stale container id {file_id}")
-        return f"{self.orcid}.xml"
+    def get_container_name(self, partition_id):
+        """Return the name of the files of the specified partition"""
+        if partition_id != self.partition_id:
+            # The reader of worker tasks has moved to a later partition
+            return f"partition {partition_id}"
+        first = self.partition[0][1]
+        last = self.partition[-1][1]
+        if first == last:
+            return f"{first}.xml"
+        return f"{first}.xml-{last}.xml"
 
 
 class VTSource:
@@ -755,8 +981,13 @@ class VTSource:
     Connection through createmodule in order to instantiate the virtual
     tables."""
 
-    def __init__(self, data_source, sample):
-        self.data_files = TarFiles(data_source, sample)
+    # The tar file is read sequentially, but the XML data of its
+    # partitions can be transferred to worker processes for parsing
+    # and row extraction
+    transferable_containers = True
+
+    def __init__(self, data_source, sample, partition_size):
+        self.data_files = TarFiles(data_source, sample, partition_size)
         self.table_dict = {t.get_name(): t for t in tables}
         self.sample = sample
 
@@ -779,6 +1010,16 @@ class VTSource:
         """Return the name of the file corresponding to the specified fid"""
         return self.data_files.get_container_name(fid)
 
+    def get_container_data(self, fid):
+        """Return the XML data of the specified (current) partition,
+        for transferring them to a worker process"""
+        return self.data_files.get_partition_data(fid)
+
+    def set_container_data(self, data):
+        """Install in a worker process the XML data of a partition
+        obtained through get_container_data"""
+        self.data_files.set_partition_data(data)
+
 
 class Orcid(DataSource):
     """
@@ -787,7 +1028,9 @@ class Orcid(DataSource):
     data.
 
     :param orcid_file: The file path to the compressed tar file containing
-        ORCID data.
+        ORCID data.  If the file has been indexed through
+        `a3k index-archive`, its records are read directly through the
+        index, including by worker processes.
     :type orcid_file: str
 
     :param sample: A callable to control container sampling, defaults
@@ -805,6 +1048,14 @@ class Orcid(DataSource):
         name.
     :type attach_databases: list, optional
 
+    :param partition_size: The number of person records of each
+        partition through which the database is populated or partitioned
+        queries are run, defaults to 100.  Larger partitions amortize
+        the fixed per partition processing costs over more records,
+        but keep more parsed records in memory.
+        The rows' container_id values identify the individual records.
+    :type partition_size: int, optional
+
     """
 
     def __init__(
@@ -812,9 +1063,10 @@ class Orcid(DataSource):
         orcid_file,
         sample=lambda n: True,
         attach_databases=None,
+        partition_size=DEFAULT_PARTITION_SIZE,
     ):
         super().__init__(
-            VTSource(orcid_file, sample),
+            VTSource(orcid_file, sample, partition_size),
             tables,
             attach_databases,
         )
@@ -26,7 +26,9 @@ from alexandria3k.data_source import (
     FilesCursor,
     StreamingCachedContainerTable,
 )
+from alexandria3k.container_catalog import RANGE
 from alexandria3k.db_schema import ColumnMeta, TableMeta
+from alexandria3k.data_sources_lib.container_cache import has_index
 from alexandria3k.data_sources_lib.pubmed_file_cache import get_file_cache
 from alexandria3k.xml import (
     XMLCursor,
@@ -120,7 +122,7 @@ class ArticlesCursor(ArticlesElementsCursor):
     def Next(self):
         """Advance to the next item."""
         self.element_index += 1
-        if self.element_index >= len(self.files_cursor.items):
+        if not has_index(self.files_cursor.items, self.element_index):
             self.element_index = 0
             self.files_cursor.Next()
             self.eof = self.files_cursor.eof
@@ -263,6 +265,9 @@ class VTSource:
     Connection through createmodule in order to instantiate the virtual
     tables."""
 
+    # Containers can be read independently of each other in any order
+    random_access_containers = True
+
     def __init__(self, data_directory, sample):
         self.data_files = DataFiles(
             data_directory, sample, file_name_regex=FILENAME_FORMAT
@@ -291,6 +296,24 @@ class VTSource:
         """Return the name of the file corresponding to the specified fid"""
         return self.data_files.get_container_name(fid)
 
+    def get_catalog(self):
+        """Return the data files' container catalog, if any"""
+        return self.data_files.get_catalog()
+
+    def schedule_containers(self, container_ids):
+        """Set the containers with the specified ids, or None for all,
+        as those accessed individually in this order, for reading them
+        ahead"""
+        get_file_cache().schedule(
+            None
+            if container_ids is None
+            else [self.data_files.get_container_name(i) for i in container_ids]
+        )
+
+    def create_catalog(self, root_name):
+        """Return a writer for the data files' container catalog"""
+        return self.data_files.create_catalog(root_name)
+
 
 # https://www.nlm.nih.gov/bsd/mms/medlineelements.html lists all abbreviations
 tables = [
@@ -365,6 +388,7 @@ tables = [
                 ),
                 description="Journal year",
                 data_type="INTEGER",
+                catalog=RANGE,
             ),
             ColumnMeta(
                 "journal_month",
@@ -19,7 +19,7 @@
 """Research Organization Registry (ROR) data"""
 
 import fnmatch
-import json
+import io
 import zipfile
 
 from alexandria3k.data_source import (
@@ -29,6 +29,7 @@ from alexandria3k.data_source import (
     StreamingTable,
 )
 from alexandria3k import perf
+from alexandria3k.data_sources_lib.json_stream import array_records
 from alexandria3k.db_schema import ColumnMeta, TableMeta
 
 # pylint: disable=R0801
@@ -55,7 +56,9 @@ def external_ids_getter(id_name):
 
 
 class RorCursor:
-    """A virtual table cursor over the read ROR main data."""
+    """A virtual table cursor over the ROR main data.
+    The organizations are decoded incrementally from the data file,
+    which is read anew in each Filter call."""
 
     def __init__(self, table):
         """Not part of the apsw VTCursor interface.
@@ -94,6 +97,7 @@ class RorCursor:
         # print("FILTER", index_number, constraint_args)
         self.eof = False
         self.item_index = -1
+        self.Close()
         self.iterator = iter(self.table.get_data_source())
         self.Next()  # Move to first row
 
@@ -115,6 +119,10 @@ class RorCursor:
 
     def Close(self):
         """Cursor's destructor, used for cleanup"""
+        if self.iterator:
+            # Close the data file
+            self.iterator.close()
+            self.iterator = None
 
 
 class RorDetailsCursor(ElementsCursor):
@@ -280,11 +288,38 @@ tables = [
 ]
 
 
+class RorRecords:
+    """The organization records of the JSON data file residing in
+    the specified zip file.  Each iteration reads the file anew,
+    decoding its records as they are read, so that they are not
+    all kept in memory.  Consequently, each table scan parses the file
+    again.  The unconditional population of all tables traverses
+    the records once, but the conditional population and queries
+    over several tables parse the file once for each table scan."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, zip_path, file_name):
+        self.zip_path = zip_path
+        self.file_name = file_name
+
+    def __iter__(self):
+        with zipfile.ZipFile(self.zip_path, "r") as zip_ref:
+            with zip_ref.open(self.file_name, "r") as ror_file:
+                text_file = io.TextIOWrapper(ror_file, encoding="utf-8")
+                yield from array_records(text_file)
+                perf.log("Parse ROR")
+
+
 class VTSource:
     """Virtual table data source for a single moderately-sized JSON file.
     This gets registered with the apsw Connection through createmodule
     in order to instantiate the virtual table."""
 
+    # All records reside in a single container, so that all tables can
+    # be populated through a single pass over the data file.
+    single_container = True
+
     def __init__(self, data_source, sample):
         with zipfile.ZipFile(data_source, "r") as zip_ref:
             # Select the .json file conforming to the original
@@ -294,9 +329,7 @@ class VTSource:
                 for name in zip_ref.namelist()
                 if fnmatch.fnmatch(name, "*-ror-data.json")
             )
-            with zip_ref.open(self.file_name, "r") as ror_file:
-                self.data_source = json.load(ror_file)
-                perf.log("Parse ROR")
+        self.data_source = RorRecords(data_source, self.file_name)
         self.sample = sample
         self.table_dict = {t.get_name(): t for t in tables}
 
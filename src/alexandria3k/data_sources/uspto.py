@@ -18,6 +18,7 @@
 #
 """Patent grant bibliographic (front page) text data (JAN 1976 - present)"""
 
+import itertools
 import os
 import re
 
@@ -31,7 +32,9 @@ from alexandria3k.data_source import (
     StreamingCachedContainerTable,
 )
 from alexandria3k.db_schema import ColumnMeta, TableMeta
+from alexandria3k.data_sources_lib.container_cache import has_index
 from alexandria3k.data_sources_lib.uspto_file_cache import get_file_cache
+from alexandria3k.data_sources_lib.xml_engine import ElementPath
 from alexandria3k.uspto_zip_cache import get_zip_cache
 from alexandria3k.xml import (
     XMLCursor,
@@ -45,6 +48,10 @@ from alexandria3k.xml import (
 # Patent Grant Bibliographic (Front Page) Text Data (JAN 1976 - PRESENT)
 DEFAULT_SOURCE = None
 
+# Number of patents in each partition of the partitioned data access.
+# Partitions amortize the fixed costs of each partition's population.
+DEFAULT_PARTITION_SIZE = 1000
+
 # Extract the date of the Zip file name.
 # "ipgb" stands for "issued patent grant bibliography"
 # and it is the same for every publication file.
@@ -74,12 +81,25 @@ class ZipFiles:
     dynamically via a generator function. Access individual patent
     XML chunks, embedded inside a single XML file, within the zip
     file. Distinguish patent XML chunks using the XML declaration,
-    managed by uspto_zip_cache. Yield a Zip file path and a container
-    id representing a unique patent until all zip files have been read.
-    Access and parse the patent XML chunk through PatentsFilesCursor.
+    managed by uspto_zip_cache. Yield a partition id representing
+    partition_size consecutive patents of a Zip file, until all zip
+    files have been read.  The container_id = partition id constraint
+    selects the partition's patents, whose container_id values are
+    those of each patent.
+    Access and parse the patent XML chunks through PatentsFilesCursor.
     """
 
-    def __init__(self, directory, sample_container):
+    # While the partitions are iterated, the container_id constraint
+    # selects a partition of patents, rather than rows having the
+    # specified container_id value, so the cursors apply it.
+    partitioned_containers = True
+
+    def __init__(
+        self,
+        directory,
+        sample_container,
+        partition_size=DEFAULT_PARTITION_SIZE,
+    ):
         # Collect the names of all available data files
         self.file_paths = []
         self.unique_patent_xml_files = []
@@ -89,6 +109,13 @@ class ZipFiles:
         self.container_id = -1
         self.zip_path = None
         self.sample = sample_container
+        self.partition_size = partition_size
+        # XML chunks of the current partition's patents and their
+        # parsed trees
+        self.partition = []
+        self.partition_trees = []
+        # True while the partitions are iterated by zip_generator
+        self.iterating_partitions = False
 
         # Read through the directory that contains
         # the weekly patent releases of each year.
@@ -122,20 +149,68 @@ class ZipFiles:
 
     def zip_generator(self):
         """A generator function iterating over the Zip files and the
-        containers inside."""
-        # pylint: disable-next=consider-using-with
-        for path in self.file_paths:
-            # Access contents inside Zip for enumeration, no parsing.
-            self.unique_patent_xml_files = self.get_zip_contents(path)
-            self.filename = self.get_filename(path)
-            self.container_id = -1
-            self.zip_path = path
-            for patent in self.unique_patent_xml_files:
-                if patent is None:
-                    continue
+        partitions of the patents inside."""
+        # Container id constraints select partitions while iterating.
+        self.iterating_partitions = True
+        try:
+            for self.file_id, path in enumerate(self.file_paths):
+                # Access contents inside Zip for enumeration, no parsing.
+                self.unique_patent_xml_files = self.get_zip_contents(path)
+                self.filename = self.get_filename(path)
+                self.container_id = -1
+                self.zip_path = path
+                # Read the Zip's patents sequentially, so that they are
+                # decompressed only once, retaining those of one partition.
+                patents = iter(self.unique_patent_xml_files)
+                while True:
+                    self.partition = list(
+                        itertools.islice(patents, self.partition_size)
+                    )
+                    if not self.partition:
+                        break
+                    self.partition_trees = [None] * len(self.partition)
+                    self.container_id += 1
+                    yield self.container_id
+        finally:
+            self.iterating_partitions = False
+
+    def get_partition_patent(self, container_id):
+        """Return the parsed patent having the specified container id
+        within the current partition, or None if the partition has no
+        such patent.  The patents are parsed once, when first accessed,
+        and retained until the next partition is read."""
+        index = container_id - self.container_id * self.partition_size
+        if index >= len(self.partition):
+            return None
+        if self.partition_trees[index] is None:
+            self.partition_trees[index] = get_file_cache().read(
+                self.partition[index], container_id
+            )
+        return self.partition_trees[index]
+
+    def get_partition_data(self, container_id):
+        """Return a tuple with the state of the specified (current)
+        partition, which can be transferred to a worker process."""
+        return (
+            self.file_id,
+            self.zip_path,
+            self.filename,
+            container_id,
+            self.partition,
+        )
 
-                self.container_id += 1
-                yield self.container_id
+    def set_partition_data(self, data):
+        """Make the partition described by the specified tuple obtained
+        through get_partition_data the current one."""
+        (
+            self.file_id,
+            self.zip_path,
+            self.filename,
+            self.container_id,
+            self.partition,
+        ) = data
+        self.partition_trees = [None] * len(self.partition)
+        self.iterating_partitions = True
 
     def get_current_zip_path_by_id(self, zip_file_id):
         """Return the path of the current Zip file, using id."""
@@ -151,6 +226,11 @@ class ZipFiles:
             return match.group(1)
         return "No filename found."
 
+    def get_current_zip_index(self):
+        """Return the index of the current Zip file, updates from
+        generator."""
+        return self.file_id
+
     def get_current_zip_path(self):
         """Return the path of the current Zip file, updates from generator."""
         return self.zip_path
@@ -176,7 +256,11 @@ class ZipFiles:
 def alternative_path_getter(path1, path2):
     """Return all elements from the specified path. If
     path1 doesn't work, use path2 as an alternative."""
-    return lambda tree: tree.findall(path1) or tree.findall(path2)
+    element_path1 = ElementPath(path1)
+    element_path2 = ElementPath(path2)
+    return lambda tree: element_path1.findall(tree) or element_path2.findall(
+        tree
+    )
 
 
 class VTSource:
@@ -184,8 +268,12 @@ class VTSource:
     Connection through createmodule in order to instantiate the virtual
     tables."""
 
-    def __init__(self, data_directory, sample):
-        self.data_files = ZipFiles(data_directory, sample)
+    # Containers are read sequentially, but their patents can be
+    # transferred to worker processes for parsing and row extraction
+    transferable_containers = True
+
+    def __init__(self, data_directory, sample, partition_size):
+        self.data_files = ZipFiles(data_directory, sample, partition_size)
         self.table_dict = {t.get_name(): t for t in tables}
         self.sample = sample
 
@@ -211,13 +299,23 @@ class VTSource:
         """Return the name of the file corresponding to the specified fid"""
         return self.data_files.get_container_name(fid)
 
+    def get_container_data(self, fid):
+        """Return the patents of the specified (current) partition,
+        for transferring them to a worker process"""
+        return self.data_files.get_partition_data(fid)
+
+    def set_container_data(self, data):
+        """Install in a worker process the patents of a partition
+        obtained through get_container_data"""
+        self.data_files.set_partition_data(data)
+
 
 # pylint: disable=too-many-instance-attributes
 class PatentsFilesCursor(ItemsCursor):
     """ "A cursor over the US patent XML data files inside a Zip file.
     If it is used through data_source partitioned data access within
-    the context of a ZipFiles iterator, it shall return a single container
-    representing a US patents inside the Zip file. Otherwise it shall
+    the context of a ZipFiles iterator, it shall return the containers
+    of a single partition of US patents inside the Zip file. Otherwise it shall
     iterate over all Zip files and the containers inside. Internal use only.
     Not used directly by an SQLite table.
     """
@@ -231,6 +329,7 @@ class PatentsFilesCursor(ItemsCursor):
         self.zip_index = None
         self.current_file_path = None
         self.xml_contents = []
+        self.partitioned = False
 
     def Filter(self, index_number, _index_name, constraint_args):
         """Always called first to initialize an iteration to the first
@@ -244,6 +343,7 @@ class PatentsFilesCursor(ItemsCursor):
             self.zip_index = 0
             self.container_id = -1
             self.single_file = False
+            self.partitioned = False
             # Initialize the Zip file path.
             self.current_file_path = (
                 self.table.data_source.get_current_zip_path_by_id(
@@ -251,10 +351,20 @@ class PatentsFilesCursor(ItemsCursor):
                 )
             )
         elif index_number & CONTAINER_INDEX:
-            # Index; constraint reading through the specified container.
+            # Index; constraint reading through the containers of the
+            # specified partition.
             self.single_file = True
             self.file_read = False
-            self.container_id = constraint_args[0] - 1
+            data_source = self.table.data_source
+            self.partitioned = data_source.iterating_partitions
+            if self.partitioned:
+                self.container_id = (
+                    constraint_args[0] * data_source.partition_size - 1
+                )
+            else:
+                # Outside partitioned access the constraint selects
+                # the specified patent of the current Zip file.
+                self.container_id = constraint_args[0] - 1
             self.current_file_path = (
                 self.table.data_source.get_current_zip_path()
             )
@@ -267,54 +377,75 @@ class PatentsFilesCursor(ItemsCursor):
             return
 
         self.container_id += 1
+        if self.partitioned:
+            # The partition's patents are retained by the data source.
+            self.items = self.table.data_source.get_partition_patent(
+                self.container_id
+            )
+            if self.items is None:
+                self.eof = True
+                return
+        elif not self.read_next_zip_patent():
+            self.eof = True
+            return
+        self.eof = False
+
+        # Update progress by reusing FilesCursor.debug_progress_bar.
+        # The number of patents in a Zip file is only known after
+        # it has been read, so progress is measured in Zip files.
+        zip_index = (
+            self.table.data_source.get_current_zip_index()
+            if self.single_file
+            else self.zip_index
+        )
+        FilesCursor.debug_progress_bar(
+            self,
+            current_progress=zip_index + 1,
+            total_length=self.table.data_source.length_of_zip_files(),
+        )
+
+        # A single patent has been read. Set EOF in next Next call.
+        self.file_read = self.single_file and not self.partitioned
+
+    def read_next_zip_patent(self):
+        """Parse the patent having the current container id, moving
+        to the next Zip file at the end of each one.  Return False
+        when all Zip files have been read."""
         # Zip file read.
         self.xml_contents = get_zip_cache().read(
             self.current_file_path, self.table.data_source.sample
         )
 
-        if self.container_id >= len(self.xml_contents):
+        if not has_index(self.xml_contents, self.container_id):
             # Zip file ended.
             if (
-                self.table.data_source.length_of_zip_files()
-                > self.zip_index + 1
+                self.single_file
+                or self.table.data_source.length_of_zip_files()
+                <= self.zip_index + 1
             ):
-                # Moving to the next available Zip file.
-                # Updating new container id.
-                self.container_id = 0
-                self.zip_index += 1
-                self.current_file_path = (
-                    self.table.data_source.get_current_zip_path_by_id(
-                        self.zip_index
-                    )
-                )
-                self.xml_contents = get_zip_cache().read(
-                    self.current_file_path, self.table.data_source.sample
-                )
-            else:
                 # Returns when all Zip files have been read.
-                self.eof = True
-                return
-
-        # Check for EOF.
-        if len(self.xml_contents) == 0:
-            self.eof = True
-            return
+                return False
+            # Moving to the next available Zip file.
+            # Updating new container id.
+            self.container_id = 0
+            self.zip_index += 1
+            self.current_file_path = (
+                self.table.data_source.get_current_zip_path_by_id(
+                    self.zip_index
+                )
+            )
+            self.xml_contents = get_zip_cache().read(
+                self.current_file_path, self.table.data_source.sample
+            )
+            # Check for EOF.
+            if not has_index(self.xml_contents, self.container_id):
+                return False
 
         # Container parsing.
         self.items = get_file_cache().read(
             self.xml_contents[self.container_id], self.container_id
         )
-        self.eof = False
-
-        # Update progress by reusing FilesCursor.debug_progress_bar
-        FilesCursor.debug_progress_bar(
-            self,
-            current_progress=self.container_id + 1,
-            total_length=len(self.xml_contents),
-        )
-
-        # The single container has been read. Set EOF in next Next call.
-        self.file_read = True
+        return True
 
     def get_container_id(self):
         """Get the container id of the XML chunk."""
@@ -331,7 +462,7 @@ class PatentsCursor(PatentsElementsCursor):
     """A virtual table cursor over patents data.
     If it is used through data_source partitioned data access
     within the context of a ZipFiles iterator,
-    it shall return the single element of the ZipFiles iterator.
+    it shall return the elements of the ZipFiles iterator's partition.
     Otherwise it shall iterate over all elements."""
 
     def __init__(self, table):
@@ -352,8 +483,9 @@ class PatentsCursor(PatentsElementsCursor):
         return self.files_cursor.get_container_id()
 
     def Rowid(self):
-        """Return a unique id of the row along all records"""
-        return self.item_index
+        """Return a unique id of the row along the records of a
+        Zip file"""
+        return self.files_cursor.get_container_id()
 
     # pylint: disable=too-many-return-statements
     def Column(self, col):
@@ -475,11 +607,11 @@ class PatentsCpcCursor(PatentsElementsCursor):
             return self.parent_cursor.get_container_id()
 
         if col == 2:
-            return self.elements[self.record_id()].tag
+            return self.elements[self.element_index].tag
 
         if col >= 3:
             return get_element(
-                self.elements[self.record_id()],
+                self.elements[self.element_index],
                 f"{self.column_contents[col]}",
             )
 
@@ -543,11 +675,11 @@ class PatentsRelatedDocumentsCursor(PatentsElementsCursor):
             return self.parent_cursor.get_container_id()
 
         if col == 2:
-            return self.elements[self.record_id()].tag
+            return self.elements[self.element_index].tag
 
         if col >= 3:
             return get_element(
-                self.elements[self.record_id()],
+                self.elements[self.element_index],
                 f"{self.column_contents[col]}",
             )
 
@@ -614,18 +746,21 @@ class PatentsAssigneesCursor(PatentsElementsCursor):
             return self.parent_cursor.get_container_id()
 
         if col == 2:
-            return self.elements[self.record_id()].tag
+            return self.elements[self.element_index].tag
 
         if col >= 3:
             # Check if an addressbook element exists.
-            if self.elements[self.record_id()].find("addressbook") is not None:
+            if (
+                self.elements[self.element_index].find("addressbook")
+                is not None
+            ):
                 # Append addressbook string to meet XML pattern.
                 pattern = "addressbook/" + f"{self.column_contents[col]}"
 
-                return get_element(self.elements[self.record_id()], pattern)
+                return get_element(self.elements[self.element_index], pattern)
             # If false use the dictionary without addressbook.
             return get_element(
-                self.elements[self.record_id()],
+                self.elements[self.element_index],
                 f"{self.column_contents[col]}",
             )
 
@@ -1515,6 +1650,13 @@ class Uspto(DataSource):
         name.
     :type attach_databases: list, optional
 
+    :param partition_size: The number of patents of each partition
+        through which the database is populated or partitioned queries
+        are run, defaults to 1000.  Larger partitions amortize the
+        fixed per partition processing costs over more patents.
+        The rows' container_id values identify the individual patents.
+    :type partition_size: int, optional
+
     """
 
     def __init__(
@@ -1522,9 +1664,10 @@ class Uspto(DataSource):
         uspto_directory,
         sample=lambda n: True,
         attach_databases=None,
+        partition_size=DEFAULT_PARTITION_SIZE,
     ):
         super().__init__(
-            VTSource(uspto_directory, sample),
+            VTSource(uspto_directory, sample, partition_size),
             tables,
             attach_databases,
         )
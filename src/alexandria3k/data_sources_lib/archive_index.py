@@ -0,0 +1,273 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Random access to the members of gzip-compressed tar archives.
+An index records the offset and size of each regular member together
+with checkpoints of the decompressor's state at regular intervals
+of the decompressed data, as created by the indexed_gzip module
+(following zlib's zran example).  Through the index a member can be read
+by decompressing the data from the nearest preceding checkpoint,
+rather than from the start of the archive."""
+
+from collections import namedtuple
+import importlib
+import os
+import sqlite3
+import tarfile
+
+from alexandria3k.common import Alexandria3kError, warn
+
+INDEX_SUFFIX = ".a3k-index"
+"""str: suffix appended to an archive's path to name its member index."""
+
+CHECKPOINTS_SUFFIX = ".a3k-index.gzidx"
+"""str: suffix appended to an archive's path to name its decompression
+checkpoints."""
+
+INDEX_FORMAT = 1
+"""int: version of the index's schema."""
+
+DEFAULT_SPACING = 32 * 1024 * 1024
+"""int: default number of decompressed bytes between checkpoints.
+Each checkpoint stores 32 kiB of decompressed data."""
+
+SCHEMA = """
+CREATE TABLE index_info(name TEXT PRIMARY KEY, value);
+CREATE TABLE members(
+  member_id INTEGER PRIMARY KEY,
+  name TEXT,
+  offset INTEGER,
+  size INTEGER
+);
+"""
+
+Member = namedtuple("Member", ["name", "offset", "size"])
+"""A regular file member of an archive and the offset and size of its data
+in the decompressed archive"""
+
+
+def load_indexed_gzip():
+    """Return the indexed_gzip module, or None if it is not installed"""
+    try:
+        return importlib.import_module("indexed_gzip")
+    except ImportError:
+        return None
+
+
+indexed_gzip = load_indexed_gzip()
+
+
+def index_path(archive_path):
+    """Return the path of the specified archive's member index"""
+    return archive_path + INDEX_SUFFIX
+
+
+def checkpoints_path(archive_path):
+    """Return the path of the specified archive's decompression
+    checkpoints"""
+    return archive_path + CHECKPOINTS_SUFFIX
+
+
+def create_index(archive_path, spacing=DEFAULT_SPACING):
+    """
+    Create an index of the specified gzip-compressed tar archive, which
+    allows its members to be read directly.  The index is stored in
+    two files next to the archive.  Its creation decompresses the
+    archive once.
+
+    :param archive_path: The path of the archive to index.
+    :type archive_path: str
+
+    :param spacing: The number of decompressed bytes between
+        decompression checkpoints, defaults to 32 MiB.  Closer
+        checkpoints allow faster access to the members, but result
+        in a larger index.
+    :type spacing: int, optional
+
+    :return: The number of indexed members.
+    :rtype: int
+    """
+    if indexed_gzip is None:
+        raise Alexandria3kError(
+            "Indexing archives requires the indexed_gzip Python module"
+        )
+    status = os.stat(archive_path)
+    temporary_index = index_path(archive_path) + ".tmp"
+    temporary_checkpoints = checkpoints_path(archive_path) + ".tmp"
+    if os.path.exists(temporary_index):
+        os.unlink(temporary_index)
+    connection = sqlite3.connect(temporary_index)
+    connection.executescript(SCHEMA)
+    try:
+        with indexed_gzip.IndexedGzipFile(
+            archive_path, spacing=spacing
+        ) as decompressed:
+            # Reading the archive sequentially creates the checkpoints
+            with tarfile.open(fileobj=decompressed, mode="r|") as tar:
+                members = (
+                    (info.name, info.offset_data, info.size)
+                    for info in tar
+                    if info.isreg()
+                )
+                connection.executemany(
+                    "INSERT INTO members(name, offset, size) VALUES (?, ?, ?)",
+                    members,
+                )
+            decompressed.export_index(filename=temporary_checkpoints)
+    except (OSError, EOFError, tarfile.TarError) as exc:
+        connection.close()
+        os.unlink(temporary_index)
+        raise Alexandria3kError(
+            f"Error indexing archive {archive_path}: {exc}"
+        ) from exc
+    (count,) = connection.execute("SELECT Count(*) FROM members").fetchone()
+    connection.executemany(
+        "INSERT INTO index_info VALUES (?, ?)",
+        [
+            ("format", INDEX_FORMAT),
+            ("archive_size", status.st_size),
+            ("archive_mtime_ns", status.st_mtime_ns),
+            ("spacing", spacing),
+            ("member_count", count),
+        ],
+    )
+    connection.commit()
+    connection.close()
+    os.replace(temporary_checkpoints, checkpoints_path(archive_path))
+    os.replace(temporary_index, index_path(archive_path))
+    return count
+
+
+class ArchiveIndex:
+    """
+    The index of a gzip-compressed tar archive, through which its
+    members can be listed and read in any order.
+    The index's database and the decompressed archive are opened
+    anew in forked processes, allowing each worker process to read
+    its own members.
+
+    :param archive_path: The path of the indexed archive.
+    :type archive_path: str
+    """
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        self.connection = None
+        self.connection_pid = None
+        self.reader = None
+        self.reader_pid = None
+
+    def get_connection(self):
+        """Return the connection to the index's database.
+        A new one is opened in forked processes, which must not
+        use their parent's connection."""
+        if self.connection is None or self.connection_pid != os.getpid():
+            # Members are also listed by the thread reading worker tasks
+            self.connection = sqlite3.connect(
+                f"file:{index_path(self.archive_path)}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            self.connection_pid = os.getpid()
+        return self.connection
+
+    def get_reader(self):
+        """Return the reader of the decompressed archive, which is
+        positioned through the decompression checkpoints.
+        A new one is opened in forked processes."""
+        if self.reader is None or self.reader_pid != os.getpid():
+            # pylint: disable-next=consider-using-with
+            self.reader = indexed_gzip.IndexedGzipFile(
+                self.archive_path,
+                index_file=checkpoints_path(self.archive_path),
+            )
+            self.reader_pid = os.getpid()
+        return self.reader
+
+    def info(self):
+        """Return a dictionary with the index's metadata"""
+        return dict(self.get_connection().execute("SELECT * FROM index_info"))
+
+    def members(self):
+        """Iterate over the archive's regular file members in the order
+        they appear in it, yielding a Member for each one."""
+        for row in self.get_connection().execute(
+            "SELECT name, offset, size FROM members ORDER BY member_id"
+        ):
+            yield Member(*row)
+
+    def read(self, member):
+        """Return the data of the specified member.
+        Reading the members in the order they appear in the archive
+        continues the decompression from the previously read member."""
+        reader = self.get_reader()
+        reader.seek(member.offset)
+        return reader.read(member.size)
+
+    def close(self):
+        """Close the index's database and the decompressed archive"""
+        if self.connection and self.connection_pid == os.getpid():
+            self.connection.close()
+        if self.reader and self.reader_pid == os.getpid():
+            self.reader.close()
+        self.connection = None
+        self.reader = None
+
+
+def open_index(archive_path):
+    """
+    Return the index of the specified archive, or None if the archive
+    has not been indexed or its index cannot be used.
+
+    :param archive_path: The path of the archive.
+    :type archive_path: str
+
+    :return: The archive's index or None.
+    :rtype: ArchiveIndex
+    """
+    if not os.path.exists(index_path(archive_path)):
+        return None
+    if indexed_gzip is None:
+        warn(
+            f"Ignoring the index of {archive_path}: "
+            "the indexed_gzip Python module is not installed"
+        )
+        return None
+    index = ArchiveIndex(archive_path)
+    try:
+        info = index.info()
+    except (OSError, sqlite3.DatabaseError) as exc:
+        raise Alexandria3kError(
+            f"Unable to read the index of archive {archive_path}: {exc}"
+        ) from exc
+    status = os.stat(archive_path)
+    if info.get("format") != INDEX_FORMAT:
+        message = "unsupported index format"
+    elif (
+        info.get("archive_size") != status.st_size
+        or info.get("archive_mtime_ns") != status.st_mtime_ns
+    ):
+        message = "the archive has changed since it was indexed"
+    else:
+        return index
+    index.close()
+    warn(
+        f"Ignoring the index of {archive_path}: {message}; "
+        "run a3k index-archive to create it anew."
+    )
+    return None
@@ -0,0 +1,329 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Size-budgeted least recently used cache of decoded containers"""
+
+from collections import OrderedDict, deque
+import os
+import threading
+
+from alexandria3k.data_sources_lib import decoded_cache
+from alexandria3k.data_sources_lib.read_ahead import ReadAhead
+
+# Default maximum uncompressed size of the cached containers (1 GiB)
+DEFAULT_SIZE_LIMIT = 1024 * 1024 * 1024
+
+# Marker of the end of a container's records
+END = object()
+
+
+class ContainerCache:
+    """A least recently used cache of decoded containers.
+    The number of cached containers and their total uncompressed
+    size in bytes are limited through the class's entries and
+    size_limit attributes.  The memory occupied by the decoded
+    containers' objects is typically several times larger than their
+    uncompressed size.  The most recently used container
+    is always retained, so a cache with a single entry behaves as
+    the one-container caches used in the past."""
+
+    entries = 1
+    """int: maximum number of containers kept in each cache"""
+
+    size_limit = DEFAULT_SIZE_LIMIT
+    """int: maximum total uncompressed size in bytes of the containers
+    in each cache"""
+
+    caches = []
+    """list: all caches created, for reporting their statistics"""
+
+    def __init__(self, name):
+        self.name = name
+        # Cached values and their sizes keyed by container
+        self.data = OrderedDict()
+        # Total uncompressed size of the cached containers
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        ContainerCache.caches.append(self)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key, default=None):
+        """Return the value cached under the specified key, or the
+        specified default value if none is cached."""
+        entry = self.data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size):
+        """Cache the specified value of the specified uncompressed size
+        in bytes under the specified key, evicting the least recently used
+        values that exceed the cache's limits."""
+        if key in self.data:
+            self.size -= self.data.pop(key)[1]
+        self.data[key] = (value, size)
+        self.size += size
+        while len(self.data) > 1 and (
+            len(self.data) > ContainerCache.entries
+            or self.size > ContainerCache.size_limit
+        ):
+            _key, (_value, evicted_size) = self.data.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all cached values"""
+        self.data.clear()
+        self.size = 0
+
+    def statistics(self):
+        """Return a string with the cache's usage statistics"""
+        return (
+            f"{self.name}: {self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evictions, {len(self.data)} entries, "
+            f"{self.size} uncompressed bytes"
+        )
+
+
+class StreamedItems:
+    """A sequence over the records of a container, which are decoded
+    as they are accessed.  Only a window of the most recently decoded
+    records is kept in memory; accessing an earlier record decodes
+    the container anew.  The length of the sequence is not known in
+    advance; use has_index() to determine whether a record exists."""
+
+    window = 64
+    """int: number of decoded records kept in memory"""
+
+    def __init__(self, open_records):
+        # Function returning an iterator over the container's records
+        self.open_records = open_records
+        self.records = deque()
+        self.base = 0
+        self.iterator = None
+        self.restart()
+
+    def restart(self):
+        """Start decoding the container's records from the beginning"""
+        self.iterator = self.open_records()
+        self.records.clear()
+        self.base = 0
+
+    def has_index(self, index):
+        """Return True if the container has a record at the specified
+        index, decoding the records up to it"""
+        if index < self.base:
+            self.restart()
+        while index >= self.base + len(self.records):
+            record = next(self.iterator, END)
+            if record is END:
+                return False
+            self.records.append(record)
+            if len(self.records) > StreamedItems.window:
+                self.records.popleft()
+                self.base += 1
+        return True
+
+    def __getitem__(self, index):
+        if index < 0 or not self.has_index(index):
+            raise IndexError("container record index out of range")
+        return self.records[index - self.base]
+
+
+def has_index(items, index):
+    """Return True if the specified container items (a list or
+    StreamedItems) have an element at the specified index"""
+    if isinstance(items, StreamedItems):
+        return items.has_index(index)
+    return index < len(items)
+
+
+class DecodedFileCache:
+    """Cache the reading and decoding of data files through the
+    subclass's static decode method, which must return the decoded
+    data and their size in bytes.  The files following the one
+    being read can be read ahead, and the decoded data can also
+    be stored persistently using the specified serializer module
+    (e.g. marshal or pickle).
+    Subclasses that can also decode their files incrementally provide
+    a stream generator method.  Files larger
+    than the stream_threshold are then accessed as StreamedItems,
+    which keep only a few decoded records in memory."""
+
+    file_reads = 0
+    """int: number of files read, maintained by the subclasses through
+    count_read"""
+
+    reads_lock = threading.Lock()
+
+    stream = None
+    """callable: static method of subclasses that can decode files
+    incrementally, yielding the records of the file at the specified
+    path"""
+
+    stream_threshold = None
+    """int: file size in bytes above which files are decoded
+    incrementally; None decodes all files as a whole"""
+
+    def __init__(self, name, serializer):
+        self.cached_path = None
+        self.cached_data = None
+        self.cache = ContainerCache(name)
+        self.serializer = serializer
+        self.read_ahead = ReadAhead(self.fetch)
+        # Sequence of files to be read individually and their positions
+        self.scheduled = None
+        self.scheduled_index = None
+
+    @classmethod
+    def count_read(cls):
+        """Increment the class's count of files read.  Files are also
+        read by the threads reading ahead."""
+        with DecodedFileCache.reads_lock:
+            cls.file_reads += 1
+
+    @staticmethod
+    def decode(path):
+        """Return the decoded contents of the file at the specified path
+        and their size in bytes"""
+        raise NotImplementedError
+
+    def streamed(self, path):
+        """Return True if the file at the specified path is decoded
+        incrementally"""
+        return (
+            self.stream is not None
+            and DecodedFileCache.stream_threshold is not None
+            and os.path.getsize(path) > DecodedFileCache.stream_threshold
+        )
+
+    def fetch(self, path):
+        """Return the decoded contents of the file at the specified path
+        and their size, through the persistent decoded cache"""
+        return decoded_cache.fetch(
+            self.cache.name, path, self.decode, self.serializer
+        )
+
+    def read(self, path):
+        """Read the file at the specified path and return its decoded
+        contents"""
+
+        if path == self.cached_path:
+            self.cache.hits += 1
+            return self.cached_data
+
+        if self.streamed(path):
+            # Not cached, as its records are decoded again when needed
+            # pylint: disable-next=not-callable
+            data = StreamedItems(lambda: self.stream(path))
+        else:
+            data = self.cache.get(path)
+            if data is None:
+                data, size = self.read_ahead.read(path)
+                self.cache.put(path, data, size)
+        self.cached_data = data
+        self.cached_path = path
+        return self.cached_data
+
+    def schedule(self, paths):
+        """Set the sequence of the paths of the files that will be read
+        individually (e.g. those of the containers not skipped through
+        the container catalog), so that the files read ahead are the
+        ones following the current one in this sequence.
+        Setting it to None reads ahead the files following the current
+        one in the sequence passed to prefetch."""
+        self.scheduled = paths
+        self.scheduled_index = (
+            None
+            if paths is None
+            else {path: i for i, path in enumerate(paths)}
+        )
+
+    def prefetch(self, paths, start):
+        """Start reading ahead the files of the specified paths
+        sequence from the specified index onward, or those that follow
+        the file before the index in the scheduled sequence"""
+        if self.scheduled_index and start > 0:
+            position = self.scheduled_index.get(paths[start - 1])
+            if position is not None:
+                paths = self.scheduled
+                start = position + 1
+        self.read_ahead.prefetch(paths, start, _SkippedFiles(self))
+
+
+class _SkippedFiles:
+    """The files of a DecodedFileCache that need not be read ahead:
+    those that are cached or decoded incrementally"""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, file_cache):
+        self.file_cache = file_cache
+
+    def __contains__(self, path):
+        return path in self.file_cache.cache or self.file_cache.streamed(path)
+
+
+def configure(entries, size_limit=DEFAULT_SIZE_LIMIT):
+    """
+    Configure the caching of decoded containers.
+
+    :param entries: The maximum number of containers kept in each cache.
+    :type entries: int
+
+    :param size_limit: The maximum total uncompressed size in bytes of the
+        containers kept in each cache, defaults to 1 GiB.
+        Their decoded objects typically occupy several times more memory.
+        The most recently used container is always kept.
+    :type size_limit: int, optional
+    """
+    ContainerCache.entries = entries
+    ContainerCache.size_limit = size_limit
+
+
+def configure_streaming(threshold, window=StreamedItems.window):
+    """
+    Configure the incremental decoding of large containers.
+
+    :param threshold: The file size in bytes above which containers are
+        decoded incrementally, keeping only a window of their records in
+        memory, or None to decode all containers as a whole.
+    :type threshold: int
+
+    :param window: The number of decoded records of each incrementally
+        decoded container kept in memory, defaults to 64.
+    :type window: int, optional
+    """
+    DecodedFileCache.stream_threshold = threshold
+    StreamedItems.window = window
+
+
+def statistics():
+    """Return a list with the statistics of the caches that were used"""
+    return [
+        cache.statistics()
+        for cache in ContainerCache.caches
+        if cache.hits or cache.misses
+    ]
@@ -18,31 +18,32 @@
 #
 """Cache of read/uncompressed/processed files"""
 
-import gzip
-import json
+import marshal
 
+from alexandria3k.data_sources_lib import (
+    decompression,
+    json_backend,
+    json_stream,
+)
+from alexandria3k.data_sources_lib.container_cache import DecodedFileCache
 
-class FileCache:
-    """Cache the reading/decompression/parsing of a single compressed
-    JSON file"""
 
-    # pylint: disable=too-few-public-methods
+class FileCache(DecodedFileCache):
+    """Cache the reading/decompression/parsing of compressed
+    JSON files"""
 
     file_reads = 0
 
     def __init__(self):
-        self.cached_path = None
-        self.cached_data = None
+        super().__init__("crossref", marshal)
 
-    def read(self, path):
+    @staticmethod
+    def decode(path):
         """Read the compressed JSON file at the specified path and return
-        its parsed contents"""
-
-        if path == self.cached_path:
-            return self.cached_data
+        its parsed contents and its uncompressed size"""
 
         # print(f"READ FILE {path}")
-        with gzip.open(path, "rb") as uncompressed_file:
+        with decompression.open_gzip(path) as uncompressed_file:
             file_content = uncompressed_file.read()
             if file_content[:2] == b"{\n":
                 # Pre 2025 files contain an object with an items array, e.g.
@@ -52,16 +53,23 @@ class FileCache:
                 #   } , { […]
                 #   } ]
                 # }
-                self.cached_data = json.loads(file_content)["items"]
+                data = json_backend.loads(file_content)["items"]
             else:
                 # From 2025 onward, files contain lines where each
                 # is a JSON object, e.g.
                 # {"DOI": "10.1001/jama.2025.0548", […]}
                 lines = file_content.decode("utf-8").split("\n")[:-1]
-                self.cached_data = [json.loads(line) for line in lines]
-        self.cached_path = path
-        FileCache.file_reads += 1
-        return self.cached_data
+                data = [json_backend.loads(line) for line in lines]
+        FileCache.count_read()
+        return data, len(file_content)
+
+    @staticmethod
+    def stream(path):
+        """Yield the records of the compressed JSON file at the specified
+        path, decoding them as the file is read"""
+        FileCache.count_read()
+        with decompression.open_gzip(path) as uncompressed_file:
+            yield from json_stream.container_records(uncompressed_file)
 
 
 # Default
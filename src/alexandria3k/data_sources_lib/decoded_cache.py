@@ -0,0 +1,220 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Persistent on-disk cache of decoded containers"""
+
+import hashlib
+import os
+import tempfile
+import threading
+
+# Default maximum size of the cache directory (10 GiB)
+DEFAULT_SIZE_LIMIT = 10 * 1024 * 1024 * 1024
+
+# Increment to invalidate entries stored in an incompatible format
+FORMAT_VERSION = 1
+
+# Suffix of the cache's entries
+ENTRY_SUFFIX = ".a3k-decoded"
+
+
+class DecodedCache:
+    """A directory storing decoded containers in a form that is fast
+    to load.  Entries are keyed by the container's path, size, and
+    modification time, so that changed containers are decoded anew.
+    When the directory exceeds its size limit, the least recently used
+    entries are removed."""
+
+    # pylint: disable=too-few-public-methods
+
+    directory = None
+    """str: the cache's directory; None disables the cache"""
+
+    size_limit = DEFAULT_SIZE_LIMIT
+    """int: maximum total size in bytes of the cache's entries"""
+
+    total_size = None
+    """int: running total size in bytes of the cache's entries;
+    None until the directory is first scanned"""
+
+    hits = 0
+    misses = 0
+    evictions = 0
+
+    lock = threading.Lock()
+
+
+def entry_path(namespace, path):
+    """Return the path of the cache entry for the specified container
+    path of the specified namespace (e.g. crossref)"""
+    status = os.stat(path)
+    key = (
+        f"{FORMAT_VERSION}\0{namespace}\0{os.path.abspath(path)}\0"
+        f"{status.st_size}\0{status.st_mtime_ns}"
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(
+        DecodedCache.directory, f"{namespace}-{digest}{ENTRY_SUFFIX}"
+    )
+
+
+def load(namespace, path, serializer):
+    """Return the cached decoded data of the specified container,
+    or None if they are not available."""
+    cache_path = entry_path(namespace, path)
+    try:
+        with open(cache_path, "rb") as cache_file:
+            result = serializer.loads(cache_file.read())
+    except FileNotFoundError:
+        return None
+    # pylint: disable-next=broad-exception-caught
+    except Exception:
+        # Corrupted or incompatible entry; remove it
+        remove(cache_path)
+        return None
+    # Mark the entry as recently used
+    try:
+        os.utime(cache_path)
+    except FileNotFoundError:
+        pass
+    return result
+
+
+def store(namespace, path, serializer, result):
+    """Store the specified decoded data of the specified container"""
+    os.makedirs(DecodedCache.directory, exist_ok=True)
+    cache_path = entry_path(namespace, path)
+    # Write atomically, so that concurrent readers never see partial data
+    handle, temporary_path = tempfile.mkstemp(
+        dir=DecodedCache.directory, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(handle, "wb") as cache_file:
+            cache_file.write(serializer.dumps(result))
+        size = os.path.getsize(temporary_path)
+        with DecodedCache.lock:
+            try:
+                # A concurrently stored entry is replaced
+                size -= os.path.getsize(cache_path)
+            except FileNotFoundError:
+                pass
+            os.replace(temporary_path, cache_path)
+            account(size)
+    except BaseException:
+        remove(temporary_path)
+        raise
+
+
+def account(size):
+    """Add the specified number of bytes to the cache's running total
+    size, and evict entries if this exceeds the cache's size limit.
+    The total is obtained by scanning the directory when it is first
+    needed and when evicting entries, so that entries stored or removed
+    by other processes are only accounted for at those times.
+    Must be called with the cache's lock held."""
+    if DecodedCache.total_size is None:
+        DecodedCache.total_size = sum(size for _, size, _ in entries())
+    else:
+        DecodedCache.total_size += size
+    if DecodedCache.total_size > DecodedCache.size_limit:
+        evict()
+
+
+def remove(path):
+    """Remove the specified file, if it still exists"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def entries():
+    """Return a list of (modification time, size, path) tuples for
+    the cache's entries"""
+    result = []
+    with os.scandir(DecodedCache.directory) as directory:
+        for entry in directory:
+            if not entry.name.endswith(ENTRY_SUFFIX):
+                continue
+            try:
+                status = entry.stat()
+            except FileNotFoundError:
+                continue
+            result.append((status.st_mtime_ns, status.st_size, entry.path))
+    return result
+
+
+def evict():
+    """Remove the least recently used entries that exceed the cache's
+    size limit, and set the cache's total size to that of the remaining
+    entries.  Must be called with the cache's lock held."""
+    cached = sorted(entries())
+    total_size = sum(size for _, size, _ in cached)
+    # Keep at least the most recently used entry
+    for _mtime, size, path in cached[:-1]:
+        if total_size <= DecodedCache.size_limit:
+            break
+        remove(path)
+        total_size -= size
+        DecodedCache.evictions += 1
+    DecodedCache.total_size = total_size
+
+
+def fetch(namespace, path, decode, serializer):
+    """Return the result of decoding the specified container path
+    with the specified decode function, obtaining it from the cache
+    if possible.  The specified serializer (e.g. marshal or pickle)
+    is used for storing the result."""
+    if not DecodedCache.directory:
+        return decode(path)
+    result = load(namespace, path, serializer)
+    if result is not None:
+        DecodedCache.hits += 1
+        return result
+    DecodedCache.misses += 1
+    result = decode(path)
+    store(namespace, path, serializer, result)
+    return result
+
+
+def configure(directory, size_limit=DEFAULT_SIZE_LIMIT):
+    """
+    Configure the persistent cache of decoded containers.
+
+    :param directory: The directory where the decoded containers are
+        stored, or None to disable the cache.
+    :type directory: str
+
+    :param size_limit: The maximum size in bytes of the stored decoded
+        containers, defaults to 10 GiB.
+    :type size_limit: int, optional
+    """
+    DecodedCache.directory = directory
+    DecodedCache.size_limit = size_limit
+    DecodedCache.total_size = None
+
+
+def statistics():
+    """Return a string with the cache's usage statistics, or None
+    if the cache is not used"""
+    if not DecodedCache.directory:
+        return None
+    return (
+        f"decoded cache {DecodedCache.directory}: {DecodedCache.hits} hits, "
+        f"{DecodedCache.misses} misses, {DecodedCache.evictions} evictions"
+    )
@@ -0,0 +1,282 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Decompression of gzip files through the fastest available backend"""
+
+import gzip
+import importlib
+import io
+import shutil
+import subprocess
+import tarfile
+import threading
+import time
+
+from alexandria3k.common import Alexandria3kError
+
+AUTO = "auto"
+"""str: name selecting the fastest available backend"""
+
+BACKENDS = ["isal", "pigz", "gzip", "stdlib"]
+"""list: names of the supported backends: the isal (Intel ISA-L)
+Python module, the pigz and gzip programs running as a separate
+process, and the Python standard library gzip module"""
+
+# Backends tried, in order, when selecting one automatically
+AUTO_BACKENDS = ["isal", "pigz", "stdlib"]
+
+# Size of the buffers used for reading decompressed data (1 MiB)
+BUFFER_SIZE = 1024 * 1024
+
+
+class Decompression:
+    """The decompression backend in use and its statistics"""
+
+    # pylint: disable=too-few-public-methods
+
+    backend = "stdlib"
+    """str: the name of the backend in use"""
+
+    files = 0
+    """int: number of files opened for decompression"""
+
+    bytes = 0
+    """int: number of decompressed bytes read"""
+
+    seconds = 0.0
+    """float: time spent waiting for decompressed data"""
+
+    lock = threading.Lock()
+
+
+def available(name):
+    """Return True if the specified backend can be used"""
+    if name == "isal":
+        try:
+            importlib.import_module("isal.igzip")
+        except ImportError:
+            return False
+        return True
+    if name in ("pigz", "gzip"):
+        return shutil.which(name) is not None
+    return name == "stdlib"
+
+
+def available_backends():
+    """Return a list with the names of the available backends"""
+    return [name for name in BACKENDS if available(name)]
+
+
+class _PipeReader(io.RawIOBase):
+    """The output of an external program decompressing a file"""
+
+    def __init__(self, program, path):
+        super().__init__()
+        self.path = path
+        # pylint: disable-next=consider-using-with
+        self.process = subprocess.Popen(
+            [program, "-dc", path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=BUFFER_SIZE,
+        )
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.process.stdout.readinto(buffer)
+        if not count:
+            self.check_exit()
+        return count
+
+    def check_exit(self):
+        """Raise an error if the program failed"""
+        if self.process.wait() != 0:
+            message = self.process.stderr.read().decode(errors="replace")
+            raise EOFError(
+                f"Error decompressing {self.path}: {message.strip()}"
+            )
+
+    def close(self):
+        if not self.closed and self.process.poll() is None:
+            # Stop a program whose output is no longer needed
+            self.process.kill()
+        self.process.wait()
+        self.process.stdout.close()
+        self.process.stderr.close()
+        super().close()
+
+
+class _MeasuredReader(io.RawIOBase):
+    """A reader over the specified decompressed stream that records
+    the bytes read and the time spent reading them"""
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        start = time.perf_counter()
+        count = self.stream.readinto(buffer)
+        elapsed = time.perf_counter() - start
+        with Decompression.lock:
+            Decompression.bytes += count
+            Decompression.seconds += elapsed
+        self.position += count
+        return count
+
+    def tell(self):
+        return self.position
+
+    def close(self):
+        if not self.closed:
+            self.stream.close()
+        super().close()
+
+
+class _TarStreamReader(_MeasuredReader):
+    """A measured reader that reports truncated data as tarfile does"""
+
+    def readinto(self, buffer):
+        try:
+            return super().readinto(buffer)
+        except EOFError as exc:
+            raise tarfile.ReadError("unexpected end of data") from exc
+
+
+def open_stream(path):
+    """Return a raw stream over the decompressed contents of the
+    specified file, obtained through the configured backend"""
+    if Decompression.backend == "isal":
+        igzip = importlib.import_module("isal.igzip")
+        return igzip.open(path, "rb")
+    if Decompression.backend in ("pigz", "gzip"):
+        return _PipeReader(Decompression.backend, path)
+    return gzip.open(path, "rb")
+
+
+def open_gzip(path):
+    """
+    Open the specified gzip-compressed file for reading its
+    decompressed contents through the configured backend.
+
+    :param path: The path of the file to open.
+    :type path: str
+
+    :return: A buffered binary file object, which can also be used
+        as a context manager.
+    :rtype: io.BufferedReader
+    """
+    return _open_measured(path, _MeasuredReader)
+
+
+def _open_measured(path, reader_class):
+    """Return a buffered reader over the decompressed contents of the
+    specified file, measured through the specified reader class"""
+    with Decompression.lock:
+        Decompression.files += 1
+    return io.BufferedReader(
+        reader_class(open_stream(path)), buffer_size=BUFFER_SIZE
+    )
+
+
+class _DecompressedTarFile(tarfile.TarFile):
+    """A tar file read from a decompressed stream, which is closed
+    together with the tar file"""
+
+    decompressed = None
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self.decompressed:
+                self.decompressed.close()
+
+
+def open_tar(path):
+    """
+    Open the specified gzip-compressed tar file for reading its members
+    sequentially, as tarfile.open(path, "r|gz") does, decompressing it
+    through the configured backend.
+
+    :param path: The path of the file to open.
+    :type path: str
+
+    :return: The opened tar file.
+    :rtype: tarfile.TarFile
+    """
+    decompressed = _open_measured(path, _TarStreamReader)
+    try:
+        # pylint: disable-next=consider-using-with
+        tar = _DecompressedTarFile.open(
+            fileobj=decompressed, mode="r|", bufsize=BUFFER_SIZE
+        )
+    except BaseException:
+        decompressed.close()
+        raise
+    tar.decompressed = decompressed
+    return tar
+
+
+def configure(name=AUTO):
+    """
+    Configure the backend used for decompressing gzip files.
+
+    Until this is called, the standard library gzip module is used.
+
+    :param name: The name of the backend (isal, pigz, gzip, or stdlib),
+        defaults to auto, which selects the fastest available one.
+    :type name: str, optional
+    """
+    if name == AUTO:
+        name = next(n for n in AUTO_BACKENDS if available(n))
+    if name not in BACKENDS:
+        raise Alexandria3kError(
+            f"Unknown decompression backend {name}; "
+            f"use one of {AUTO}, {', '.join(BACKENDS)}"
+        )
+    if not available(name):
+        raise Alexandria3kError(
+            f"The {name} decompression backend is not available"
+        )
+    Decompression.backend = name
+
+
+def get_backend():
+    """Return the name of the backend in use"""
+    return Decompression.backend
+
+
+def statistics():
+    """Return a string with the decompression backend and throughput,
+    or None if no data were decompressed"""
+    if not Decompression.files:
+        return None
+    megabytes = Decompression.bytes / 1024 / 1024
+    rate = megabytes / Decompression.seconds if Decompression.seconds else 0
+    return (
+        f"decompression ({Decompression.backend}): "
+        f"{Decompression.files} files, {megabytes:.1f} MiB "
+        f"in {Decompression.seconds:.2f} s ({rate:.1f} MiB/s)"
+    )
@@ -0,0 +1,215 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Persistent local cache of data fetched from URLs"""
+
+import hashlib
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.request
+
+# Size of the chunks in which fetched data are stored (1 MiB)
+CHUNK_SIZE = 1024 * 1024
+
+# Subdirectory holding the fetched contents, named by their SHA-256 digest
+CONTENTS_DIRECTORY = "contents"
+
+# Subdirectory holding the validators and digest of each URL's contents
+URLS_DIRECTORY = "urls"
+
+
+class DownloadCache:
+    """A content-addressed directory storing the data fetched from URLs.
+    For each URL the cache records the digest of its contents together
+    with the ETag and Last-Modified values returned by its server.
+    Subsequent requests of the URL ask the server to send the contents
+    only if they have changed, and otherwise obtain them from the
+    cache."""
+
+    # pylint: disable=too-few-public-methods
+
+    directory = None
+    """str: the cache's directory; None disables the cache"""
+
+    downloads = 0
+    """int: number of URL contents fetched from their server"""
+
+    validated = 0
+    """int: number of cached URL contents validated as current"""
+
+
+def contents_path(digest):
+    """Return the path of the cached contents with the specified digest"""
+    return os.path.join(DownloadCache.directory, CONTENTS_DIRECTORY, digest)
+
+
+def url_path(url):
+    """Return the path of the file recording the specified URL's cached
+    contents"""
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(
+        DownloadCache.directory, URLS_DIRECTORY, f"{digest}.json"
+    )
+
+
+def write_atomically(path, write):
+    """Create the specified file by calling the specified function with
+    a binary file object, so that concurrent readers never see partial
+    data"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            write(file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_entry(url):
+    """Return a dictionary with the digest and validators of the specified
+    URL's cached contents, or None if these are not available."""
+    try:
+        with open(url_path(url), "rb") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+    digest = entry.get("digest")
+    if not digest or not os.path.isfile(contents_path(digest)):
+        return None
+    return entry
+
+
+def store_contents(response):
+    """Store the contents of the specified response and return their
+    digest"""
+    directory = os.path.join(DownloadCache.directory, CONTENTS_DIRECTORY)
+    os.makedirs(directory, exist_ok=True)
+    # The final name is only known after the contents have been read
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(handle, "wb") as file:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                file.write(chunk)
+        os.replace(temporary_path, contents_path(digest.hexdigest()))
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    return digest.hexdigest()
+
+
+def remove_unreferenced(digest):
+    """Remove the contents with the specified digest, if no cached URL
+    refers to them"""
+    urls_directory = os.path.join(DownloadCache.directory, URLS_DIRECTORY)
+    with os.scandir(urls_directory) as directory:
+        for entry in directory:
+            try:
+                with open(entry.path, "rb") as file:
+                    if json.load(file).get("digest") == digest:
+                        return
+            except (OSError, ValueError):
+                continue
+    try:
+        os.remove(contents_path(digest))
+    except FileNotFoundError:
+        pass
+
+
+def open_url(request):
+    """
+    Return a binary file object with the contents of the specified URL
+    request, obtaining them from the cache if the server reports that
+    they have not changed since they were cached.
+
+    :param request: The request for the URL's contents.
+    :type request: urllib.request.Request
+
+    :return: A binary file object, which can also be used as a context
+        manager.
+    """
+    if not DownloadCache.directory:
+        # pylint: disable-next=consider-using-with
+        return urllib.request.urlopen(request)
+    url = request.full_url
+    entry = load_entry(url)
+    if entry:
+        if entry.get("etag"):
+            request.add_header("If-None-Match", entry["etag"])
+        if entry.get("last_modified"):
+            request.add_header("If-Modified-Since", entry["last_modified"])
+    try:
+        # pylint: disable-next=consider-using-with
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as error:
+        if error.code != 304 or not entry:
+            raise
+        error.close()
+        DownloadCache.validated += 1
+        # pylint: disable-next=consider-using-with
+        return open(contents_path(entry["digest"]), "rb")
+
+    with response:
+        digest = store_contents(response)
+        new_entry = {
+            "url": url,
+            "digest": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    write_atomically(
+        url_path(url),
+        lambda file: file.write(json.dumps(new_entry).encode("utf-8")),
+    )
+    DownloadCache.downloads += 1
+    if entry and entry["digest"] != digest:
+        remove_unreferenced(entry["digest"])
+    # pylint: disable-next=consider-using-with
+    return open(contents_path(digest), "rb")
+
+
+def configure(directory):
+    """
+    Configure the persistent cache of data fetched from URLs.
+
+    :param directory: The directory where the fetched data are stored,
+        or None to disable the cache.
+    :type directory: str
+    """
+    DownloadCache.directory = directory
+
+
+def statistics():
+    """Return a string with the cache's usage statistics, or None
+    if the cache is not used"""
+    if not DownloadCache.directory:
+        return None
+    return (
+        f"download cache {DownloadCache.directory}: "
+        f"{DownloadCache.downloads} downloads, "
+        f"{DownloadCache.validated} validated"
+    )
@@ -0,0 +1,133 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Decoding of JSON data through the fastest available parser"""
+
+import importlib
+import json
+import re
+
+from alexandria3k.common import Alexandria3kError
+
+AUTO = "auto"
+"""str: name selecting the fastest installed backend"""
+
+BACKENDS = ["orjson", "simdjson", "json"]
+"""list: names of the supported backends in order of preference"""
+
+# Numbers that may exceed the 64-bit integers of the accelerated
+# backends, which convert them into floating point values.
+LONG_NUMBER_BYTES = re.compile(rb"\d{20}")
+LONG_NUMBER_STRING = re.compile(r"\d{20}")
+
+
+def json_loads():
+    """Return the loads function of the standard library json module"""
+    return json.loads
+
+
+def orjson_loads():
+    """Return the loads function of the orjson module"""
+    return importlib.import_module("orjson").loads
+
+
+def simdjson_loads():
+    """Return the loads function of the pysimdjson module"""
+    return importlib.import_module("simdjson").loads
+
+
+BACKEND_LOADERS = {
+    "orjson": orjson_loads,
+    "simdjson": simdjson_loads,
+    "json": json_loads,
+}
+
+
+class JsonBackend:
+    """The JSON decoding backend in use"""
+
+    # pylint: disable=too-few-public-methods
+
+    name = "json"
+    """str: the name of the backend in use"""
+
+    decode = staticmethod(json.loads)
+    """callable: the backend's function for decoding JSON text"""
+
+
+def loads(data):
+    """Return the Python value of the specified JSON bytes or string.
+    Data that the accelerated backends reject or decode differently,
+    but the standard library accepts (e.g. NaN values, integers wider
+    than 64 bits, or lone surrogates), are decoded by the standard
+    library, so that all backends return the same values."""
+    if JsonBackend.decode is json.loads:
+        return json.loads(data)
+    long_number = (
+        LONG_NUMBER_BYTES if isinstance(data, bytes) else LONG_NUMBER_STRING
+    )
+    if long_number.search(data):
+        return json.loads(data)
+    try:
+        return JsonBackend.decode(data)
+    except ValueError:
+        return json.loads(data)
+
+
+def available_backends():
+    """Return a list with the names of the installed backends"""
+    result = []
+    for name in BACKENDS:
+        try:
+            BACKEND_LOADERS[name]()
+        except ImportError:
+            continue
+        result.append(name)
+    return result
+
+
+def configure(name=AUTO):
+    """
+    Configure the backend used for decoding JSON data.
+
+    Until this is called, the standard library json module is used.
+
+    :param name: The name of the backend (orjson, simdjson, or json),
+        defaults to auto, which selects the fastest installed one.
+    :type name: str, optional
+    """
+    if name == AUTO:
+        name = available_backends()[0]
+    loader = BACKEND_LOADERS.get(name)
+    if loader is None:
+        raise Alexandria3kError(
+            f"Unknown JSON backend {name}; "
+            f"use one of {AUTO}, {', '.join(BACKENDS)}"
+        )
+    try:
+        JsonBackend.decode = staticmethod(loader())
+    except ImportError as exc:
+        raise Alexandria3kError(
+            f"The {name} JSON backend is not installed"
+        ) from exc
+    JsonBackend.name = name
+
+
+def get_backend():
+    """Return the name of the backend in use"""
+    return JsonBackend.name
@@ -0,0 +1,183 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Incremental decoding of the records of JSON containers"""
+
+import io
+import json
+import re
+
+from alexandria3k.data_sources_lib import json_backend
+
+# Size of the chunks read from the containers (1 MiB)
+CHUNK_SIZE = 1024 * 1024
+
+# Start of a document containing an object with an items array
+ITEMS_START = re.compile(r'\s*\{\s*"items"\s*:\s*\[')
+
+WHITESPACE = re.compile(r"\s*")
+
+# Text examined for identifying the structure of the items document
+HEADER_SIZE = 1024
+
+
+def line_records(binary_file):
+    """Yield the records of the specified binary file containing
+    a JSON object in each newline-terminated line"""
+    for line in binary_file:
+        if not line.endswith(b"\n"):
+            # A record is only complete through its newline
+            break
+        yield json_backend.loads(line[:-1].decode("utf-8"))
+
+
+class TextBuffer:
+    """A window over the text of a file, which is read in chunks as
+    its contents are consumed"""
+
+    def __init__(self, text_file, chunk_size):
+        self.text_file = text_file
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.position = 0
+        self.eof = False
+        self.fill()
+
+    def fill(self):
+        """Read more of the file's text, discarding the consumed part.
+        Chunks grow with the pending text, so that large values are
+        not decoded repeatedly."""
+        chunk = self.text_file.read(
+            max(self.chunk_size, len(self.text) - self.position)
+        )
+        self.eof = not chunk
+        self.text = self.text[self.position :] + chunk
+        self.position = 0
+
+    def skip_whitespace(self):
+        """Advance past whitespace, reading more text as needed"""
+        while True:
+            self.position = WHITESPACE.match(self.text, self.position).end()
+            if self.position < len(self.text) or self.eof:
+                return
+            self.fill()
+
+    def peek(self):
+        """Return the current character, or None at the end of the file"""
+        if self.position < len(self.text):
+            return self.text[self.position]
+        return None
+
+    def decode(self, decoder):
+        """Return the JSON value at the current position, reading
+        more text until the value is complete"""
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.position)
+                # A value is complete if followed by other text
+                if end < len(self.text) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def items_records(text_file, chunk_size=CHUNK_SIZE):
+    """Yield the elements of the items array of the JSON object
+    contained in the specified text file, decoding them as their
+    text becomes available."""
+    buffer = TextBuffer(text_file, chunk_size)
+    while len(buffer.text) < HEADER_SIZE and not buffer.eof:
+        buffer.fill()
+    start = ITEMS_START.match(buffer.text)
+    if not start:
+        # Unexpected structure; decode the document as a whole
+        yield from json_backend.loads(buffer.text + text_file.read())["items"]
+        return
+
+    buffer.position = start.end()
+    yield from array_elements(buffer)
+
+
+def array_records(text_file, chunk_size=CHUNK_SIZE):
+    """Yield the elements of the JSON array contained in the specified
+    text file, decoding them as their text becomes available."""
+    buffer = TextBuffer(text_file, chunk_size)
+    buffer.skip_whitespace()
+    if buffer.peek() != "[":
+        raise json.JSONDecodeError(
+            "Expecting '['", buffer.text, buffer.position
+        )
+    buffer.position += 1
+    yield from array_elements(buffer)
+
+
+def array_elements(buffer):
+    """Yield the decoded elements of the JSON array starting at the
+    specified TextBuffer's position, up to the array's end"""
+    decoder = json.JSONDecoder()
+    first = True
+    while True:
+        buffer.skip_whitespace()
+        if buffer.peek() == "]":
+            return
+        if not first:
+            if buffer.peek() != ",":
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", buffer.text, buffer.position
+                )
+            buffer.position += 1
+            buffer.skip_whitespace()
+        first = False
+        yield buffer.decode(decoder)
+
+
+def container_records(binary_file, chunk_size=CHUNK_SIZE):
+    """Yield the records of the specified binary Crossref container file,
+    which contains either an object with an items array (pre 2025)
+    or a JSON object in each line."""
+    binary_file = io.BufferedReader(binary_file)
+    if binary_file.peek(2)[:2] == b"{\n":
+        text_file = io.TextIOWrapper(binary_file, encoding="utf-8", newline="")
+        yield from items_records(text_file, chunk_size)
+    else:
+        yield from line_records(binary_file)
+
+
+def chunked_lines(binary_file, chunk_size=CHUNK_SIZE):
+    """Return a list with the lines of the specified binary file,
+    split as bytes.splitlines() does, reading the file in chunks
+    rather than as a whole.  This works on files that cannot seek,
+    such as the members of streamed tar files."""
+    lines = []
+    pending = b""
+    while True:
+        chunk = binary_file.read(chunk_size)
+        if not chunk:
+            break
+        pieces = (pending + chunk).splitlines(keepends=True)
+        pending = b""
+        # A carriage return may be followed by a newline in the next chunk
+        if pieces and not pieces[-1].endswith(b"\n"):
+            pending = pieces.pop()
+        lines.extend(piece.splitlines()[0] for piece in pieces)
+    if pending:
+        lines.extend(pending.splitlines())
+    return lines
@@ -18,34 +18,52 @@
 #
 """Cache of read/uncompressed/processed files"""
 
-import gzip
-import xml.etree.ElementTree as ET
+from alexandria3k.data_sources_lib import decompression, xml_engine
+from alexandria3k.data_sources_lib.container_cache import DecodedFileCache
 
 
-class FileCache:
-    """Cache the reading/decompression/parsing of a single compressed
-    XML file"""
-
-    # pylint: disable=too-few-public-methods
+class FileCache(DecodedFileCache):
+    """Cache the reading/decompression/parsing of compressed
+    XML files"""
 
     file_reads = 0
 
     def __init__(self):
-        self.cached_path = None
-        self.cached_data = None
+        super().__init__("pubmed", xml_engine.TreeSerializer)
 
-    def read(self, path):
+    @staticmethod
+    def decode(path):
         """Read the compressed XML file at the specified path and return
-        its parsed contents"""
+        its parsed contents and its uncompressed size"""
 
-        if path == self.cached_path:
-            return self.cached_data
+        with decompression.open_gzip(path) as uncompressed_file:
+            data = xml_engine.parse(uncompressed_file)
+            size = uncompressed_file.tell()
+        FileCache.count_read()
+        return data, size
 
-        with gzip.open(path, "rb") as uncompressed_file:
-            self.cached_data = ET.parse(uncompressed_file).getroot()
-        self.cached_path = path
-        FileCache.file_reads += 1
-        return self.cached_data
+    @staticmethod
+    def stream(path):
+        """Yield the elements (e.g. PubmedArticle) of the compressed XML
+        file at the specified path as each one is parsed.  The yielded
+        elements are detached from the document's root, so that the
+        memory they occupy is released once they are no longer used."""
+        FileCache.count_read()
+        with decompression.open_gzip(path) as uncompressed_file:
+            depth = 0
+            root = None
+            for event, element in xml_engine.iterparse(
+                uncompressed_file, ("start", "end")
+            ):
+                if event == "start":
+                    if root is None:
+                        root = element
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 1:
+                    root.remove(element)
+                    yield element
 
 
 # Default
@@ -0,0 +1,137 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Background reading and decoding of the containers to be accessed next"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Default maximum memory of containers read ahead (1 GiB)
+DEFAULT_MEMORY_LIMIT = 1024 * 1024 * 1024
+
+
+class ReadAhead:
+    """Read and decode in background threads the containers that
+    follow the one being processed, so that their I/O, decompression,
+    and parsing overlap with the processing of the current one.
+    The decode function passed to the constructor must return a tuple
+    with the decoded data and their (uncompressed) size in bytes."""
+
+    depth = 0
+    """int: number of containers to read ahead; 0 disables read-ahead"""
+
+    memory_limit = DEFAULT_MEMORY_LIMIT
+    """int: maximum size in bytes of the containers read ahead"""
+
+    def __init__(self, decode):
+        self.decode = decode
+        # Futures of the containers being read ahead, keyed by path
+        self.pending = {}
+        self.executor = None
+        self.executor_pid = None
+        self.executor_depth = None
+        # Observed ratio between the decoded and the file size
+        self.expansion = 1
+
+    def get_executor(self):
+        """Return the thread pool used for reading ahead.
+        A new one is created in forked processes, which do not
+        inherit the parent's threads, and when the configured depth
+        changes."""
+        if self.executor_pid != os.getpid():
+            self.executor = None
+            self.pending = {}
+        elif self.executor and self.executor_depth != ReadAhead.depth:
+            for future in self.pending.values():
+                future.cancel()
+            self.pending = {}
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=ReadAhead.depth,
+                thread_name_prefix="read-ahead",
+            )
+            self.executor_pid = os.getpid()
+            self.executor_depth = ReadAhead.depth
+        return self.executor
+
+    def estimated_size(self, path):
+        """Return the estimated decoded size of the specified container"""
+        future = self.pending.get(path)
+        if future and future.done() and not future.exception():
+            _data, size = future.result()
+            return size
+        return int(os.path.getsize(path) * self.expansion)
+
+    def prefetch(self, paths, start, skip=()):
+        """Start reading ahead the containers of the specified paths
+        sequence that follow the specified start index, within the
+        configured depth and memory limit.  Containers outside this
+        window that are still pending are discarded, while those
+        contained in skip (e.g. cached ones) are not read."""
+        if not ReadAhead.depth:
+            return
+        executor = self.get_executor()
+        window = paths[start : start + ReadAhead.depth]
+
+        for path in list(self.pending):
+            if path not in window:
+                self.pending.pop(path).cancel()
+
+        pending_size = sum(self.estimated_size(path) for path in self.pending)
+        for path in window:
+            if path in self.pending or path in skip:
+                continue
+            size = self.estimated_size(path)
+            if self.pending and pending_size + size > ReadAhead.memory_limit:
+                break
+            self.pending[path] = executor.submit(self.decode, path)
+            pending_size += size
+
+    def read(self, path):
+        """Return the decoded data of the container at the specified path
+        and their size, waiting for them if they are being read ahead."""
+        future = None
+        if self.executor_pid == os.getpid():
+            future = self.pending.pop(path, None)
+        if future:
+            data, size = future.result()
+        else:
+            data, size = self.decode(path)
+        file_size = os.path.getsize(path)
+        if file_size:
+            self.expansion = size / file_size
+        return data, size
+
+
+def configure(depth, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    Configure the reading ahead of containers.
+
+    :param depth: The number of containers to read ahead.  Setting
+        it to 0 disables reading ahead.
+    :type depth: int
+
+    :param memory_limit: The maximum size in bytes of the decoded
+        containers that can be read ahead, defaults to 1 GiB.
+        At least one container is always read ahead.
+    :type memory_limit: int, optional
+    """
+    ReadAhead.depth = depth
+    ReadAhead.memory_limit = memory_limit
@@ -18,18 +18,21 @@
 #
 """Cache of read and parsed XML files"""
 
-import xml.etree.ElementTree as ET
+from alexandria3k.data_sources_lib import xml_engine
+from alexandria3k.data_sources_lib.container_cache import ContainerCache
 
 
 class FileCache:
-    """Cache the reading of a single concatenated XML file"""
+    """Cache the parsing of concatenated XML files"""
 
     # pylint: disable=too-few-public-methods
     parse_counter = 0
 
     def __init__(self):
         self.cached_patent_xml_id = None
+        self.cached_chunk = None
         self.cached_data = None
+        self.cache = ContainerCache("uspto-patents")
 
     def read(self, xml_chunk, container_id):
         """
@@ -44,13 +47,23 @@ class FileCache:
 
         """
 
-        if container_id == self.cached_patent_xml_id:
+        # Container ids are only unique within a Zip file, so also
+        # verify that the cached element was parsed from the same chunk.
+        if container_id == self.cached_patent_xml_id and (
+            xml_chunk is self.cached_chunk or xml_chunk == self.cached_chunk
+        ):
+            self.cache.hits += 1
             return self.cached_data
 
-        self.cached_data = ET.fromstring(xml_chunk)
-        self.cached_patent_xml_id = container_id
+        cached_chunk, data = self.cache.get(container_id, (None, None))
+        if cached_chunk is not xml_chunk and cached_chunk != xml_chunk:
+            data = xml_engine.fromstring(xml_chunk)
+            self.cache.put(container_id, (xml_chunk, data), len(xml_chunk))
+            FileCache.parse_counter += 1
 
-        FileCache.parse_counter += 1
+        self.cached_data = data
+        self.cached_chunk = xml_chunk
+        self.cached_patent_xml_id = container_id
         return self.cached_data
 
 
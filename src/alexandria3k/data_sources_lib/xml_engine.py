@@ -0,0 +1,332 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Parsing of XML data and evaluation of element paths through
+lxml, when it is installed and configured, or the standard library
+ElementTree"""
+
+import copyreg
+import importlib
+import io
+import pickle
+import re
+import weakref
+import xml.etree.ElementTree as ET
+
+from alexandria3k.common import Alexandria3kError
+
+AUTO = "auto"
+"""str: name selecting the fastest installed engine"""
+
+ENGINES = ["lxml", "elementtree"]
+"""list: names of the supported engines in order of preference"""
+
+
+def load_lxml():
+    """Return the lxml.etree module, or None if it is not installed"""
+    try:
+        return importlib.import_module("lxml.etree")
+    except ImportError:
+        return None
+
+
+lxml_etree = load_lxml()
+
+
+def element_tree_copy(element):
+    """Return an ElementTree copy of the specified lxml element.
+    Not part of the public API."""
+    result = ET.Element(element.tag, dict(element.attrib))
+    result.text = element.text
+    result.tail = element.tail
+    previous = None
+    for child in element:
+        if isinstance(child.tag, str):
+            previous = element_tree_copy(child)
+            result.append(previous)
+        elif child.tail:
+            # Skip unresolved entity references, keeping the text after them
+            if previous is None:
+                result.text = (result.text or "") + child.tail
+            else:
+                previous.tail = (previous.tail or "") + child.tail
+    return result
+
+
+def loaded_element(element):
+    """Return the specified unpickled element.
+    Not part of the public API."""
+    return element
+
+
+def reduce_lxml_element(element):
+    """Return the arguments for pickling the specified lxml element,
+    which lxml does not support, as an equivalent ElementTree one.
+    Not part of the public API."""
+    return loaded_element, (element_tree_copy(element),)
+
+
+def lxml_parser():
+    """Return a parser that builds trees equivalent to those of
+    ElementTree: without comments and processing instructions and
+    without resolving external entities.  Not part of the public API."""
+    return lxml_etree.XMLParser(
+        remove_comments=True,
+        remove_pis=True,
+        resolve_entities=False,
+        huge_tree=True,
+    )
+
+
+dispatch_table = copyreg.dispatch_table.copy()
+"""dict: pickling reducers, including one for lxml elements"""
+
+if lxml_etree is not None:
+    # pylint: disable-next=protected-access
+    dispatch_table[lxml_etree._Element] = reduce_lxml_element
+
+
+class TreeSerializer:
+    """A serializer of parsed XML data, with the interface of the pickle
+    module, for storing them in the decoded cache.  Elements parsed by
+    lxml are stored as equivalent ElementTree ones, so that they are
+    loaded without parsing XML.  The element paths accept both."""
+
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def dumps(data):
+        """Return the pickled representation of the specified data"""
+        output = io.BytesIO()
+        pickler = pickle.Pickler(output, pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = dispatch_table
+        pickler.dump(data)
+        return output.getvalue()
+
+    loads = staticmethod(pickle.loads)
+
+
+class XmlEngine:
+    """The XML engine in use"""
+
+    # pylint: disable=too-few-public-methods
+
+    name = "elementtree"
+    """str: the name of the engine in use"""
+
+
+class ElementPath:
+    """An ElementTree element path (e.g. "Article/AuthorList/Author")
+    compiled once into an XPath expression when the lxml engine is in
+    use.  The find and findall methods return the first and all
+    elements matching the path, as the corresponding ElementTree
+    methods do.  Trees parsed by ElementTree are also accepted."""
+
+    instances = weakref.WeakSet()
+    """WeakSet: the created paths, for rebinding them to a new engine"""
+
+    def __init__(self, path):
+        self.path = path
+        self.xpath = None
+        self.find = None
+        self.findall = None
+        self.bind()
+        ElementPath.instances.add(self)
+
+    def compile(self):
+        """Return the path compiled into an lxml XPath object, or None
+        if the path cannot be expressed in XPath"""
+        # A trailing slash selects all children in ElementTree
+        path = self.path + "*" if self.path.endswith("/") else self.path
+        try:
+            return lxml_etree.ETXPath(path)
+        except lxml_etree.XPathSyntaxError:
+            return None
+
+    def bind(self):
+        """Set the find and findall methods for the engine in use"""
+        if XmlEngine.name == "lxml" and self.xpath is None:
+            self.xpath = self.compile()
+        if XmlEngine.name != "lxml" or self.xpath is None:
+            self.find = self.tree_find
+            self.findall = self.tree_findall
+            return
+
+        xpath = self.xpath
+        path = self.path
+
+        def find(tree):
+            try:
+                elements = xpath(tree)
+            except TypeError:
+                # Not an lxml tree
+                return tree.find(path)
+            return elements[0] if elements else None
+
+        def findall(tree):
+            try:
+                return xpath(tree)
+            except TypeError:
+                return tree.findall(path)
+
+        self.find = find
+        self.findall = findall
+
+    def tree_find(self, tree):
+        """Return the first element matching the path through the
+        tree's find method"""
+        return tree.find(self.path)
+
+    def tree_findall(self, tree):
+        """Return all elements matching the path through the tree's
+        findall method"""
+        return tree.findall(self.path)
+
+
+def fromstring(text):
+    """Return the root element of the specified XML string or bytes"""
+    if XmlEngine.name == "lxml":
+        return lxml_etree.fromstring(text, lxml_parser())
+    return ET.fromstring(text)
+
+
+def parse(source):
+    """Return the root element of the specified XML file or path"""
+    if XmlEngine.name == "lxml":
+        return lxml_etree.parse(source, lxml_parser()).getroot()
+    return ET.parse(source).getroot()
+
+
+def iterparse(source, events):
+    """Return an iterator over (event, element) pairs of the specified
+    XML file or path, as ElementTree.iterparse does"""
+    if XmlEngine.name == "lxml":
+        return lxml_etree.iterparse(
+            source,
+            events=events,
+            remove_comments=True,
+            remove_pis=True,
+            resolve_entities=False,
+            huge_tree=True,
+        )
+    return ET.iterparse(source, events=events)
+
+
+# An element's start tag
+RE_START_TAG = re.compile(rb"<[^?!][^>]*>")
+
+# A namespace declaration
+RE_NAMESPACE = re.compile(rb'xmlns:([-.\w]+)="([^"]*)"')
+
+
+def element_range(xml_data, name, position):
+    """Return a tuple with the start and end offsets in the specified
+    XML data of the first element with the specified (prefixed) name
+    after the specified position, or None if no such element exists."""
+    start = xml_data.find(b"<" + name, position)
+    # Skip elements whose name merely starts with the specified one
+    while start != -1 and xml_data[start + len(name) + 1] not in (
+        b" \t\r\n/>"
+    ):
+        start = xml_data.find(b"<" + name, start + 1)
+    if start == -1:
+        return None
+    tag_end = xml_data.find(b">", start)
+    if xml_data[tag_end - 1] == ord("/"):
+        return start, tag_end + 1
+    end_tag = b"</" + name + b">"
+    end = xml_data.find(end_tag, tag_end)
+    if end == -1:
+        return None
+    return start, end + len(end_tag)
+
+
+def skip_sections(xml_data, sections):
+    """Return the specified XML data without the elements of the
+    specified sections, which are given in Clark notation.
+    The elements are located in the XML data through their prefixed
+    names, as declared in the root element, so that their contents are
+    skipped without being parsed.  Each section must appear at most once
+    in the data, and its name must not appear in its contents."""
+    root = RE_START_TAG.search(xml_data) if sections else None
+    if root is None:
+        return xml_data
+    prefixes = {
+        uri.decode(): prefix
+        for prefix, uri in RE_NAMESPACE.findall(root.group(0))
+    }
+
+    ranges = []
+    for section in sections:
+        uri, local_name = section[1:].split("}")
+        prefix = prefixes.get(uri)
+        if prefix is None:
+            continue
+        element = element_range(
+            xml_data, prefix + b":" + local_name.encode(), root.end()
+        )
+        if element:
+            ranges.append(element)
+
+    if not ranges:
+        return xml_data
+    ranges.sort()
+    parts = []
+    position = 0
+    for start, end in ranges:
+        parts.append(xml_data[position:start])
+        position = end
+    parts.append(xml_data[position:])
+    return b"".join(parts)
+
+
+def available_engines():
+    """Return a list with the names of the installed engines"""
+    return [
+        name for name in ENGINES if name != "lxml" or lxml_etree is not None
+    ]
+
+
+def configure(name=AUTO):
+    """
+    Configure the engine used for parsing XML data and evaluating
+    element paths.
+
+    Until this is called, the standard library ElementTree is used.
+
+    :param name: The name of the engine (lxml or elementtree), defaults to
+        auto, which selects lxml when it is installed.
+    :type name: str, optional
+    """
+    if name == AUTO:
+        name = available_engines()[0]
+    if name not in ENGINES:
+        raise Alexandria3kError(
+            f"Unknown XML engine {name}; "
+            f"use one of {AUTO}, {', '.join(ENGINES)}"
+        )
+    if name not in available_engines():
+        raise Alexandria3kError(f"The {name} XML engine is not installed")
+    XmlEngine.name = name
+    for path in list(ElementPath.instances):
+        path.bind()
+
+
+def get_engine():
+    """Return the name of the engine in use"""
+    return XmlEngine.name
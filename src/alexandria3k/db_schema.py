@@ -120,11 +120,16 @@ class TableMeta:
         """Return defined value extraction function for column name"""
         return self.columns_by_name[name].get_value_extractor()
 
+    def get_column_by_name(self, name):
+        """Return the column with the specified name or None"""
+        return self.columns_by_name.get(name)
+
     def get_column_definition_by_name(self, name):
         """Return defined column definition DDL for column name"""
         return self.columns_by_name[name].get_definition()
 
 
+# pylint: disable-next=too-many-instance-attributes
 class ColumnMeta:
     """A container for column meta-data"""
 
@@ -135,6 +140,15 @@ class ColumnMeta:
         self.rowid = kwargs.get("rowid")
         self.data_type = kwargs.get("data_type")
 
+        # Kinds of per-container statistics kept in the container catalog
+        catalog = kwargs.get("catalog") or ()
+        self.catalog = (catalog,) if isinstance(catalog, str) else catalog
+        # Function normalizing the values of catalogued keys
+        self.key_normalizer = kwargs.get("key_normalizer")
+        # Whether the table's cursor can skip rows through constraints
+        # on the column's values
+        self.filterable = kwargs.get("filterable", False)
+
     def get_name(self):
         """Return column's name"""
         return self.name
@@ -152,6 +166,27 @@ class ColumnMeta:
         """Return column's description, if any"""
         return self.description
 
+    def get_data_type(self):
+        """Return column's declared data type, if any"""
+        return self.data_type
+
+    def get_catalog(self):
+        """Return a tuple with the kinds of the column's statistics kept
+        in the container catalog (e.g. "range")"""
+        return self.catalog
+
+    def is_filterable(self):
+        """Return True if constraints on the column's values can be
+        evaluated by the table's cursor"""
+        return self.filterable
+
+    def normalized_key(self, value):
+        """Return the specified value as stored in the container catalog
+        for a key column"""
+        if self.key_normalizer and isinstance(value, str):
+            return self.key_normalizer(value)
+        return value
+
     def get_value_extractor(self):
         """Return the column's value defined extraction function"""
         return self.value_extractor
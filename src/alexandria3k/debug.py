@@ -70,7 +70,8 @@ def set_flags(flags):
 
     * apsw-logging: Enable logging in the APSW library;
     * exception: Raise an exception when an error occurs;
-    * files-read: Counts of Crossref data files read;
+    * files-read: Counts of Crossref data files read and container cache
+      statistics;
     * link: Record linking operations;
     * sql: Executed SQL statements;
     * perf: Performance timings;
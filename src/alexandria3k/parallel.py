@@ -0,0 +1,105 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Processing of data containers through a pool of worker processes."""
+
+import multiprocessing
+import threading
+
+from alexandria3k.common import Alexandria3kError
+
+worker_state = {}
+"""dict: state of a worker process, set up by the pool's initializer."""
+
+# Seconds to wait before checking whether the task feeding must stop
+POLL_INTERVAL = 0.1
+
+
+def process_pool(workers, initializer, initargs):
+    """
+    Return a pool of the specified number of worker processes.
+    The processes are forked, so that the initializer's arguments
+    (e.g. data sources containing sampling lambda functions)
+    are inherited rather than pickled.
+
+    :param workers: The number of worker processes.
+    :type workers: int
+
+    :param initializer: A function called by each worker process
+        when it starts.
+    :type initializer: callable
+
+    :param initargs: The arguments passed to the initializer.
+    :type initargs: tuple
+    """
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError as exc:
+        raise Alexandria3kError(
+            "Processing with multiple workers is not supported on this platform."
+        ) from exc
+    return context.Pool(workers, initializer, initargs)
+
+
+def bounded_imap(pool, function, tasks, max_pending, ordered=True):
+    """
+    Apply the specified function to each task through the specified pool,
+    yielding the results as they become available.
+    At most max_pending tasks can be in flight or waiting to be consumed,
+    which bounds the memory used when the tasks are produced (e.g. read
+    from disk) or their results are consumed (e.g. written to a database)
+    at a different speed from the one they are processed.
+
+    :param pool: The process pool to use.
+    :type pool: multiprocessing.pool.Pool
+
+    :param function: The function to apply to each task.
+    :type function: callable
+
+    :param tasks: The tasks to process.  These are obtained from a thread
+        of the pool, so they can be read concurrently with the processing
+        of the results.
+    :type tasks: iterable
+
+    :param max_pending: The maximum number of tasks that can be pending.
+    :type max_pending: int
+
+    :param ordered: When true, defaults to `True`, the results are
+        returned in the order of the tasks; otherwise they are returned
+        in the order they finish.
+    :type ordered: bool, optional
+    """
+    semaphore = threading.Semaphore(max_pending)
+    stop = threading.Event()
+
+    def throttled_tasks():
+        """Yield the tasks once the number of pending ones allows it."""
+        for task in tasks:
+            # pylint: disable-next=consider-using-with
+            while not semaphore.acquire(timeout=POLL_INTERVAL):
+                if stop.is_set():
+                    return
+            yield task
+
+    mapper = pool.imap if ordered else pool.imap_unordered
+    try:
+        for result in mapper(function, throttled_tasks()):
+            semaphore.release()
+            yield result
+    finally:
+        stop.set()
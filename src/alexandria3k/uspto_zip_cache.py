@@ -20,61 +20,106 @@
 
 import zipfile
 
+from alexandria3k.data_sources_lib.container_cache import StreamedItems
+
 # Delimiter for extracting concatenated XML files.
 XML_DELIMITER = '<?xml version="1.0" encoding="UTF-8"?>'
 
+# Size of the blocks read from the Zip file (1 MiB)
+BLOCK_SIZE = 1024 * 1024
+
+
+def split_chunks(binary_file, delimiter, block_size=BLOCK_SIZE):
+    """Yield the byte chunks of the specified binary file that follow
+    each occurrence of the specified delimiter, as
+    data.split(delimiter)[1:] would.  The file is read in blocks,
+    so that only the chunk being split is kept in memory."""
+    buffer = bytearray()
+    # Position from which the buffer may contain a new delimiter
+    search_start = 0
+    started = False
+    while True:
+        block = binary_file.read(block_size)
+        if not block:
+            break
+        buffer += block
+        while True:
+            position = buffer.find(delimiter, search_start)
+            if position < 0:
+                search_start = max(0, len(buffer) - len(delimiter) + 1)
+                break
+            if started:
+                yield bytes(buffer[:position])
+            started = True
+            del buffer[: position + len(delimiter)]
+            search_start = 0
+    if started:
+        yield bytes(buffer)
+
 
 class UsptoZipCache:
-    """Cache the reading/decompression/extraction of Zip file"""
+    """Provide streamed access to the patents of Zip files"""
 
     # pylint: disable=too-few-public-methods
     file_reads = 0
 
     def __init__(self):
         self.cached_path = None
+        self.cached_sampling = None
         self.cached_data = []
         self.file_name = None
 
     def read(self, zip_path, sampling=lambda n: True):
-        """Return a list of XML containers in the specified zip file.
+        """Return a sequence of the XML containers in the specified
+        zip file.  The containers are the bytes of each patent's XML
+        document, which are read from the file as they are accessed,
+        keeping only a few of them in memory (see StreamedItems).
 
         :param zip_path: Path to the Zip file.
 
         :param sampling: callable
         """
 
-        # Compare Zip path for caching.
-        if zip_path == self.cached_path:
+        # Compare Zip path for caching.  The containers also depend on
+        # the sampling function, which differs among data sources.
+        if zip_path == self.cached_path and sampling is self.cached_sampling:
             return self.cached_data
 
-        self.cached_data = []
+        self.cached_data = StreamedItems(
+            lambda: self.stream(zip_path, sampling)
+        )
+        self.cached_path = zip_path
+        self.cached_sampling = sampling
+        return self.cached_data
+
+    def stream(self, zip_path, sampling):
+        """Return an iterator over the sampled XML containers of the
+        specified zip file"""
+        UsptoZipCache.file_reads += 1
+        return self.patents(zip_path, sampling)
+
+    def patents(self, zip_path, sampling):
+        """Yield the sampled XML containers of the specified zip file"""
         with zipfile.ZipFile(zip_path, "r") as zip_ref:
             # There is only one XML file inside the Zip file.
             xml_file = [
                 file for file in zip_ref.namelist() if file.endswith(".xml")
             ]
-
-            # Extract filename and decoding the XML
             (self.file_name,) = xml_file
-            xml_content = zip_ref.read(self.file_name).decode("utf-8")
-
-            # The first item of the list is None.
-            patent_xml_files_list = xml_content.split(XML_DELIMITER)[1:]
-
-            # When sampling returns False it will skip the container.
-            # Sample the patents inside the Zip file by passing to the sampling
-            # function a tuple with the designator string being "container"
-            # and the second value being a string that contains all the
-            # contents of a unique US patent.
-            # (e.g. random.random() < 0.1 if data[0] == ""container"" else True)
-            self.cached_data = [
-                patent_xml
-                for patent_xml in patent_xml_files_list
-                if sampling(("container", patent_xml))
-            ]
-            self.cached_path = zip_path
-            UsptoZipCache.file_reads += 1
-        return self.cached_data
+            with zip_ref.open(self.file_name) as xml_content:
+                for patent_xml in split_chunks(
+                    xml_content, XML_DELIMITER.encode("utf-8")
+                ):
+                    # When sampling returns False it will skip the
+                    # container.  Sample the patents inside the Zip file
+                    # by passing to the sampling function a tuple with
+                    # the designator string being "container" and the
+                    # second value being a string that contains all the
+                    # contents of a unique US patent.
+                    # (e.g. random.random() < 0.1 if data[0] == "container"
+                    # else True)
+                    if sampling(("container", patent_xml.decode("utf-8"))):
+                        yield patent_xml
 
 
 # Default
@@ -22,7 +22,9 @@
 # module xml.etree.ElementTree used for parsing and
 # creating XML data. For more information check:
 # https://docs.python.org/3/library/xml.etree.elementtree.html
+# or, when the lxml XML engine is used, an equivalent lxml.etree object.
 from alexandria3k.data_source import ElementsCursor
+from alexandria3k.data_sources_lib.xml_engine import ElementPath
 
 
 def get_element(tree, path):
@@ -47,27 +49,50 @@ def get_attribute(tree, attr, path=None):
 
 def getter(path):
     """Return a function to return an element with the specified
-    path from a given tree."""
-    return lambda tree: get_element(tree, path)
+    path from a given tree.  The path is compiled once, here."""
+    element_path = ElementPath(path)
+
+    def fgetter(tree):
+        element = element_path.find(tree)
+        if element is None:
+            return None
+        return element.text
+
+    return fgetter
 
 
 def agetter(attr_name, path=None):
     """Return a function to return an attribute with the specified
     name."""
-    return lambda tree: get_attribute(tree, attr_name, path)
+    if not path:
+        return lambda tree: tree.get(attr_name)
+    element_path = ElementPath(path)
+
+    def fgetter(tree):
+        element = element_path.find(tree)
+        return element.get(attr_name) if element is not None else None
+
+    return fgetter
 
 
 def all_getter(path):
     """Return all elements from the specified path"""
-    return lambda tree: tree.findall(path)
+    element_path = ElementPath(path)
+
+    def fgetter(tree):
+        # Looked up on each call, as the engine may be reconfigured
+        return element_path.findall(tree)
+
+    return fgetter
 
 
 def getter_by_attribute(attr_name, value, path=None):
     """Return the text of the first element where the specified attribute equals the specified value
     will return None if no element is found."""
+    element_path = ElementPath(path) if path else None
 
     def fgetter(tree):
-        elements = tree.findall(path) if path else [tree]
+        elements = element_path.findall(tree) if path else [tree]
         for element in elements:
             if element.get(attr_name) == value:
                 return element.text
@@ -0,0 +1,130 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Benchmark of the XML engines over the test data.
+Run from the repository's root as: python -m tests.benchmark_xml_engine
+For each engine it reports the time for parsing the rows of the
+pubmed_articles, us_patents, and ORCID persons tables, and for
+extracting the values of all their columns."""
+
+import gzip
+import os
+import tarfile
+import timeit
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.data_sources import orcid, pubmed, uspto
+from alexandria3k.data_sources_lib import xml_engine
+from alexandria3k.uspto_zip_cache import UsptoZipCache
+
+REPEAT = 5
+
+
+def pubmed_documents():
+    """Return the XML documents of the PubMed test data"""
+    directory = td("data/pubmed-sample")
+    result = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), "rb") as file:
+            result.append(file.read())
+    return result
+
+
+def uspto_documents():
+    """Return the XML documents of the USPTO test data"""
+    directory = td("data/uspto-2023-04")
+    result = []
+    for year in sorted(os.listdir(directory)):
+        for name in sorted(os.listdir(os.path.join(directory, year))):
+            path = os.path.join(directory, year, name)
+            result.extend(UsptoZipCache().read(path))
+    return result
+
+
+def orcid_documents():
+    """Return the XML documents of the ORCID test data"""
+    result = []
+    with tarfile.open(td("data/ORCID_2022_10_summaries.tar.gz")) as tar:
+        for member in tar:
+            if member.isreg():
+                result.append(tar.extractfile(member).read())
+    return result
+
+
+def pubmed_rows(documents):
+    """Return the article elements of the PubMed documents"""
+    return [article for d in documents for article in xml_engine.fromstring(d)]
+
+
+def document_rows(documents):
+    """Return the root elements of the documents"""
+    return [xml_engine.fromstring(d) for d in documents]
+
+
+BENCHMARKS = [
+    ("pubmed_articles", pubmed, pubmed_documents, pubmed_rows),
+    ("us_patents", uspto, uspto_documents, document_rows),
+    ("persons", orcid, orcid_documents, document_rows),
+]
+
+
+def extract_all(extractors, rows):
+    """Extract the values of all columns of the specified rows"""
+    for row in rows:
+        for extractor in extractors:
+            extractor(row)
+
+
+def seconds(function):
+    """Return the best time in seconds of a single run of the function"""
+    timer = timeit.Timer(function)
+    number, _time = timer.autorange()
+    return min(timer.repeat(number=number, repeat=REPEAT)) / number
+
+
+def main():
+    """Run the benchmarks and print their results"""
+    print(
+        f"{'table':16} {'engine':12} {'rows':>5} {'parse µs/row':>13} "
+        f"{'extract µs/row':>15}"
+    )
+    for table_name, module, documents, rows in BENCHMARKS:
+        documents = documents()
+        (table,) = [t for t in module.tables if t.get_name() == table_name]
+        extractors = [
+            c.get_value_extractor()
+            for c in table.get_columns()
+            if c.get_value_extractor()
+        ]
+        for engine in xml_engine.available_engines():
+            xml_engine.configure(engine)
+            parsed = rows(documents)
+            parse = seconds(lambda: rows(documents))
+            extract = seconds(lambda: extract_all(extractors, parsed))
+            count = len(parsed)
+            print(
+                f"{table_name:16} {engine:12} {count:5} "
+                f"{parse / count * 1e6:13.1f} {extract / count * 1e6:15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -18,9 +18,13 @@
 #
 """Functionality common to more than one test"""
 
+import gzip
+import types
 import unittest
+from unittest import mock
 
 from alexandria3k.common import query_result
+from alexandria3k.data_sources_lib import archive_index
 
 
 def record_count(g):
@@ -49,3 +53,39 @@ class PopulateQueries(unittest.TestCase):
         return query_result(
             self.cursor, f"SELECT Count(*) FROM {table} WHERE {condition}"
         )
+
+
+class IndexedGzipFile(gzip.GzipFile):
+    """A test double of indexed_gzip.IndexedGzipFile.  Its exported
+    index contains no checkpoints, and its seeks decompress the data
+    from the start of the file."""
+
+    opened = 0
+    """int: number of opened files"""
+
+    # pylint: disable-next=unused-argument
+    def __init__(self, filename, spacing=None, index_file=None):
+        super().__init__(filename, "rb")
+        if index_file is not None:
+            # Fail as indexed_gzip does for a missing index
+            with open(index_file, "rb"):
+                pass
+        IndexedGzipFile.opened += 1
+
+    def export_index(self, filename):
+        """Create the specified (empty) index file"""
+        with open(filename, "wb"):
+            pass
+
+
+indexed_gzip_double = types.SimpleNamespace(IndexedGzipFile=IndexedGzipFile)
+"""A test double of the indexed_gzip module, for testing the reading of
+indexed archives when the module is not installed"""
+
+
+def patch_indexed_gzip(module):
+    """Return a patcher for making the archive index use the specified
+    indexed_gzip module, or its test double if the module is None"""
+    return mock.patch.object(
+        archive_index, "indexed_gzip", module or indexed_gzip_double
+    )
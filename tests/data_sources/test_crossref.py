@@ -27,9 +27,10 @@ from ..test_dir import add_src_dir, td
 add_src_dir()
 
 from ..common import PopulateQueries, record_count
-from alexandria3k.common import ensure_unlinked, query_result
+from alexandria3k.common import Alexandria3kError, ensure_unlinked, query_result
 from alexandria3k.data_sources import crossref
 from alexandria3k import debug
+from alexandria3k.data_sources_lib import read_ahead
 from alexandria3k.data_sources_lib.crossref_file_cache import FileCache
 
 
@@ -289,6 +290,159 @@ class TestCrossrefPopulateDetailCondition(PopulateQueries):
         self.assertEqual(FileCache.file_reads, 9)
 
 
+class TestCrossrefPopulateParallel(PopulateQueries):
+    @classmethod
+    def setUpClass(cls):
+        ensure_unlinked(DATABASE_PATH)
+
+        cls.crossref = crossref.Crossref(td("data/crossref-sample"))
+        cls.crossref.populate(DATABASE_PATH, workers=3)
+        cls.con = sqlite3.connect(DATABASE_PATH)
+        cls.cursor = cls.con.cursor()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.con.close()
+        os.unlink(DATABASE_PATH)
+        cls.crossref.close()
+
+    def test_counts(self):
+        self.assertEqual(self.record_count("works"), 15)
+        self.assertEqual(self.record_count("work_authors"), 71)
+        self.assertEqual(self.record_count("author_affiliations"), 14)
+        self.assertEqual(self.record_count("work_references"), 281)
+        self.assertEqual(self.record_count("work_funders"), 5)
+        self.assertEqual(self.record_count("funder_awards"), 5)
+
+    def test_keys(self):
+        self.assertEqual(
+            self.record_count(
+                """(SELECT 1 FROM work_authors
+          INNER JOIN works ON works.id = work_authors.work_id)"""
+            ),
+            71,
+        )
+        self.assertEqual(
+            self.record_count(
+                """(SELECT 1 FROM author_affiliations
+          INNER JOIN work_authors
+            ON work_authors.id = author_affiliations.author_id)"""
+            ),
+            14,
+        )
+
+
+class TestCrossrefPopulateReadAhead(PopulateQueries):
+    @classmethod
+    def setUpClass(cls):
+        ensure_unlinked(DATABASE_PATH)
+        FileCache.file_reads = 0
+        read_ahead.configure(3)
+
+        cls.crossref = crossref.Crossref(td("data/crossref-sample"))
+        cls.crossref.populate(
+            DATABASE_PATH, None, "work_authors.orcid = '0000-0002-5878-603X'"
+        )
+        cls.con = sqlite3.connect(DATABASE_PATH)
+        cls.cursor = cls.con.cursor()
+
+    @classmethod
+    def tearDownClass(cls):
+        read_ahead.configure(0)
+        cls.con.close()
+        os.unlink(DATABASE_PATH)
+        cls.crossref.close()
+
+    def test_counts(self):
+        self.assertEqual(self.record_count("works"), 2)
+        self.assertEqual(self.record_count("work_authors"), 5)
+        self.assertEqual(self.record_count("author_affiliations"), 5)
+        self.assertEqual(FileCache.file_reads, 9)
+
+
+class TestCrossrefPopulateParallelCondition(PopulateQueries):
+    @classmethod
+    def setUpClass(cls):
+        ensure_unlinked(DATABASE_PATH)
+
+        cls.crossref = crossref.Crossref(td("data/crossref-sample"))
+        cls.crossref.populate(
+            DATABASE_PATH,
+            ["works.doi", "work_authors.orcid"],
+            "work_authors.orcid = '0000-0002-5878-603X'",
+            workers=2,
+        )
+        cls.con = sqlite3.connect(DATABASE_PATH)
+        cls.cursor = cls.con.cursor()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.con.close()
+        os.unlink(DATABASE_PATH)
+        cls.crossref.close()
+
+    def test_counts(self):
+        self.assertEqual(self.record_count("works"), 2)
+        self.assertEqual(self.record_count("work_authors"), 5)
+
+
+class TestCrossrefPopulateSinglePass(PopulateQueries):
+    """Verify the population of detail tables through a single
+    traversal of each container"""
+
+    @classmethod
+    def setUpClass(cls):
+        ensure_unlinked(DATABASE_PATH)
+        FileCache.file_reads = 0
+
+        cls.crossref = crossref.Crossref(td("data/crossref-sample"))
+        cls.crossref.populate(
+            DATABASE_PATH,
+            ["works.doi", "works.id", "author_affiliations.*"],
+        )
+        cls.con = sqlite3.connect(DATABASE_PATH)
+        cls.cursor = cls.con.cursor()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.con.close()
+        os.unlink(DATABASE_PATH)
+        cls.crossref.close()
+
+    def test_counts(self):
+        self.assertEqual(self.record_count("works"), 15)
+        self.assertEqual(self.record_count("author_affiliations"), 14)
+        self.assertEqual(FileCache.file_reads, 9)
+
+    def test_no_extra_tables(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            self.cond_field("work_authors", "family", "true")
+
+    def test_same_as_virtual_tables(self):
+        """Compare with population through the virtual tables"""
+        columns = ["works.*", "work_authors.*", "author_affiliations.*"]
+        ensure_unlinked(ATTACHED_DATABASE_PATH)
+        with crossref.Crossref(td("data/crossref-sample")) as instance:
+            instance.populate(ATTACHED_DATABASE_PATH, columns)
+        single_pass = sqlite3.connect(ATTACHED_DATABASE_PATH)
+        ensure_unlinked(ATTACHED_DATABASE_PATH + "-virtual")
+        with crossref.Crossref(td("data/crossref-sample")) as instance:
+            instance.populate(
+                ATTACHED_DATABASE_PATH + "-virtual", columns, "true"
+            )
+        virtual = sqlite3.connect(ATTACHED_DATABASE_PATH + "-virtual")
+        for table in ("works", "work_authors", "author_affiliations"):
+            query = f"SELECT * FROM {table} ORDER BY 1, 2"
+            self.assertEqual(
+                single_pass.execute(query).fetchall(),
+                virtual.execute(query).fetchall(),
+            )
+        single_pass.close()
+        virtual.close()
+        os.unlink(ATTACHED_DATABASE_PATH)
+        os.unlink(ATTACHED_DATABASE_PATH + "-virtual")
+
+
 class TestCrossrefPopulateMasterColumnNoCondition(PopulateQueries):
     """Verify column specification and population of root table"""
 
@@ -558,6 +712,89 @@ class TestCrossrefQuery(unittest.TestCase):
                 5,
             )
 
+    def test_parallel_join(self):
+        query = """SELECT works.doi, work_authors.family FROM works
+            INNER JOIN work_authors ON work_authors.work_id = works.id"""
+        serial = list(self.crossref.query(query, True))
+        self.assertEqual(len(serial), 71)
+        self.assertEqual(list(self.crossref.query(query, True, 3)), serial)
+        self.assertEqual(
+            sorted(self.crossref.query(query, True, 3, False), key=str),
+            sorted(serial, key=str),
+        )
+
+    def test_parallel_column_names(self):
+        for rec in self.crossref.query(
+            "SELECT doi, title FROM works", True, 2
+        ):
+            self.assertEqual(
+                self.crossref.get_query_column_names(), ["doi", "title"]
+            )
+
+    def test_parallel_attached(self):
+        query = """SELECT * FROM works WHERE EXISTS (
+            SELECT 1 FROM attached.s_works WHERE works.doi = s_works.doi)"""
+        self.assertEqual(record_count(self.crossref.query(query, True, 2)), 1)
+
+    def test_parallel_unpartitioned(self):
+        with self.assertRaises(Alexandria3kError):
+            list(self.crossref.query("SELECT * FROM works", False, 2))
+
+
+class TestCrossrefFilterPushdown(unittest.TestCase):
+    """Verify the evaluation of constraints in the works cursor"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.crossref = crossref.Crossref(td("data/crossref-sample"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.crossref.close()
+
+    def assert_filtered(self, condition, expected_count):
+        query = f"SELECT id, doi FROM works WHERE {condition}"
+        plan = list(self.crossref.query("EXPLAIN QUERY PLAN " + query))
+        self.assertIn("INDEX 8:", plan[0][3])
+        result = sorted(self.crossref.query(query))
+        self.assertEqual(len(result), expected_count)
+        # Unary plus makes the expression opaque to the cursor
+        unfiltered = condition.replace("works.", "+works.")
+        self.assertEqual(
+            sorted(
+                self.crossref.query(
+                    f"SELECT id, doi FROM works WHERE {unfiltered}"
+                )
+            ),
+            result,
+        )
+
+    def test_comparisons(self):
+        self.assert_filtered("works.published_year > 2018", 12)
+        self.assert_filtered("works.published_year <= 2018", 3)
+        self.assert_filtered("works.published_year = 2018", 1)
+        self.assert_filtered("works.type = 'journal-article'", 11)
+
+    def test_in(self):
+        self.assert_filtered("works.published_year IN (2017, 2025)", 4)
+        self.assert_filtered("works.type IN ('book', 'other')", 2)
+
+    def test_like(self):
+        # LIKE ignores the case of ASCII characters
+        self.assert_filtered("works.doi LIKE '10.1007/S%'", 4)
+        self.assert_filtered("works.doi LIKE '10.100_/%'", 8)
+
+    def test_affinity(self):
+        # Values of other types are left to the engine to compare
+        self.assert_filtered("works.published_year > '2018'", 0)
+        self.assert_filtered("works.published_year > 2018.5", 12)
+
+    def test_collation(self):
+        query = "SELECT doi FROM works WHERE type = 'BOOK' COLLATE NOCASE"
+        plan = list(self.crossref.query("EXPLAIN QUERY PLAN " + query))
+        self.assertIn("INDEX 0:", plan[0][3])
+        self.assertEqual(len(list(self.crossref.query(query))), 1)
+
 
 class TestCrossrefPopulateAttachedDatabaseCondition(PopulateQueries):
     """Verify column specification and population of single table"""
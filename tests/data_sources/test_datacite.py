@@ -18,16 +18,22 @@
 #
 """DataCite import integration tests"""
 
+import io
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 import sqlite3
 
 from ..test_dir import add_src_dir, td
 add_src_dir()
 
-from ..common import PopulateQueries, record_count
+from ..common import PopulateQueries, patch_indexed_gzip, record_count
+from alexandria3k import debug
 from alexandria3k.common import ensure_unlinked, query_result
 from alexandria3k.data_sources import datacite
+from alexandria3k.data_sources_lib import archive_index
 from alexandria3k.data_sources_lib.crossref_file_cache import FileCache
 
 
@@ -421,3 +427,198 @@ class TestDataciteTransitiveClosure(unittest.TestCase):
             ),
             set(["dc_works", "dc_work_creators", "dc_work_subjects"]),
         )
+
+
+class TestDataciteUsedColumns(unittest.TestCase):
+    def setUp(self):
+        # The archive's contents can only be streamed once
+        self.datacite = datacite.Datacite(td("data/datacite.tar.gz"))
+
+    def tearDown(self):
+        self.datacite.close()
+
+    def test_plan_columns(self):
+        plan = list(
+            self.datacite.query(
+                "EXPLAIN QUERY PLAN SELECT doi, publisher FROM dc_works"
+            )
+        )
+        # Columns 4 and 5 are passed to the cursor through the index name
+        self.assertIn("INDEX 0:;4,5", plan[0][3])
+
+    def test_narrow_query(self):
+        dois = list(self.datacite.query("SELECT doi FROM dc_works"))
+        self.assertEqual(len(dois), 10)
+        self.assertTrue(all(doi for (doi,) in dois))
+
+    def test_normalized_people(self):
+        # Affiliations given as a dict are still normalized into a list;
+        # the count equals that of the populated table
+        (count,) = self.datacite.query(
+            "SELECT COUNT(*) FROM dc_creator_affiliations"
+        )
+        self.assertEqual(count, (18,))
+
+    def test_normalized_name_identifiers(self):
+        (count,) = self.datacite.query(
+            """SELECT COUNT(*) FROM dc_creator_name_identifiers
+              WHERE name_identifier IS NOT NULL"""
+        )
+        self.assertEqual(count, (9,))
+
+    def people_fixups(self, query):
+        """Return the number of people's element lists retrieved through
+        the cursors that fix them up when running the specified query"""
+        with mock.patch.object(
+            datacite.PersonElementsCursor,
+            "nested_elements",
+            autospec=True,
+            side_effect=datacite.PersonElementsCursor.nested_elements,
+        ) as nested_elements:
+            list(self.datacite.query(query))
+        return nested_elements.call_count
+
+    def test_people_not_fixed(self):
+        self.assertEqual(
+            self.people_fixups(
+                """SELECT dc_works.doi, dc_work_creators.name
+                  FROM dc_works LEFT JOIN dc_work_creators
+                    ON dc_work_creators.work_id = dc_works.id"""
+            ),
+            0,
+        )
+
+    def test_people_fixed(self):
+        self.assertGreater(
+            self.people_fixups("SELECT name FROM dc_creator_affiliations"), 0
+        )
+
+
+class TestDataciteSharedRecords(unittest.TestCase):
+    """Verify that each file's records are decoded once for all tables"""
+
+    def test_populate(self):
+        ensure_unlinked(DATABASE_PATH)
+        source = datacite.Datacite(td("data/datacite.tar.gz"))
+        output = io.StringIO()
+        with mock.patch.object(
+            datacite, "decoded_record", wraps=datacite.decoded_record
+        ) as decoded_record, mock.patch.object(
+            debug, "enabled_flags", {"perf"}
+        ), mock.patch.object(
+            debug, "output", output
+        ):
+            source.populate(DATABASE_PATH)
+        source.close()
+        os.unlink(DATABASE_PATH)
+        self.assertEqual(decoded_record.call_count, 10)
+        # Decoding is reported for each of the five files
+        self.assertEqual(output.getvalue().count(" Decode "), 5)
+
+    def test_query(self):
+        source = datacite.Datacite(td("data/datacite.tar.gz"))
+        with mock.patch.object(
+            datacite, "decoded_record", wraps=datacite.decoded_record
+        ) as decoded_record:
+            rows = list(
+                source.query(
+                    """SELECT dc_works.doi, dc_work_creators.name,
+                        dc_creator_affiliations.name
+                      FROM dc_works
+                      LEFT JOIN dc_work_creators
+                        ON dc_work_creators.work_id = dc_works.id
+                      LEFT JOIN dc_creator_affiliations
+                        ON dc_creator_affiliations.creator_id
+                          = dc_work_creators.id"""
+                )
+            )
+        source.close()
+        self.assertEqual(decoded_record.call_count, 10)
+        self.assertTrue(rows)
+
+
+def populated_rows(archive, condition=None, workers=1):
+    """Return the rows of the tables populated from the specified
+    archive with the specified number of workers"""
+    ensure_unlinked(DATABASE_PATH)
+    source = datacite.Datacite(archive)
+    source.populate(DATABASE_PATH, condition=condition, workers=workers)
+    source.close()
+    con = sqlite3.connect(DATABASE_PATH)
+    table_names = [
+        name
+        for (name,) in con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    ]
+    # Rows as dictionaries, as the column order may vary
+    con.row_factory = sqlite3.Row
+    result = {
+        name: [dict(row) for row in con.execute(f"SELECT * FROM {name}")]
+        for name in table_names
+    }
+    con.close()
+    os.unlink(DATABASE_PATH)
+    return result
+
+
+class TestDataciteArchiveIndex(unittest.TestCase):
+    """Verify that files read through an archive index give the same
+    results"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Its test double is used if indexed_gzip is not installed
+        cls.patcher = patch_indexed_gzip(archive_index.indexed_gzip)
+        cls.patcher.start()
+        # pylint: disable-next=consider-using-with
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.archive = os.path.join(cls.directory.name, "datacite.tar.gz")
+        shutil.copy(td("data/datacite.tar.gz"), cls.archive)
+        archive_index.create_index(cls.archive)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        cls.patcher.stop()
+
+    def test_random_access(self):
+        source = datacite.Datacite(self.archive)
+        tar_files = source.data_source.data_files
+        self.assertTrue(source.data_source.random_access_containers)
+        self.assertIsNone(tar_files.tar)
+        # Files can be read in any order
+        last = tar_files.get_file_contents(len(tar_files.members) - 1)
+        first = tar_files.get_file_contents(0)
+        self.assertTrue(first)
+        self.assertNotEqual(first, last)
+        self.assertIsNone(tar_files.get_file_contents(len(tar_files.members)))
+        source.close()
+
+    def test_populate(self):
+        for condition in None, "dc_works.publisher like 'Z%'":
+            expected = populated_rows(td("data/datacite.tar.gz"), condition)
+            self.assertTrue(expected["dc_works"])
+            for workers in 1, 3:
+                with self.subTest(condition=condition, workers=workers):
+                    self.assertEqual(
+                        populated_rows(self.archive, condition, workers),
+                        expected,
+                    )
+
+    def test_query(self):
+        query = """SELECT dc_works.doi, dc_work_creators.*
+            FROM dc_works INNER JOIN dc_work_creators
+              ON dc_work_creators.work_id = dc_works.id"""
+        results = []
+        for archive, workers in (
+            (td("data/datacite.tar.gz"), 1),
+            (self.archive, 1),
+            (self.archive, 3),
+        ):
+            source = datacite.Datacite(archive)
+            results.append(list(source.query(query, True, workers)))
+            source.close()
+        self.assertEqual(len(results[0]), 30)
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
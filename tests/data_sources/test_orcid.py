@@ -20,19 +20,23 @@
 
 import os
 import random
+import shutil
 import sqlite3
 import sys
+import tempfile
 import unittest
 
 from ..test_dir import add_src_dir, td
 add_src_dir()
 
-from ..common import record_count
+from ..common import patch_indexed_gzip, record_count
 from alexandria3k.common import ensure_unlinked, query_result
 from alexandria3k.data_sources import crossref
 from alexandria3k.data_sources import orcid
+from alexandria3k.data_sources_lib import archive_index, xml_engine
 
 DATABASE_PATH = td("tmp/orcid.db")
+ORCID_FILE = td("data/ORCID_2022_10_summaries.tar.gz")
 
 
 class TestOrcidAll(unittest.TestCase):
@@ -293,6 +297,294 @@ class TestOrcidSample(unittest.TestCase):
     ):
         result = TestOrcidSample.cursor.execute(f"SELECT Count(*) from persons")
         (count,) = result.fetchone()
-        # ORCID_2022_10_summaries/000/0000-0001-5078-5000.xml is an error
-        # record, so only its DOI is imported
-        self.assertEqual(count, 1)
+        self.assertEqual(count, 4)
+
+    def test_consistent_sampling(self):
+        # Each record is sampled once for all tables
+        result = TestOrcidSample.cursor.execute(
+            """SELECT Count(*) FROM person_works
+            WHERE person_id NOT IN (SELECT id FROM persons)"""
+        )
+        (count,) = result.fetchone()
+        self.assertEqual(count, 0)
+
+
+# pylint: disable-next=too-many-arguments
+def populated_rows(
+    partition_size,
+    condition=None,
+    workers=1,
+    sample=None,
+    columns=None,
+    archive=ORCID_FILE,
+):
+    """Return the rows of the specified columns of the tables populated
+    from the specified archive through partitions of the specified size
+    and the specified number of workers"""
+    ensure_unlinked(DATABASE_PATH)
+    source = orcid.Orcid(
+        archive,
+        sample or (lambda n: True),
+        partition_size=partition_size,
+    )
+    source.populate(
+        DATABASE_PATH, columns, condition=condition, workers=workers
+    )
+    source.close()
+    con = sqlite3.connect(DATABASE_PATH)
+    table_names = [
+        name
+        for (name,) in con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    ]
+    # Rows as dictionaries, as the column order may vary
+    con.row_factory = sqlite3.Row
+    result = {
+        name: [dict(row) for row in con.execute(f"SELECT * FROM {name}")]
+        for name in table_names
+    }
+    con.close()
+    os.unlink(DATABASE_PATH)
+    return result
+
+
+class TestOrcidPartitionSize(unittest.TestCase):
+    """Verify that partitions of several records give the same results"""
+
+    def test_partitions(self):
+        source = orcid.Orcid(
+            td("data/ORCID_2022_10_summaries.tar.gz"), partition_size=3
+        )
+        names = [
+            source.data_source.get_container_name(i)
+            for i in source.data_source.get_container_iterator()
+        ]
+        source.close()
+        # Eight files, including an error record
+        self.assertEqual(len(names), 3)
+        self.assertTrue(names[0].endswith(".xml"))
+
+    def test_populate(self):
+        for condition in None, "persons.given_names like 'M%'":
+            expected = populated_rows(1, condition)
+            self.assertTrue(expected["persons"])
+            for partition_size in 3, orcid.DEFAULT_PARTITION_SIZE:
+                with self.subTest(
+                    condition=condition, partition_size=partition_size
+                ):
+                    self.assertEqual(
+                        populated_rows(partition_size, condition),
+                        expected,
+                    )
+
+    def test_query(self):
+        query = """SELECT persons.id, persons.container_id, person_works.*
+            FROM persons INNER JOIN person_works
+              ON person_works.person_id = persons.id"""
+        results = []
+        for partition_size in 1, 3:
+            source = orcid.Orcid(
+                td("data/ORCID_2022_10_summaries.tar.gz"),
+                partition_size=partition_size,
+            )
+            results.append(list(source.query(query, True)))
+            source.close()
+        self.assertEqual(len(results[0]), 199)
+        self.assertEqual(results[1], results[0])
+
+
+class TestOrcidWorkers(unittest.TestCase):
+    """Verify that worker processes give the same rows in the same order"""
+
+    def test_populate(self):
+        for condition in None, "persons.given_names like 'M%'":
+            expected = populated_rows(3, condition)
+            for workers in 2, 3:
+                with self.subTest(condition=condition, workers=workers):
+                    self.assertEqual(
+                        populated_rows(3, condition, workers), expected
+                    )
+
+    def test_sample(self):
+        results = []
+        for workers in 1, 2:
+            random.seed(42)
+            results.append(
+                populated_rows(
+                    2, workers=workers, sample=lambda _x: random.random() < 0.5
+                )
+            )
+        self.assertEqual(len(results[0]["persons"]), 4)
+        self.assertEqual(results[1], results[0])
+
+    def test_query(self):
+        query = "SELECT * FROM person_works"
+        results = []
+        for workers in 1, 3:
+            source = orcid.Orcid(
+                td("data/ORCID_2022_10_summaries.tar.gz"), partition_size=3
+            )
+            results.append(list(source.query(query, True, workers)))
+            source.close()
+        self.assertEqual(len(results[0]), 199)
+        self.assertEqual(results[1], results[0])
+
+
+class TestOrcidArchiveIndex(unittest.TestCase):
+    """Verify that records read through an archive index give the same
+    results"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Its test double is used if indexed_gzip is not installed
+        cls.patcher = patch_indexed_gzip(archive_index.indexed_gzip)
+        cls.patcher.start()
+        # pylint: disable-next=consider-using-with
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.archive = os.path.join(cls.directory.name, "orcid.tar.gz")
+        shutil.copy(ORCID_FILE, cls.archive)
+        archive_index.create_index(cls.archive, 64 * 1024)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        cls.patcher.stop()
+
+    def test_indexed(self):
+        source = orcid.Orcid(self.archive)
+        tar_files = source.data_source.data_files
+        self.assertIsNotNone(tar_files.index)
+        list(tar_files.get_container_iterator())
+        # The archive is not decompressed sequentially
+        self.assertIsNone(tar_files.tar)
+        source.close()
+
+    def test_populate(self):
+        for condition in None, "persons.given_names like 'M%'":
+            expected = populated_rows(3, condition)
+            for workers in 1, 3:
+                with self.subTest(condition=condition, workers=workers):
+                    self.assertEqual(
+                        populated_rows(
+                            3, condition, workers, archive=self.archive
+                        ),
+                        expected,
+                    )
+
+    def test_sample(self):
+        results = []
+        for archive in ORCID_FILE, self.archive:
+            random.seed(42)
+            results.append(
+                populated_rows(
+                    2,
+                    workers=2,
+                    sample=lambda _x: random.random() < 0.5,
+                    archive=archive,
+                )
+            )
+        self.assertEqual(results[1], results[0])
+
+    def test_query(self):
+        query = """SELECT persons.id, persons.container_id, person_works.*
+            FROM persons INNER JOIN person_works
+              ON person_works.person_id = persons.id"""
+        results = []
+        for archive, workers in (
+            (ORCID_FILE, 1),
+            (self.archive, 1),
+            (self.archive, 3),
+        ):
+            source = orcid.Orcid(archive, partition_size=3)
+            results.append(list(source.query(query, True, workers)))
+            source.close()
+        self.assertEqual(len(results[0]), 199)
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+
+
+def record_data():
+    """Return the XML data of the test data's records"""
+    source = orcid.Orcid(td("data/ORCID_2022_10_summaries.tar.gz"))
+    tar_files = source.data_source.data_files
+    result = [
+        xml_data
+        for _partition in tar_files.get_container_iterator()
+        for _file_id, _orcid, xml_data in tar_files.partition
+    ]
+    source.close()
+    return result
+
+
+class TestOrcidSelectiveParsing(unittest.TestCase):
+    """Verify that only the required record sections are parsed"""
+
+    def test_skip_sections(self):
+        for xml_data in record_data():
+            full = xml_engine.fromstring(xml_data)
+            for section in orcid.SKIPPABLE_SECTIONS:
+                tree = xml_engine.fromstring(
+                    xml_engine.skip_sections(xml_data, {section})
+                )
+                self.assertEqual(tree.findall(f".//{section}"), [])
+                for other in orcid.SKIPPABLE_SECTIONS - {section}:
+                    self.assertEqual(
+                        len(tree.findall(f".//{other}//*")),
+                        len(full.findall(f".//{other}//*")),
+                    )
+
+    def test_required_sections(self):
+        self.assertEqual(
+            orcid.required_sections("persons", {"id", "orcid"}), set()
+        )
+        self.assertEqual(
+            orcid.required_sections("persons", {"orcid", "biography"}),
+            {orcid.PERSON_COLUMN_SECTIONS["biography"]},
+        )
+        self.assertEqual(
+            orcid.required_sections("person_works", {"doi"}),
+            {orcid.TABLE_SECTIONS["person_works"]},
+        )
+
+    def test_populate(self):
+        columns = [
+            "persons.orcid",
+            "persons.given_names",
+            "person_employments.*",
+        ]
+        for condition in None, "person_employments.organization_country = 'GR'":
+            expected = populated_rows(3, condition)
+            with self.subTest(condition=condition):
+                self.assertEqual(
+                    populated_rows(3, condition, columns=columns),
+                    {
+                        "persons": [
+                            {
+                                "orcid": row["orcid"],
+                                "given_names": row["given_names"],
+                            }
+                            for row in expected["persons"]
+                        ],
+                        "person_employments": expected["person_employments"],
+                    },
+                )
+
+    def test_query(self):
+        query = """SELECT persons.orcid, person_employments.organization_name
+            FROM persons INNER JOIN person_employments
+              ON person_employments.person_id = persons.id"""
+        results = []
+        for sections in set(), orcid.SKIPPABLE_SECTIONS:
+            source = orcid.Orcid(td("data/ORCID_2022_10_summaries.tar.gz"))
+            tar_files = source.data_source.data_files
+            tar_files.require_sections(sections)
+            results.append(list(source.query(query, True)))
+            if not sections:
+                self.assertEqual(
+                    tar_files.sections,
+                    {orcid.TABLE_SECTIONS["person_employments"]},
+                )
+            source.close()
+        self.assertTrue(results[0])
+        self.assertEqual(results[0], results[1])
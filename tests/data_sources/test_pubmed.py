@@ -21,6 +21,7 @@
 import os
 import sqlite3
 import unittest
+import xml.etree.ElementTree as ET
 
 from ..test_dir import add_src_dir, td
 
@@ -29,7 +30,12 @@ add_src_dir()
 from alexandria3k import debug
 from alexandria3k.common import ensure_unlinked
 from alexandria3k.data_sources import pubmed
-from alexandria3k.data_sources_lib.pubmed_file_cache import FileCache
+from alexandria3k.data_sources_lib import container_cache
+from alexandria3k.data_sources_lib.container_cache import StreamedItems
+from alexandria3k.data_sources_lib.pubmed_file_cache import (
+    FileCache,
+    get_file_cache,
+)
 
 from ..common import PopulateQueries, record_count
 
@@ -384,6 +390,57 @@ class TestPubmedQuery(unittest.TestCase):
             )
 
 
+STREAMING_QUERY = """SELECT pubmed_articles.*, pubmed_authors.*,
+    pubmed_author_affiliations.*
+  FROM pubmed_articles
+  LEFT JOIN pubmed_authors ON pubmed_authors.article_id = pubmed_articles.id
+  LEFT JOIN pubmed_author_affiliations
+    ON pubmed_author_affiliations.author_id = pubmed_authors.id
+  ORDER BY pubmed_articles.id, pubmed_authors.id,
+    pubmed_author_affiliations.id"""
+
+
+def clear_file_cache():
+    """Remove the containers read in previous tests"""
+    file_cache = get_file_cache()
+    file_cache.cache.clear()
+    file_cache.cached_path = None
+
+
+class TestPubmedStreaming(unittest.TestCase):
+    def tearDown(self):
+        container_cache.configure_streaming(None)
+        clear_file_cache()
+
+    def test_elements(self):
+        directory = td("data/pubmed-sample")
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            root, _size = FileCache.decode(path)
+            self.assertEqual(
+                [ET.tostring(e) for e in FileCache.stream(path)],
+                [ET.tostring(e) for e in root],
+            )
+
+    def test_query(self):
+        clear_file_cache()
+        with pubmed.Pubmed(td("data/pubmed-sample")) as source:
+            expected = {
+                partition: list(source.query(STREAMING_QUERY, partition))
+                for partition in (True, False)
+            }
+        self.assertEqual(len(expected[False]), 51)
+        container_cache.configure_streaming(0, 2)
+        clear_file_cache()
+        with pubmed.Pubmed(td("data/pubmed-sample")) as source:
+            for partition in True, False:
+                self.assertEqual(
+                    list(source.query(STREAMING_QUERY, partition)),
+                    expected[partition],
+                )
+            self.assertIsInstance(get_file_cache().cached_data, StreamedItems)
+
+
 class TestPubmedPopulateAttachedDatabaseCondition(PopulateQueries):
     """Verify column specification and population of single table"""
 
@@ -22,6 +22,7 @@ import os
 import random
 import sys
 import unittest
+from unittest import mock
 
 import ahocorasick
 import apsw
@@ -248,3 +249,54 @@ class TestRorPopulateSample(unittest.TestCase):
         )
         (count,) = result.fetchone()
         self.assertEqual(count, 12)
+
+
+class TestRorStreaming(unittest.TestCase):
+    """Verify that the organizations are read anew in each scan"""
+
+    def setUp(self):
+        self.ror = ror.Ror(td("data/ror.zip"))
+
+    def tearDown(self):
+        self.ror.close()
+
+    def test_no_records_kept(self):
+        self.assertIsInstance(self.ror.data_source.data_source, ror.RorRecords)
+        self.assertEqual(len(list(self.ror.data_source.data_source)), 29)
+
+    def test_repeated_scans(self):
+        query = "SELECT Count(*) FROM research_organizations"
+        self.assertEqual(list(self.ror.query(query)), [(29,)])
+        self.assertEqual(list(self.ror.query(query)), [(29,)])
+
+    def test_join(self):
+        (count,) = self.ror.query(
+            """SELECT Count(*) FROM research_organizations AS a
+              INNER JOIN research_organizations AS b ON a.name = b.name"""
+        )
+        self.assertEqual(count, (29,))
+        (count,) = self.ror.query(
+            """SELECT Count(*) FROM research_organizations
+              INNER JOIN ror_funder_ids
+                ON ror_funder_ids.ror_id = research_organizations.id"""
+        )
+        self.assertEqual(count, (59,))
+
+    def test_single_pass_population(self):
+        ensure_unlinked(DATABASE_PATH)
+        parse = ror.RorRecords.__iter__
+        with mock.patch.object(
+            ror.RorRecords, "__iter__", autospec=True, side_effect=parse
+        ) as records:
+            self.ror.populate(DATABASE_PATH)
+        # All tables are populated through a single pass over the data
+        self.assertEqual(records.call_count, 1)
+        database = apsw.Connection(DATABASE_PATH)
+        for table in ror.tables:
+            name = table.get_name()
+            query = f"SELECT Count(*) FROM {name}"
+            self.assertEqual(
+                list(database.execute(query)), list(self.ror.query(query))
+            )
+        database.close()
+        os.unlink(DATABASE_PATH)
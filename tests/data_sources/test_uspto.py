@@ -638,3 +638,88 @@ class TestUsptoSamplingContainer(PopulateQueries):
         self.assertEqual(count, 1)
         self.assertEqual(UsptoZipCache.file_reads, 2)
         UsptoZipCache.file_reads = 0
+
+
+def populated_rows(partition_size, condition=None, workers=1):
+    """Return the rows of the tables populated through partitions
+    of the specified size and the specified number of workers"""
+    ensure_unlinked(DATABASE_PATH)
+    with uspto.Uspto(
+        td("data/uspto-2023-04"), partition_size=partition_size
+    ) as source:
+        source.populate(
+            DATABASE_PATH, condition=condition, workers=workers
+        )
+    con = sqlite3.connect(DATABASE_PATH)
+    result = {
+        table.get_name(): con.execute(
+            f"SELECT * FROM {table.get_name()}"
+        ).fetchall()
+        for table in uspto.tables
+    }
+    con.close()
+    os.unlink(DATABASE_PATH)
+    return result
+
+
+def queried_rows(partition_size, query, workers=1):
+    """Return the rows of the partitioned query run through partitions
+    of the specified size and the specified number of workers"""
+    with uspto.Uspto(
+        td("data/uspto-2023-04"), partition_size=partition_size
+    ) as source:
+        return list(source.query(query, True, workers))
+
+
+class TestUsptoPartitionSize(unittest.TestCase):
+    """Verify that partitions of several patents give the same results"""
+
+    def test_partitions(self):
+        with uspto.Uspto(
+            td("data/uspto-2023-04"), partition_size=2
+        ) as source:
+            containers = list(source.data_source.get_container_iterator())
+        # 14 patents in two Zip files
+        self.assertGreater(len(containers), 2)
+        self.assertLess(len(containers), 14)
+
+    def test_populate(self):
+        for condition in None, "us_patents.type = 'utility'":
+            expected = populated_rows(1, condition)
+            self.assertEqual(
+                len(expected["us_patents"]), 14 if condition is None else 6
+            )
+            for partition_size in 2, uspto.DEFAULT_PARTITION_SIZE:
+                self.assertEqual(
+                    populated_rows(partition_size, condition), expected
+                )
+
+    def test_query(self):
+        query = """SELECT us_patents.container_id, usp_inventors.*
+            FROM us_patents INNER JOIN usp_inventors
+              ON us_patents.container_id = usp_inventors.patent_id"""
+        expected = queried_rows(1, query)
+        self.assertTrue(expected)
+        for partition_size in 2, uspto.DEFAULT_PARTITION_SIZE:
+            self.assertEqual(
+                queried_rows(partition_size, query), expected
+            )
+
+
+class TestUsptoWorkers(unittest.TestCase):
+    """Verify that worker processes give the same rows in the same order"""
+
+    def test_populate(self):
+        for condition in None, "us_patents.type = 'utility'":
+            expected = populated_rows(2, condition)
+            self.assertTrue(expected["usp_citations"])
+            for workers in 2, 3:
+                self.assertEqual(
+                    populated_rows(2, condition, workers), expected
+                )
+
+    def test_query(self):
+        query = "SELECT * FROM usp_cpc_classifications"
+        expected = queried_rows(2, query)
+        self.assertEqual(len(expected), 20)
+        self.assertEqual(queried_rows(2, query, 3), expected)
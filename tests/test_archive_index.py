@@ -0,0 +1,130 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the random access index of compressed tar archives"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from .common import IndexedGzipFile, patch_indexed_gzip
+from alexandria3k.common import Alexandria3kError
+from alexandria3k.data_sources_lib import archive_index
+
+ORCID_FILE = td("data/ORCID_2022_10_summaries.tar.gz")
+
+
+def tar_members(path):
+    """Return a dictionary with the data of the specified tar file's
+    regular members"""
+    with tarfile.open(path) as tar:
+        return {
+            info.name: tar.extractfile(info).read()
+            for info in tar
+            if info.isreg()
+        }
+
+
+class TestArchiveIndex(unittest.TestCase):
+    # Its test double is used if indexed_gzip is not installed
+    indexed_gzip = archive_index.indexed_gzip
+
+    def setUp(self):
+        patcher = patch_indexed_gzip(self.indexed_gzip)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # pylint: disable-next=consider-using-with
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "orcid.tar.gz")
+        shutil.copy(ORCID_FILE, self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_not_indexed(self):
+        self.assertIsNone(archive_index.open_index(self.path))
+
+    def test_members(self):
+        # Checkpoints closer than the archive's size
+        count = archive_index.create_index(self.path, 64 * 1024)
+        expected = tar_members(ORCID_FILE)
+        self.assertEqual(count, len(expected))
+
+        index = archive_index.open_index(self.path)
+        members = list(index.members())
+        self.assertEqual([m.name for m in members], list(expected))
+        self.assertEqual(index.info()["member_count"], count)
+        # Members can be read in any order
+        for member in reversed(members):
+            self.assertEqual(index.read(member), expected[member.name])
+        for member in members:
+            self.assertEqual(index.read(member), expected[member.name])
+        index.close()
+
+    def test_stale(self):
+        archive_index.create_index(self.path)
+        os.utime(self.path, ns=(0, 0))
+        self.assertIsNone(archive_index.open_index(self.path))
+
+    def test_unavailable(self):
+        archive_index.create_index(self.path)
+        with mock.patch.object(archive_index, "indexed_gzip", None):
+            self.assertIsNone(archive_index.open_index(self.path))
+            with self.assertRaises(Alexandria3kError):
+                archive_index.create_index(self.path)
+
+    def test_not_compressed(self):
+        path = os.path.join(self.directory.name, "plain.tar")
+        with open(path, "wb") as file:
+            file.write(b"not a gzip file" * 100)
+        with self.assertRaises(Alexandria3kError):
+            archive_index.create_index(path)
+        self.assertIsNone(archive_index.open_index(path))
+
+    def test_forked_process(self):
+        archive_index.create_index(self.path)
+        index = archive_index.open_index(self.path)
+        member = next(index.members())
+        data = index.read(member)
+        connection = index.get_connection()
+        reader = index.get_reader()
+        opened = IndexedGzipFile.opened
+        # A forked process opens its own database and archive
+        with mock.patch.object(os, "getpid", return_value=os.getpid() + 1):
+            self.assertEqual(index.read(member), data)
+            self.assertIsNot(index.get_connection(), connection)
+            self.assertIsNot(index.get_reader(), reader)
+            index.close()
+        if self.indexed_gzip is None:
+            self.assertEqual(IndexedGzipFile.opened, opened + 1)
+        connection.close()
+        reader.close()
+
+
+class TestArchiveIndexDouble(TestArchiveIndex):
+    """Run the tests through the indexed_gzip test double, also when
+    the module is installed"""
+
+    indexed_gzip = None
@@ -0,0 +1,122 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the least recently used container cache"""
+
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.data_sources_lib import container_cache
+from alexandria3k.data_sources_lib.container_cache import ContainerCache
+from alexandria3k.data_sources_lib.crossref_file_cache import FileCache
+from alexandria3k.data_sources_lib.uspto_file_cache import (
+    FileCache as UsptoFileCache,
+)
+
+
+class TestContainerCache(unittest.TestCase):
+    def tearDown(self):
+        container_cache.configure(1)
+
+    def test_single_entry(self):
+        cache = ContainerCache("test")
+        cache.put("a", 1, 10)
+        cache.put("b", 2, 10)
+        self.assertEqual(cache.get("a"), None)
+        self.assertEqual(cache.get("b"), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 10)
+
+    def test_lru(self):
+        container_cache.configure(2)
+        cache = ContainerCache("test")
+        cache.put("a", 1, 10)
+        cache.put("b", 2, 10)
+        # Make b the least recently used one
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3, 10)
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.size, 20)
+
+    def test_size_limit(self):
+        container_cache.configure(10, 25)
+        cache = ContainerCache("test")
+        cache.put("a", 1, 10)
+        cache.put("b", 2, 10)
+        cache.put("c", 3, 10)
+        self.assertEqual(list(cache.data), ["b", "c"])
+        # The most recent entry is always kept
+        cache.put("d", 4, 100)
+        self.assertEqual(list(cache.data), ["d"])
+        self.assertEqual(cache.evictions, 3)
+
+    def test_replace(self):
+        container_cache.configure(2)
+        cache = ContainerCache("test")
+        cache.put("a", 1, 10)
+        cache.put("a", 2, 20)
+        self.assertEqual(cache.get("a"), 2)
+        self.assertEqual(cache.size, 20)
+
+    def test_statistics(self):
+        cache = ContainerCache("test-statistics")
+        cache.put("a", 1, 10)
+        cache.get("a")
+        self.assertIn(
+            "test-statistics: 1 hits, 0 misses, 0 evictions, 1 entries, "
+            "10 uncompressed bytes",
+            container_cache.statistics(),
+        )
+
+
+class TestCrossrefFileCache(unittest.TestCase):
+    def tearDown(self):
+        container_cache.configure(1)
+
+    def test_revisit(self):
+        container_cache.configure(2)
+        file_cache = FileCache()
+        FileCache.file_reads = 0
+        path_1 = td("data/crossref-sample/1item.json.gz")
+        path_2 = td("data/crossref-sample/3items.json.gz")
+        data_1 = file_cache.read(path_1)
+        file_cache.read(path_2)
+        self.assertIs(file_cache.read(path_1), data_1)
+        self.assertEqual(FileCache.file_reads, 2)
+        self.assertEqual(file_cache.cache.hits, 1)
+
+
+class TestUsptoFileCache(unittest.TestCase):
+    def tearDown(self):
+        container_cache.configure(1)
+
+    def test_container_id_reuse(self):
+        """Container ids restart in each Zip file."""
+        container_cache.configure(4)
+        file_cache = UsptoFileCache()
+        first = file_cache.read("<patent>first</patent>", 0)
+        file_cache.read("<patent>other</patent>", 1)
+        second = file_cache.read("<patent>second</patent>", 0)
+        self.assertEqual(first.text, "first")
+        self.assertEqual(second.text, "second")
@@ -0,0 +1,376 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the container catalog"""
+
+import os
+import shutil
+import sqlite3
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k import container_catalog
+from alexandria3k.container_catalog import Predicate
+from alexandria3k.data_sources import crossref
+from alexandria3k.data_sources_lib import read_ahead
+from alexandria3k.data_sources_lib.crossref_file_cache import (
+    FileCache,
+    get_file_cache,
+)
+
+DATA_DIR = td("tmp/catalog-crossref")
+DATABASE_PATH = td("tmp/catalog.db")
+
+
+def parse(text):
+    """Return the comparison of the specified SQL expression"""
+    return container_catalog.parse_comparison(container_catalog.tokenize(text))
+
+
+class TestConditionParsing(unittest.TestCase):
+    def setUp(self):
+        self.crossref = crossref.Crossref(td("data/crossref-sample"))
+
+    def tearDown(self):
+        self.crossref.close()
+
+    def test_comparisons(self):
+        self.assertEqual(
+            parse("works.published_year >= 2020"),
+            ("works", "published_year", ">=", [2020]),
+        )
+        self.assertEqual(
+            parse("2020 < published_year"),
+            (None, "published_year", ">", [2020]),
+        )
+        self.assertEqual(
+            parse("type IN ('book', 'other')"),
+            (None, "type", "IN", ["book", "other"]),
+        )
+        self.assertEqual(
+            parse("published_year BETWEEN 2017 AND 2019"),
+            (None, "published_year", "BETWEEN", [2017, 2019]),
+        )
+        self.assertEqual(
+            parse("doi LIKE '10.1007/%'"), (None, "doi", "LIKE", ["10.1007/%"])
+        )
+        self.assertIsNone(parse("published_year + 1 = 2020"))
+        self.assertIsNone(parse("published_year = 2020 || 1"))
+        self.assertIsNone(parse("type = subtype"))
+
+    def test_conjuncts(self):
+        conjuncts = container_catalog.split_conjuncts(
+            container_catalog.tokenize(
+                "(a = 1 AND b BETWEEN 1 AND 2) AND (c = 3 OR d = 4)"
+            )
+        )
+        self.assertEqual(len(conjuncts), 3)
+        # OR binds less tightly than AND
+        conjuncts = container_catalog.split_conjuncts(
+            container_catalog.tokenize("a = 1 OR b = 2 AND c = 3")
+        )
+        self.assertEqual(len(conjuncts), 1)
+        # AND within CASE expressions doesn't join conjuncts
+        conjuncts = container_catalog.split_conjuncts(
+            container_catalog.tokenize(
+                "CASE WHEN a = 1 AND b = 2 THEN 1 ELSE 0 END AND c = 3"
+            )
+        )
+        self.assertEqual(len(conjuncts), 2)
+
+    def test_population_predicates(self):
+        self.assertEqual(
+            container_catalog.row_predicates(
+                self.crossref,
+                "published_year > '2020' AND doi LIKE '10.1007/%' "
+                "AND title LIKE 'A%'",
+                False,
+            ),
+            [
+                Predicate("published_year", "range", ">", ["2020"]),
+                Predicate("doi", "prefix", "LIKE", ["10.1007"]),
+            ],
+        )
+        # Unqualified columns refer to the root table, if it has them
+        self.assertEqual(
+            container_catalog.row_predicates(
+                self.crossref, "doi = '10.1007/x'", False
+            ),
+            [Predicate("doi", "key", "=", ["10.1007/x"])],
+        )
+
+    def test_query_predicates(self):
+        self.assertEqual(
+            container_catalog.row_predicates(
+                self.crossref,
+                """SELECT works.doi FROM works
+                  INNER JOIN work_authors ON work_authors.work_id = works.id
+                  WHERE works.container_id = 1
+                    AND works.type = 'book' ORDER BY works.doi""",
+                True,
+            ),
+            [Predicate("type", "values", "=", ["book"])],
+        )
+        # Unqualified columns may belong to any table
+        self.assertEqual(
+            container_catalog.row_predicates(
+                self.crossref, "SELECT * FROM works WHERE type = 'book'", True
+            ),
+            [],
+        )
+        # Aliases can hide the root table
+        self.assertEqual(
+            container_catalog.row_predicates(
+                self.crossref,
+                "SELECT * FROM work_authors AS works WHERE works.type = 'x'",
+                True,
+            ),
+            [],
+        )
+        self.assertEqual(
+            container_catalog.row_predicates(
+                self.crossref,
+                """SELECT doi FROM works WHERE works.type = 'book'
+                  UNION SELECT doi FROM works""",
+                True,
+            ),
+            [],
+        )
+
+
+class TestContainerCatalog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+        shutil.copytree(td("data/crossref-sample"), DATA_DIR)
+        with crossref.Crossref(DATA_DIR) as crossref_instance:
+            crossref_instance.index_containers()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+        if os.path.exists(DATABASE_PATH):
+            os.unlink(DATABASE_PATH)
+
+    def setUp(self):
+        self.crossref = crossref.Crossref(DATA_DIR)
+
+    def tearDown(self):
+        self.crossref.close()
+
+    def candidates(self, text, is_query=False):
+        return list(self.crossref.container_ids(text, is_query))
+
+    def test_catalog_contents(self):
+        catalog = self.crossref.get_catalog()
+        self.assertTrue(catalog.complete)
+        self.assertEqual(catalog.row_count(), 15)
+        self.assertEqual(catalog.root_name, "works")
+
+    def test_count(self):
+        (count,) = list(self.crossref.query("SELECT COUNT(*) FROM works"))
+        self.assertEqual(count, (15,))
+        self.assertEqual(self.crossref.get_query_column_names(), ["COUNT(*)"])
+
+    def test_range(self):
+        self.assertEqual(self.candidates("published_year >= 2024"), [4])
+        self.assertEqual(self.candidates("published_year < 2018"), [1])
+        self.assertEqual(self.candidates("published_year = 2018"), [6])
+        self.assertEqual(
+            self.candidates("published_year BETWEEN 2017 AND 2018"), [1, 6]
+        )
+        self.assertEqual(
+            self.candidates("published_year IN (2017, 2025)"), [1, 4]
+        )
+        self.assertEqual(self.candidates("published_year > 2030"), [])
+
+    def test_values(self):
+        self.assertEqual(self.candidates("type = 'book'"), [4])
+        self.assertEqual(self.candidates("issn_print = '0921030X'"), [2])
+        self.assertEqual(
+            self.candidates("type = 'other' AND published_year > 2020"), [2]
+        )
+
+    def test_prefix(self):
+        # Keys are more selective than prefixes
+        self.assertEqual(self.candidates("doi LIKE '10.1145/%'"), [6])
+        self.assertEqual(
+            self.candidates(
+                "SELECT * FROM works WHERE works.doi = '10.1371/x'", True
+            ),
+            [],
+        )
+        self.assertEqual(self.candidates("doi LIKE '10.1%'"), list(range(9)))
+
+    def test_case(self):
+        # Terms joined by AND within CASE don't restrict the containers
+        condition = """CASE WHEN works.doi IS NULL
+          AND works.published_year = 2020 AND works.title IS NULL
+          THEN 1 ELSE 1 END"""
+        self.assertEqual(self.candidates(condition), list(range(9)))
+        self.assertEqual(
+            self.candidates(f"SELECT doi FROM works WHERE {condition}", True),
+            list(range(9)),
+        )
+
+    def test_populate(self):
+        condition = "published_year BETWEEN 2017 AND 2018 OR type = 'book'"
+        self.assertEqual(self.candidates(condition), list(range(9)))
+        condition = "published_year BETWEEN 2017 AND 2018"
+        self.crossref.populate(DATABASE_PATH, ["works.doi"], condition)
+        database = sqlite3.connect(DATABASE_PATH)
+        (count,) = database.execute("SELECT COUNT(*) FROM works").fetchone()
+        database.close()
+        self.assertEqual(count, 3)
+
+    def test_read_ahead(self):
+        read_ahead.configure(2)
+        self.addCleanup(read_ahead.configure, 0)
+        file_reads = FileCache.file_reads
+        condition = "published_year BETWEEN 2017 AND 2018"
+        self.crossref.populate(DATABASE_PATH, ["works.doi"], condition)
+        # Only the containers that are not skipped are read ahead
+        self.assertEqual(FileCache.file_reads - file_reads, 2)
+        self.assertIsNone(get_file_cache().scheduled)
+
+    def test_partitioned_query(self):
+        query = """SELECT works.doi, work_authors.family FROM works
+          INNER JOIN work_authors ON work_authors.work_id = works.id
+          WHERE works.published_year < 2019 ORDER BY 1, 2"""
+        self.assertEqual(self.candidates(query, True), [1, 6])
+        with crossref.Crossref(td("data/crossref-sample")) as reference:
+            expected = list(reference.query(query, partition=True))
+        self.assertTrue(expected)
+        self.assertEqual(
+            list(self.crossref.query(query, partition=True)), expected
+        )
+
+    def test_partitioned_aggregate(self):
+        # Each partition contributes a row, even when it has no matches
+        for query in [
+            """SELECT COUNT(*) FROM works
+              WHERE works.published_year < 2019""",
+            """SELECT MIN(works.doi) FROM works
+              WHERE works.published_year < 2019""",
+        ]:
+            with crossref.Crossref(td("data/crossref-sample")) as reference:
+                expected = list(reference.query(query, partition=True))
+            self.assertEqual(len(expected), 9)
+            self.assertEqual(
+                list(self.crossref.query(query, partition=True)), expected
+            )
+            self.assertEqual(
+                list(self.crossref.query(query, partition=True, workers=2)),
+                expected,
+            )
+
+    def test_modified_container(self):
+        path = self.crossref.data_source.get_container_name(6)
+        status = os.stat(path)
+        os.utime(path, ns=(status.st_atime_ns, status.st_mtime_ns + 1))
+        try:
+            with crossref.Crossref(DATA_DIR) as modified:
+                catalog = modified.get_catalog()
+                self.assertFalse(catalog.complete)
+                self.assertIsNone(catalog.row_count())
+                # Containers missing from the catalog are always examined
+                self.assertEqual(
+                    list(
+                        modified.container_ids("published_year > 2030", False)
+                    ),
+                    [6],
+                )
+        finally:
+            os.utime(path, ns=(status.st_atime_ns, status.st_mtime_ns))
+
+    def test_doi_lookup(self):
+        query = """SELECT doi, container_id FROM works
+          WHERE doi IN ('10.1007/s10270-017-0613-x',
+            '10.1145/3196398.3196476', '10.1000/missing')"""
+        plan = list(self.crossref.query("EXPLAIN QUERY PLAN " + query))
+        self.assertIn("INDEX 4:doi", plan[0][3])
+        file_reads = FileCache.file_reads
+        self.assertEqual(
+            sorted(self.crossref.query(query)),
+            [("10.1007/s10270-017-0613-x", 1), ("10.1145/3196398.3196476", 6)],
+        )
+        # Only the two containers with the DOIs are read
+        self.assertLessEqual(FileCache.file_reads - file_reads, 2)
+
+    def test_doi_lookup_normalized(self):
+        # Normalized keys are checked against the actual values
+        self.assertEqual(
+            list(
+                self.crossref.query(
+                    "SELECT doi FROM works WHERE doi = '10.1145/3196398.3196476 '"
+                )
+            ),
+            [],
+        )
+        self.assertEqual(
+            list(
+                self.crossref.query(
+                    """SELECT doi FROM works WHERE container_id = 6
+                      AND doi = '10.1145/3196398.3196476'"""
+                )
+            ),
+            [("10.1145/3196398.3196476",)],
+        )
+        self.assertEqual(
+            list(
+                self.crossref.query(
+                    """SELECT doi FROM works WHERE container_id = 5
+                      AND doi = '10.1145/3196398.3196476'"""
+                )
+            ),
+            [],
+        )
+
+    def test_doi_pruning(self):
+        self.assertEqual(
+            self.candidates(
+                """SELECT works.doi FROM works
+                  WHERE works.doi IN ('10.1007/s10270-017-0613-x',
+                    '10.1145/3196398.3196476')""",
+                True,
+            ),
+            [1, 6],
+        )
+
+    def test_rowid_lookup(self):
+        rows = list(self.crossref.query("SELECT rowid, doi FROM works"))
+        for rowid, doi in rows:
+            self.assertEqual(
+                list(
+                    self.crossref.query(
+                        f"SELECT doi FROM works WHERE rowid = {rowid}"
+                    )
+                ),
+                [(doi,)],
+            )
+        self.assertEqual(
+            list(
+                self.crossref.query(
+                    f"SELECT doi FROM works WHERE rowid = {2 << 14 | 99}"
+                )
+            ),
+            [],
+        )
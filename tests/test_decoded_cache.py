@@ -0,0 +1,150 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the persistent decoded container cache"""
+
+import marshal
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.data_sources_lib import decoded_cache
+from alexandria3k.data_sources_lib.decoded_cache import DecodedCache
+from alexandria3k.data_sources_lib.crossref_file_cache import FileCache
+from alexandria3k.data_sources_lib.pubmed_file_cache import (
+    FileCache as PubmedFileCache,
+)
+
+CACHE_DIR = td("tmp/decoded-cache")
+CONTAINER_PATH = td("tmp/container.txt")
+
+
+class TestDecodedCache(unittest.TestCase):
+    def setUp(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        decoded_cache.configure(CACHE_DIR)
+        with open(CONTAINER_PATH, "w", encoding="utf-8") as file:
+            file.write("data")
+        self.decodes = 0
+
+    def tearDown(self):
+        decoded_cache.configure(None)
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        os.unlink(CONTAINER_PATH)
+
+    def decode(self, path):
+        self.decodes += 1
+        with open(path, encoding="utf-8") as file:
+            return [file.read()], 4
+
+    def fetch(self):
+        return decoded_cache.fetch(
+            "test", CONTAINER_PATH, self.decode, marshal
+        )
+
+    def test_reuse(self):
+        self.assertEqual(self.fetch(), (["data"], 4))
+        self.assertEqual(self.fetch(), (["data"], 4))
+        self.assertEqual(self.decodes, 1)
+
+    def test_disabled(self):
+        decoded_cache.configure(None)
+        self.fetch()
+        self.fetch()
+        self.assertEqual(self.decodes, 2)
+        self.assertFalse(os.path.exists(CACHE_DIR))
+
+    def test_changed_container(self):
+        self.fetch()
+        with open(CONTAINER_PATH, "w", encoding="utf-8") as file:
+            file.write("new data")
+        self.assertEqual(self.fetch(), (["new data"], 4))
+        self.assertEqual(self.decodes, 2)
+
+    def test_corrupted_entry(self):
+        self.fetch()
+        with open(
+            decoded_cache.entry_path("test", CONTAINER_PATH), "wb"
+        ) as file:
+            file.write(b"garbage")
+        self.assertEqual(self.fetch(), (["data"], 4))
+        self.assertEqual(self.decodes, 2)
+
+    def test_eviction(self):
+        decoded_cache.configure(CACHE_DIR, 1)
+        evictions = DecodedCache.evictions
+        self.fetch()
+        decoded_cache.fetch("other", CONTAINER_PATH, self.decode, marshal)
+        self.assertEqual(DecodedCache.evictions, evictions + 1)
+        # The most recently stored entry is kept
+        self.assertEqual(len(os.listdir(CACHE_DIR)), 1)
+        self.fetch()
+        self.assertEqual(self.decodes, 3)
+
+    def test_size_total(self):
+        scan = decoded_cache.entries
+        with mock.patch.object(
+            decoded_cache, "entries", side_effect=scan
+        ) as entries:
+            for namespace in ("a", "b", "c"):
+                decoded_cache.fetch(
+                    namespace, CONTAINER_PATH, self.decode, marshal
+                )
+            # The directory is only scanned to obtain the initial total
+            self.assertEqual(entries.call_count, 1)
+            size = os.path.getsize(
+                decoded_cache.entry_path("a", CONTAINER_PATH)
+            )
+            self.assertEqual(DecodedCache.total_size, 3 * size)
+            # Exceeding the limit scans the directory to evict entries
+            DecodedCache.size_limit = 3 * size
+            decoded_cache.fetch("d", CONTAINER_PATH, self.decode, marshal)
+            self.assertEqual(entries.call_count, 2)
+        self.assertEqual(DecodedCache.total_size, 3 * size)
+        self.assertEqual(len(os.listdir(CACHE_DIR)), 3)
+
+
+class TestFileCaches(unittest.TestCase):
+    def setUp(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        decoded_cache.configure(CACHE_DIR)
+
+    def tearDown(self):
+        decoded_cache.configure(None)
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    def test_crossref(self):
+        path = td("data/crossref-sample/3items.json.gz")
+        FileCache.file_reads = 0
+        decoded = FileCache().read(path)
+        self.assertEqual(FileCache().read(path), decoded)
+        self.assertEqual(FileCache.file_reads, 1)
+
+    def test_pubmed(self):
+        path = td("data/pubmed-sample/pubmed1.xml.gz")
+        PubmedFileCache.file_reads = 0
+        decoded = PubmedFileCache().read(path)
+        cached = PubmedFileCache().read(path)
+        self.assertEqual(cached.tag, decoded.tag)
+        self.assertEqual(len(cached), len(decoded))
+        self.assertEqual(PubmedFileCache.file_reads, 1)
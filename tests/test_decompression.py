@@ -0,0 +1,135 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the gzip decompression backends"""
+
+import gzip
+import os
+import tarfile
+import tempfile
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.common import Alexandria3kError
+from alexandria3k.data_sources import crossref, datacite
+from alexandria3k.data_sources_lib import decompression
+from alexandria3k.data_sources_lib.crossref_file_cache import get_file_cache
+
+CROSSREF_DIR = td("data/crossref-sample")
+DATACITE_FILE = td("data/datacite.tar.gz")
+
+CROSSREF_QUERY = """SELECT works.*, work_authors.*
+  FROM works LEFT JOIN work_authors ON work_authors.work_id = works.id
+  ORDER BY works.id, work_authors.id"""
+
+DATACITE_QUERY = """SELECT dc_works.*, dc_work_creators.*
+  FROM dc_works
+  LEFT JOIN dc_work_creators ON dc_work_creators.work_id = dc_works.id
+  ORDER BY dc_works.id, dc_work_creators.id"""
+
+
+def clear_file_cache():
+    """Remove the containers decoded through another backend"""
+    file_cache = get_file_cache()
+    file_cache.cache.clear()
+    file_cache.cached_path = None
+
+
+class TestDecompression(unittest.TestCase):
+    def setUp(self):
+        self.backend = decompression.get_backend()
+
+    def tearDown(self):
+        decompression.configure(self.backend)
+        clear_file_cache()
+
+    def backends(self):
+        """Iterate over the available backends, configuring each one"""
+        for name in decompression.available_backends():
+            with self.subTest(backend=name):
+                decompression.configure(name)
+                clear_file_cache()
+                yield name
+
+    def test_configure(self):
+        self.assertIn("stdlib", decompression.available_backends())
+        decompression.configure("stdlib")
+        self.assertEqual(decompression.get_backend(), "stdlib")
+        decompression.configure(decompression.AUTO)
+        self.assertIn(
+            decompression.get_backend(), decompression.available_backends()
+        )
+        with self.assertRaises(Alexandria3kError):
+            decompression.configure("bzip2")
+
+    def test_contents(self):
+        path = os.path.join(CROSSREF_DIR, sorted(os.listdir(CROSSREF_DIR))[0])
+        with gzip.open(path, "rb") as file:
+            expected = file.read()
+        for _name in self.backends():
+            before = decompression.Decompression.bytes
+            with decompression.open_gzip(path) as file:
+                self.assertEqual(file.read(10), expected[:10])
+                self.assertEqual(file.read(), expected[10:])
+                self.assertEqual(file.tell(), len(expected))
+            self.assertEqual(
+                decompression.Decompression.bytes - before, len(expected)
+            )
+            # Closing a partly read file stops its decompression
+            with decompression.open_gzip(path) as file:
+                self.assertEqual(file.read(1), expected[:1])
+        self.assertIn("MiB/s", decompression.statistics())
+
+    def test_truncated(self):
+        with open(DATACITE_FILE, "rb") as file:
+            data = file.read()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "truncated.tar.gz")
+            with open(path, "wb") as file:
+                file.write(data[: len(data) // 2])
+            for _name in self.backends():
+                with self.assertRaises(EOFError):
+                    with decompression.open_gzip(path) as file:
+                        file.read()
+                with self.assertRaises(tarfile.ReadError):
+                    with decompression.open_tar(path) as tar:
+                        for member in tar:
+                            if member.isreg():
+                                tar.extractfile(member).read()
+
+    def test_crossref_values(self):
+        decompression.configure("stdlib")
+        clear_file_cache()
+        with crossref.Crossref(CROSSREF_DIR) as source:
+            expected = list(source.query(CROSSREF_QUERY))
+        self.assertTrue(expected)
+        for _name in self.backends():
+            with crossref.Crossref(CROSSREF_DIR) as source:
+                self.assertEqual(list(source.query(CROSSREF_QUERY)), expected)
+
+    def test_datacite_values(self):
+        decompression.configure("stdlib")
+        with datacite.Datacite(DATACITE_FILE) as source:
+            expected = list(source.query(DATACITE_QUERY))
+        self.assertTrue(expected)
+        for _name in self.backends():
+            with datacite.Datacite(DATACITE_FILE) as source:
+                self.assertEqual(list(source.query(DATACITE_QUERY)), expected)
@@ -0,0 +1,182 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the persistent cache of data fetched from URLs, through
+a local HTTP server"""
+
+import hashlib
+import http.server
+import os
+import shutil
+import threading
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.common import Alexandria3kError, data_from_uri_provider
+from alexandria3k.data_sources import doaj
+from alexandria3k.data_sources_lib import download_cache
+from alexandria3k.data_sources_lib.download_cache import DownloadCache
+
+CACHE_DIR = td("tmp/download-cache")
+
+LAST_MODIFIED = "Tue, 01 Sep 2026 10:00:00 GMT"
+
+
+class DataHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the server's data with the configured validators"""
+
+    def do_GET(self):
+        # pylint: disable=invalid-name
+        server = self.server
+        server.requests += 1
+        if self.path != "/data.csv":
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.sha256(server.data).hexdigest()}"'
+        # As in RFC 9110, If-None-Match takes precedence
+        if "If-None-Match" in self.headers:
+            unchanged = self.headers["If-None-Match"] == etag
+        else:
+            unchanged = self.headers.get("If-Modified-Since") == LAST_MODIFIED
+        if server.validators and unchanged:
+            self.send_response(304)
+            self.end_headers()
+            return
+        server.transfers += 1
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(server.data)))
+        if server.validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(server.data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDownloadCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), DataHandler
+        )
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/data.csv"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        download_cache.configure(CACHE_DIR)
+        DownloadCache.downloads = 0
+        DownloadCache.validated = 0
+        with open(td("data/doaj.csv"), "rb") as file:
+            self.server.data = file.read()
+        self.server.validators = True
+        self.server.requests = 0
+        self.server.transfers = 0
+
+    def tearDown(self):
+        download_cache.configure(None)
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    def fetch(self):
+        with data_from_uri_provider(self.url) as source:
+            return source.read()
+
+    def contents(self):
+        """Return the names of the stored contents"""
+        return sorted(
+            os.listdir(
+                os.path.join(CACHE_DIR, download_cache.CONTENTS_DIRECTORY)
+            )
+        )
+
+    def test_validated(self):
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.server.transfers, 1)
+        self.assertEqual(DownloadCache.downloads, 1)
+        self.assertEqual(DownloadCache.validated, 1)
+        # Contents are stored under their digest
+        self.assertEqual(
+            self.contents(), [hashlib.sha256(self.server.data).hexdigest()]
+        )
+        self.assertIn("1 validated", download_cache.statistics())
+
+    def test_changed(self):
+        self.fetch()
+        self.server.data = b"a,b\n1,2\n"
+        self.assertEqual(self.fetch(), b"a,b\n1,2\n")
+        self.assertEqual(self.server.transfers, 2)
+        # The previous contents are removed
+        self.assertEqual(
+            self.contents(), [hashlib.sha256(b"a,b\n1,2\n").hexdigest()]
+        )
+
+    def test_no_validators(self):
+        self.server.validators = False
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.server.transfers, 2)
+        self.assertEqual(len(self.contents()), 1)
+
+    def test_missing_contents(self):
+        self.fetch()
+        for name in self.contents():
+            os.unlink(
+                os.path.join(
+                    CACHE_DIR, download_cache.CONTENTS_DIRECTORY, name
+                )
+            )
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.server.transfers, 2)
+
+    def test_disabled(self):
+        download_cache.configure(None)
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.fetch(), self.server.data)
+        self.assertEqual(self.server.transfers, 2)
+        self.assertFalse(os.path.exists(CACHE_DIR))
+        self.assertIsNone(download_cache.statistics())
+
+    def test_error(self):
+        with self.assertRaises(Alexandria3kError):
+            data_from_uri_provider(self.url.replace("data", "missing"))
+
+    def test_csv_rows(self):
+        query = """SELECT Count(*) FROM open_access_journals AS a
+          INNER JOIN open_access_journals AS b ON a.issn_print = b.issn_print"""
+        with doaj.Doaj(td("data/doaj.csv")) as source:
+            expected = list(source.query(query))
+        for _run in range(2):
+            # The inner table is scanned for each row of the outer one
+            with doaj.Doaj(self.url) as source:
+                self.assertEqual(list(source.query(query)), expected)
+                self.assertEqual(list(source.query(query)), expected)
+        # One request per data source; the second one is validated
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.server.transfers, 1)
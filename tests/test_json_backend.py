@@ -0,0 +1,151 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the JSON decoding backends"""
+
+import math
+import os
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.common import Alexandria3kError
+from alexandria3k.data_sources import crossref, datacite
+from alexandria3k.data_sources_lib import json_backend
+from alexandria3k.data_sources_lib.crossref_file_cache import (
+    FileCache,
+    get_file_cache,
+)
+
+CROSSREF_DIR = td("data/crossref-sample")
+
+CROSSREF_QUERY = """SELECT works.*, work_authors.*, author_affiliations.*
+  FROM works
+  LEFT JOIN work_authors ON work_authors.work_id = works.id
+  LEFT JOIN author_affiliations
+    ON author_affiliations.author_id = work_authors.id
+  ORDER BY works.id, work_authors.id, author_affiliations.rowid"""
+
+DATACITE_QUERY = """SELECT dc_works.*, dc_work_creators.*
+  FROM dc_works
+  LEFT JOIN dc_work_creators ON dc_work_creators.work_id = dc_works.id
+  ORDER BY dc_works.id, dc_work_creators.id"""
+
+
+def typed(value):
+    """Return the specified value in a form that also compares its
+    types and the types of its elements"""
+    if isinstance(value, dict):
+        return {key: typed(element) for key, element in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [typed(element) for element in value]
+    return (type(value).__name__, repr(value))
+
+
+def clear_file_cache():
+    """Remove the containers decoded with another backend"""
+    file_cache = get_file_cache()
+    file_cache.cache.clear()
+    file_cache.cached_path = None
+
+
+class TestJsonBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = json_backend.get_backend()
+
+    def tearDown(self):
+        json_backend.configure(self.backend)
+        clear_file_cache()
+
+    def backends(self):
+        """Iterate over the installed backends, configuring each one"""
+        for name in json_backend.available_backends():
+            with self.subTest(backend=name):
+                json_backend.configure(name)
+                clear_file_cache()
+                yield name
+
+    def test_configure(self):
+        self.assertIn("json", json_backend.available_backends())
+        json_backend.configure("json")
+        self.assertEqual(json_backend.get_backend(), "json")
+        json_backend.configure(json_backend.AUTO)
+        self.assertEqual(
+            json_backend.get_backend(), json_backend.available_backends()[0]
+        )
+        with self.assertRaises(Alexandria3kError):
+            json_backend.configure("yaml")
+
+    def test_edge_cases(self):
+        documents = [
+            b'{"a": 1, "a": 2}',
+            b"123456789012345678901234567890",
+            b"-18446744073709551616",
+            b"[1.0, 1e-7, -0.0, 1.0000000000000002]",
+            b'"\\ud800"',
+            b'"\\u00e9\xc3\xa9"',
+            '{"title": "\u03b1\u03b2"}',
+        ]
+        json_backend.configure("json")
+        expected = [typed(json_backend.loads(d)) for d in documents]
+        for _name in self.backends():
+            self.assertEqual(
+                [typed(json_backend.loads(d)) for d in documents], expected
+            )
+            self.assertTrue(math.isnan(json_backend.loads(b"NaN")))
+            with self.assertRaises(ValueError):
+                json_backend.loads(b"{")
+
+    def test_crossref_containers(self):
+        paths = sorted(
+            os.path.join(CROSSREF_DIR, name)
+            for name in os.listdir(CROSSREF_DIR)
+        )
+        json_backend.configure("json")
+        expected = [typed(FileCache.decode(path)) for path in paths]
+        for _name in self.backends():
+            self.assertEqual(
+                [typed(FileCache.decode(path)) for path in paths], expected
+            )
+
+    def test_crossref_values(self):
+        json_backend.configure("json")
+        clear_file_cache()
+        with crossref.Crossref(CROSSREF_DIR) as source:
+            expected = [typed(row) for row in source.query(CROSSREF_QUERY)]
+        self.assertTrue(expected)
+        for _name in self.backends():
+            with crossref.Crossref(CROSSREF_DIR) as source:
+                self.assertEqual(
+                    [typed(row) for row in source.query(CROSSREF_QUERY)],
+                    expected,
+                )
+
+    def test_datacite_values(self):
+        json_backend.configure("json")
+        with datacite.Datacite(td("data/datacite.tar.gz")) as source:
+            expected = [typed(row) for row in source.query(DATACITE_QUERY)]
+        self.assertTrue(expected)
+        for _name in self.backends():
+            with datacite.Datacite(td("data/datacite.tar.gz")) as source:
+                self.assertEqual(
+                    [typed(row) for row in source.query(DATACITE_QUERY)],
+                    expected,
+                )
@@ -0,0 +1,178 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the incremental decoding of JSON containers"""
+
+import gzip
+import io
+import json
+import os
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.data_sources import crossref
+from alexandria3k.data_sources_lib import container_cache, json_stream
+from alexandria3k.data_sources_lib.container_cache import StreamedItems
+from alexandria3k.data_sources_lib.crossref_file_cache import (
+    FileCache,
+    get_file_cache,
+)
+
+DATA_DIR = td("data/crossref-sample")
+
+QUERY = """SELECT works.*, work_authors.*
+  FROM works LEFT JOIN work_authors ON work_authors.work_id = works.id
+  ORDER BY works.id, work_authors.id"""
+
+
+def container_paths():
+    return [
+        os.path.join(DATA_DIR, name) for name in sorted(os.listdir(DATA_DIR))
+    ]
+
+
+def clear_file_cache():
+    file_cache = get_file_cache()
+    file_cache.cache.clear()
+    file_cache.cached_path = None
+
+
+class TestContainerRecords(unittest.TestCase):
+    def test_crossref_containers(self):
+        for path in container_paths():
+            expected, _size = FileCache.decode(path)
+            for chunk_size in (1, 7, 4096):
+                with gzip.open(path, "rb") as file:
+                    self.assertEqual(
+                        list(json_stream.container_records(file, chunk_size)),
+                        expected,
+                    )
+
+    def test_items_document(self):
+        text = '{ "items" : [ {"a": [1, 2]} ,{"b": "]"}, 12 ] }'
+        self.assertEqual(
+            list(json_stream.items_records(io.StringIO(text), 3)),
+            [{"a": [1, 2]}, {"b": "]"}, 12],
+        )
+        self.assertEqual(
+            list(json_stream.items_records(io.StringIO('{"items": []}'), 2)),
+            [],
+        )
+        # Other structures are decoded as a whole
+        text = '{"status": "ok", "items": [{"a": 1}]}'
+        self.assertEqual(
+            list(json_stream.items_records(io.StringIO(text), 2)),
+            [{"a": 1}],
+        )
+
+    def test_malformed(self):
+        for text in ['{"items": [{"a": 1} {"b": 2}]}', '{"items": [{"a": 1}']:
+            with self.assertRaises(json.JSONDecodeError):
+                list(json_stream.items_records(io.StringIO(text), 4))
+
+    def test_array_document(self):
+        text = ' [ {"a": [1, 2]} ,{"b": "]"}, 12 ]\n'
+        for chunk_size in (1, 3, 100):
+            self.assertEqual(
+                list(json_stream.array_records(io.StringIO(text), chunk_size)),
+                [{"a": [1, 2]}, {"b": "]"}, 12],
+            )
+        self.assertEqual(
+            list(json_stream.array_records(io.StringIO("[]"), 1)), []
+        )
+        for text in ['{"a": 1}', '[{"a": 1} {"b": 2}]', '[{"a": 1}', ""]:
+            with self.assertRaises(json.JSONDecodeError):
+                list(json_stream.array_records(io.StringIO(text), 4))
+
+    def test_chunked_lines(self):
+        for data in [b"a\r\nb\rc\n\nd", b"x\r", b"\r\n\r\n", b"", b"abc"]:
+            for chunk_size in (1, 2, 3, 100):
+                self.assertEqual(
+                    json_stream.chunked_lines(io.BytesIO(data), chunk_size),
+                    data.splitlines(),
+                )
+
+
+class TestStreamedItems(unittest.TestCase):
+    def setUp(self):
+        self.starts = 0
+
+    def tearDown(self):
+        container_cache.configure_streaming(None)
+
+    def records(self):
+        self.starts += 1
+        yield from range(100)
+
+    def test_window(self):
+        container_cache.configure_streaming(None, 4)
+        items = StreamedItems(self.records)
+        self.assertEqual([items[i] for i in range(100)], list(range(100)))
+        self.assertEqual(len(items.records), 4)
+        self.assertFalse(items.has_index(100))
+        with self.assertRaises(IndexError):
+            items[100]
+        self.assertEqual(self.starts, 1)
+        # Records before the window are decoded anew
+        self.assertEqual(items[97], 97)
+        self.assertEqual(self.starts, 1)
+        self.assertEqual(items[3], 3)
+        self.assertEqual(self.starts, 2)
+
+
+class TestCrossrefStreaming(unittest.TestCase):
+    def tearDown(self):
+        container_cache.configure_streaming(None)
+        clear_file_cache()
+
+    def test_query(self):
+        clear_file_cache()
+        with crossref.Crossref(DATA_DIR) as source:
+            expected = list(source.query(QUERY))
+            rowids = list(source.query("SELECT rowid, doi FROM works"))
+        container_cache.configure_streaming(0, 2)
+        clear_file_cache()
+        file_cache = get_file_cache()
+        with crossref.Crossref(DATA_DIR) as source:
+            self.assertEqual(list(source.query(QUERY)), expected)
+            self.assertIsInstance(file_cache.cached_data, StreamedItems)
+            self.assertEqual(len(file_cache.cache.data), 0)
+            for rowid, doi in rowids:
+                self.assertEqual(
+                    list(
+                        source.query(
+                            f"SELECT doi FROM works WHERE rowid = {rowid}"
+                        )
+                    ),
+                    [(doi,)],
+                )
+
+    def test_partial_streaming(self):
+        # Only containers above the threshold are streamed
+        threshold = sorted(os.path.getsize(p) for p in container_paths())[4]
+        container_cache.configure_streaming(threshold)
+        file_cache = get_file_cache()
+        streamed = [p for p in container_paths() if file_cache.streamed(p)]
+        self.assertEqual(len(streamed), 4)
+        clear_file_cache()
+        with crossref.Crossref(DATA_DIR) as source:
+            (count,) = source.query("SELECT COUNT(*) FROM work_authors")
+        self.assertEqual(count, (71,))
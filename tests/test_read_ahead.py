@@ -0,0 +1,93 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of reading containers ahead"""
+
+import os
+import threading
+import unittest
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.data_sources_lib import read_ahead
+from alexandria3k.data_sources_lib.read_ahead import ReadAhead
+
+DATA_DIR = td("data/crossref-sample")
+
+
+class TestReadAhead(unittest.TestCase):
+    def setUp(self):
+        self.paths = [
+            os.path.join(DATA_DIR, name) for name in sorted(os.listdir(DATA_DIR))
+        ]
+        self.decoded = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        read_ahead.configure(0)
+
+    def decode(self, path):
+        with self.lock:
+            self.decoded.append(path)
+        return path.upper(), 10
+
+    def test_disabled(self):
+        read_ahead.configure(0)
+        reader = ReadAhead(self.decode)
+        reader.prefetch(self.paths, 1)
+        self.assertEqual(reader.pending, {})
+        self.assertEqual(
+            reader.read(self.paths[0]), (self.paths[0].upper(), 10)
+        )
+        self.assertEqual(self.decoded, [self.paths[0]])
+
+    def test_sequential(self):
+        read_ahead.configure(2)
+        reader = ReadAhead(self.decode)
+        for i, path in enumerate(self.paths):
+            self.assertEqual(reader.read(path), (path.upper(), 10))
+            reader.prefetch(self.paths, i + 1)
+            self.assertLessEqual(len(reader.pending), 2)
+        self.assertEqual(sorted(self.decoded), sorted(self.paths))
+
+    def test_discard_outside_window(self):
+        read_ahead.configure(2)
+        reader = ReadAhead(self.decode)
+        reader.prefetch(self.paths, 1)
+        reader.prefetch(self.paths, 5)
+        self.assertEqual(set(reader.pending), set(self.paths[5:7]))
+
+    def test_depth_change(self):
+        read_ahead.configure(1)
+        reader = ReadAhead(self.decode)
+        reader.prefetch(self.paths, 1)
+        executor = reader.executor
+        read_ahead.configure(3)
+        reader.prefetch(self.paths, 1)
+        self.assertIsNot(reader.executor, executor)
+        self.assertEqual(reader.executor._max_workers, 3)
+        self.assertEqual(set(reader.pending), set(self.paths[1:4]))
+
+    def test_memory_limit(self):
+        read_ahead.configure(4, 1)
+        reader = ReadAhead(self.decode)
+        reader.prefetch(self.paths, 1)
+        # At least one container is always read ahead
+        self.assertEqual(list(reader.pending), [self.paths[1]])
@@ -18,13 +18,19 @@
 #
 """Test of decompressing/extracting Zip files of US patent office"""
 
+import io
 import unittest
+import zipfile
 
 from .test_dir import add_src_dir, td
 
 add_src_dir()
 
-from alexandria3k.uspto_zip_cache import UsptoZipCache
+from alexandria3k.uspto_zip_cache import (
+    XML_DELIMITER,
+    UsptoZipCache,
+    split_chunks,
+)
 
 FILE_PATH_1 = td(
     "data/uspto-2023-04/2022/ipgb20221025_wk43.zip"
@@ -81,9 +87,40 @@ class TestUsptoExtraction(unittest.TestCase):
         # Read the first zip file
         extracted_data_1 = self.file_cache.read(FILE_PATH_1)
         self.assertEqual(UsptoZipCache.file_reads, 1)
-        self.assertEqual(len(extracted_data_1), 11)
+        self.assertEqual(len(list(extracted_data_1)), 11)
 
         # Read the second zip file
         extracted_data_2 = self.file_cache.read(FILE_PATH_2)
         self.assertEqual(UsptoZipCache.file_reads, 2)
-        self.assertEqual(len(extracted_data_2), 3)
+        self.assertEqual(len(list(extracted_data_2)), 3)
+
+
+class TestUsptoStreamedSplit(unittest.TestCase):
+    def test_split_chunks(self):
+        for data in [b"", b"abc", b"--", b"--a--bc----d-", b"x--a-b--"]:
+            for block_size in (1, 2, 3, 100):
+                self.assertEqual(
+                    list(split_chunks(io.BytesIO(data), b"--", block_size)),
+                    data.split(b"--")[1:],
+                )
+
+    def setUp(self):
+        with zipfile.ZipFile(FILE_PATH_1) as zip_file:
+            content = zip_file.read("ipgb20221025.xml").decode("utf-8")
+        self.patents = [
+            c.encode("utf-8") for c in content.split(XML_DELIMITER)[1:]
+        ]
+
+    def test_zip_contents(self):
+        self.assertEqual(
+            list(UsptoZipCache().read(FILE_PATH_1)), self.patents
+        )
+
+    def test_sampling(self):
+        patents = UsptoZipCache().read(
+            FILE_PATH_1,
+            lambda data: data[0] == "container" and "plant" in data[1],
+        )
+        self.assertEqual(
+            list(patents), [p for p in self.patents if b"plant" in p]
+        )
@@ -0,0 +1,179 @@
+#
+# Alexandria3k Crossref bibliographic metadata processing
+# Copyright (C) 2026  Diomidis Spinellis
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Test of the XML parsing and path evaluation engines"""
+
+import copyreg
+import pickle
+import unittest
+from xml.etree import ElementTree as ET
+
+from .test_dir import add_src_dir, td
+
+add_src_dir()
+
+from alexandria3k.common import Alexandria3kError
+from alexandria3k.data_sources import orcid, pubmed, uspto
+from alexandria3k.data_sources_lib import pubmed_file_cache
+from alexandria3k.data_sources_lib import uspto_file_cache
+from alexandria3k.data_sources_lib import xml_engine
+from alexandria3k.xml import agetter, all_getter, getter, getter_by_attribute
+
+XML_DATA = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE a SYSTEM "a.dtd">
+<a xmlns:n="urn:n" type="t">
+  <!-- comment -->
+  <b id="1">one<c>c1</c></b>
+  <b id="2">two</b>
+  <n:d><n:e>ns</n:e></n:d>
+</a>"""
+
+SOURCES = [
+    (pubmed.Pubmed, td("data/pubmed-sample"), pubmed.tables),
+    (uspto.Uspto, td("data/uspto-2023-04"), uspto.tables),
+    (orcid.Orcid, td("data/ORCID_2022_10_summaries.tar.gz"), orcid.tables),
+]
+
+
+def clear_file_caches():
+    """Remove the containers parsed by another engine"""
+    for file_cache in (
+        pubmed_file_cache.get_file_cache(),
+        uspto_file_cache.get_file_cache(),
+    ):
+        file_cache.cache.clear()
+        file_cache.cached_data = None
+    pubmed_file_cache.get_file_cache().cached_path = None
+    uspto_file_cache.get_file_cache().cached_patent_xml_id = None
+
+
+def extract(tree):
+    """Return values extracted from the tree of XML_DATA"""
+    return [
+        getter("b")(tree),
+        getter("b/c")(tree),
+        getter("x")(tree),
+        getter("{urn:n}d/{urn:n}e")(tree),
+        agetter("type")(tree),
+        agetter("id", "b")(tree),
+        agetter("id", "x")(tree),
+        [e.text for e in all_getter("b")(tree)],
+        [e.tag for e in all_getter("./")(tree)],
+        getter_by_attribute("id", "2", "b")(tree),
+    ]
+
+
+class TestXmlEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = xml_engine.get_engine()
+
+    def tearDown(self):
+        xml_engine.configure(self.engine)
+        clear_file_caches()
+
+    def engines(self):
+        """Iterate over the installed engines, configuring each one"""
+        for name in xml_engine.available_engines():
+            with self.subTest(engine=name):
+                xml_engine.configure(name)
+                clear_file_caches()
+                yield name
+
+    def test_configure(self):
+        self.assertIn("elementtree", xml_engine.available_engines())
+        xml_engine.configure("elementtree")
+        self.assertEqual(xml_engine.get_engine(), "elementtree")
+        xml_engine.configure(xml_engine.AUTO)
+        self.assertEqual(
+            xml_engine.get_engine(), xml_engine.available_engines()[0]
+        )
+        with self.assertRaises(Alexandria3kError):
+            xml_engine.configure("sax")
+
+    def test_paths(self):
+        expected = extract(ET.fromstring(XML_DATA.encode()))
+        self.assertEqual(expected[0], "one")
+        # Getters created before the engine is configured
+        getters = [getter("b/c"), all_getter("b")]
+        for _name in self.engines():
+            tree = xml_engine.fromstring(XML_DATA.encode())
+            self.assertEqual(extract(tree), expected)
+            # Trees parsed by ElementTree are also supported
+            self.assertEqual(
+                extract(ET.fromstring(XML_DATA.encode())), expected
+            )
+            self.assertEqual(getters[0](tree), "c1")
+            self.assertEqual(len(getters[1](tree)), 2)
+            # No comments among the children
+            self.assertEqual(len(tree), 3)
+
+    def test_pickle(self):
+        serializer = xml_engine.TreeSerializer
+        for _name in self.engines():
+            tree = xml_engine.fromstring(XML_DATA.encode())
+            copy = serializer.loads(serializer.dumps((tree, 1)))[0]
+            # Loaded without parsing XML
+            self.assertIsInstance(copy, ET.Element)
+            self.assertEqual(extract(copy), extract(tree))
+        # Other picklers are not affected
+        if xml_engine.lxml_etree is not None:
+            self.assertNotIn(
+                # pylint: disable-next=protected-access
+                xml_engine.lxml_etree._Element,
+                copyreg.dispatch_table,
+            )
+            with self.assertRaises(TypeError):
+                pickle.dumps(xml_engine.lxml_etree.fromstring(b"<a/>"))
+
+    @unittest.skipIf(xml_engine.lxml_etree is None, "lxml is not installed")
+    def test_copy_entities(self):
+        data = b"""<!DOCTYPE a [<!ENTITY e "E">]>
+            <a>x&e;y<b>1</b>&e;z&e;w<c/></a>"""
+        tree = xml_engine.lxml_etree.fromstring(data, xml_engine.lxml_parser())
+        copy = xml_engine.element_tree_copy(tree)
+        # Unresolved entity references are skipped, but not the text
+        # following them
+        self.assertEqual([child.tag for child in copy], ["b", "c"])
+        self.assertEqual(copy.text, "xy")
+        self.assertEqual(copy[0].tail, "zw")
+        self.assertEqual("".join(copy.itertext()), "xy1zw")
+
+    def test_data_sources(self):
+        for source_class, path, tables in SOURCES:
+            queries = [f"SELECT * FROM {t.get_name()}" for t in tables]
+            expected = None
+            for _name in self.engines():
+                with source_class(path) as source:
+                    results = [list(source.query(q)) for q in queries]
+                if expected is None:
+                    expected = results
+                    self.assertTrue(results[0])
+                self.assertEqual(results, expected)
+
+    def test_skip_sections(self):
+        data = b"""<a xmlns:n="urn:n"><n:b>1<n:c/></n:b><n:bb>2</n:bb>
+            <n:d x="1"/><e>3</e></a>"""
+        tree = xml_engine.fromstring(
+            xml_engine.skip_sections(data, {"{urn:n}b", "{urn:n}d"})
+        )
+        self.assertEqual([e.tag for e in tree], ["{urn:n}bb", "e"])
+        # Unknown namespaces and missing sections are ignored
+        self.assertEqual(
+            xml_engine.skip_sections(data, {"{urn:x}b", "{urn:n}x"}), data
+        )
+        self.assertEqual(xml_engine.skip_sections(data, set()), data)